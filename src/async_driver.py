@@ -0,0 +1,123 @@
+"""
+Single owner of the WebDriver for asyncio-based replays.
+
+WebDriver is not thread-safe, so coroutines never touch it directly: they
+send callables to the owner task, which executes them one by one in a
+dedicated worker thread. While one coroutine awaits a long wait (sleeping
+between cheap polls), the owner keeps serving commands of other tabs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable
+
+from .driver import DriverOnlyOffice
+from .utils.logging_utils import get_logger
+
+
+class DriverOwner:
+    """
+    Serializes WebDriver commands from many coroutines.
+
+    Пример:
+        async with DriverOwner(driver) as owner:
+            title = await owner.call(lambda: driver.driver.title, handle=tab_handle)
+    """
+
+    def __init__(self, driver: DriverOnlyOffice):
+        self.driver = driver
+        self.logger = get_logger("driver_owner")
+        self.commands = 0
+        self.busy_sec = 0.0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._pool: ThreadPoolExecutor | None = None
+
+    async def start(self) -> "DriverOwner":
+        if self._task is not None:
+            return self
+        self._queue = asyncio.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
+        self._task = asyncio.create_task(self._serve(), name="driver-owner")
+        return self
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        assert self._queue is not None
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.logger.info(
+            "driver owner stopped: commands=%s busy_sec=%.3f",
+            self.commands,
+            self.busy_sec,
+        )
+
+    async def __aenter__(self) -> "DriverOwner":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    async def call(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        handle: str | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Executes fn(*args, **kwargs) on the WebDriver thread and returns its
+        result. If handle is given, the owner activates that window first.
+        """
+        if self._queue is None:
+            raise RuntimeError("DriverOwner is not started")
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, args, kwargs, handle, future))
+        return await future
+
+    async def _serve(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            fn, args, kwargs, handle, future = item
+            if future.cancelled():
+                continue
+            started = perf_counter()
+            try:
+                result = await loop.run_in_executor(
+                    self._pool, self._invoke, fn, args, kwargs, handle
+                )
+            except Exception as exc:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self.commands += 1
+                self.busy_sec += perf_counter() - started
+
+    def _invoke(
+        self,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        handle: str | None,
+    ) -> Any:
+        if handle is not None:
+            self.driver.activate_window(handle)
+        return fn(*args, **kwargs)
+
+
+__all__ = ["DriverOwner"]
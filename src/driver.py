@@ -1,14 +1,19 @@
 from pathlib import Path
 import os
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.relative_locator import RelativeBy
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
 from selenium.webdriver.remote.webelement import WebElement
 
 
@@ -18,7 +23,13 @@ class DriverOnlyOffice:
         driver_path: Path | None = None,
         debugger_address: str = "127.0.0.1:9222",
     ):
+        self._lookahead = threading.local()
         self._build_driver(driver_path, debugger_address)
+        self._frame_path: list[int] = []
+        self._prefetched: tuple[tuple[str, str], list[int], WebElement] | None = None
+        self._idle_task: Callable[[], None] | None = None
+        self._window_handle: str | None = None
+        self._window_frames: dict[str, list[int]] = {}
 
     def _build_driver(
         self,
@@ -45,16 +56,48 @@ class DriverOnlyOffice:
         self.driver = webdriver.Chrome(
             service=Service(str(driver_path)), options=chrome_options
         )
+        self._count_commands()
         return self.driver
 
+    def _count_commands(self) -> None:
+        """
+        Считает команды WebDriver (включая вызовы WebElement): все они проходят
+        через WebDriver.execute. Счётчик — command_count, для журнала событий.
+        Команды prefetch_in_frames (lookahead следующего шага) идут отдельно,
+        в lookahead_command_count, чтобы не попадать в команды текущего шага.
+        """
+        self.command_count = 0
+        self.lookahead_command_count = 0
+        execute = self.driver.execute
+
+        def _counted(driver_command, params=None):
+            if getattr(self._lookahead, "active", False):
+                self.lookahead_command_count += 1
+            else:
+                self.command_count += 1
+            return execute(driver_command, params)
+
+        self.driver.execute = _counted
+
     def find_element_in_frames(
         self, by: str | RelativeBy = By.ID, selector: str | None = None
     ) -> WebElement | None:
         """
         Рекурсивно ищет элемент во всех iframe.
         Возвращает WebElement или None.
+        Если элемент был заранее найден через prefetch_in_frames и ещё жив,
+        обход фреймов пропускается.
         """
+        cached = self._take_prefetched(by, selector)
+        if cached is not None:
+            return cached
+        return self._walk_frames(by, selector)
+
+    def _walk_frames(
+        self, by: str | RelativeBy = By.ID, selector: str | None = None
+    ) -> WebElement | None:
         self.driver.switch_to.default_content()
+        path: list[int] = []
 
         def rec():
             try:
@@ -62,20 +105,111 @@ class DriverOnlyOffice:
             except NoSuchElementException:
                 pass
             iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-            for iframe in iframes:
+            for index, iframe in enumerate(iframes):
+                depth = len(path)
                 try:
                     self.driver.switch_to.frame(iframe)
+                    path.append(index)
                     found = rec()
                     if found:
                         return found
+                    path.pop()
                     self.driver.switch_to.parent_frame()
                 except StaleElementReferenceException:
+                    del path[depth:]
                     self.driver.switch_to.parent_frame()
                 except Exception:
+                    del path[depth:]
                     self.driver.switch_to.parent_frame()
 
             return None
-        return rec()
+
+        found = rec()
+        self._frame_path = list(path) if found else []
+        return found
+
+    # ---------- lookahead ----------
+    def prefetch_in_frames(
+        self, by: str | RelativeBy = By.ID, selector: str | None = None
+    ) -> bool:
+        """
+        Заранее ищет элемент (обычно локатор следующего шага replay) и
+        запоминает его вместе с путём по iframe. Хранится только последний
+        результат. Текущий фрейм восстанавливается, поэтому вызов безопасен
+        посреди ожидания лоадера.
+        """
+        self._prefetched = None
+        if not isinstance(by, str) or selector is None:
+            return False
+        restore = list(self._frame_path)
+        self._lookahead.active = True
+        try:
+            found = self._walk_frames(by, selector)
+            if found is not None:
+                self._prefetched = ((by, selector), list(self._frame_path), found)
+            return found is not None
+        except WebDriverException:
+            return False
+        finally:
+            try:
+                self._switch_to_path(restore)
+            except (WebDriverException, IndexError):
+                self._frame_path = []
+            self._lookahead.active = False
+
+    def clear_prefetched(self) -> None:
+        self._prefetched = None
+
+    def _take_prefetched(
+        self, by: str | RelativeBy, selector: str | None
+    ) -> WebElement | None:
+        entry = self._prefetched
+        if entry is None or entry[0] != (by, selector):
+            return None
+        self._prefetched = None
+        _, path, element = entry
+        try:
+            self._switch_to_path(path)
+            # Дешёвая проверка: устаревший элемент бросит StaleElementReferenceException.
+            element.is_enabled()
+        except (WebDriverException, IndexError):
+            return None
+        return element
+
+    @property
+    def frame_path(self) -> list[int]:
+        """Путь (индексы iframe от корня документа) к текущему фрейму."""
+        return list(self._frame_path)
+
+    def switch_to_frame_path(self, path: list[int]) -> None:
+        """Переключается во фрейм по пути из frame_path (без обхода всех iframe)."""
+        self._switch_to_path(list(path))
+
+    def _switch_to_path(self, path: list[int]) -> None:
+        self.driver.switch_to.default_content()
+        for index in path:
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            self.driver.switch_to.frame(iframes[index])
+        self._frame_path = list(path)
+
+    def set_idle_task(self, task: Callable[[], None] | None) -> None:
+        """Задача, которую page-объекты выполнят один раз во время ожидания."""
+        self._idle_task = task
+
+    def cancel_idle_task(self) -> bool:
+        """Снимает задачу; True, если она так и не была выполнена."""
+        pending = self._idle_task is not None
+        self._idle_task = None
+        return pending
+
+    def run_idle_task(self) -> None:
+        task, self._idle_task = self._idle_task, None
+        if task is None:
+            return
+        try:
+            task()
+        except Exception:
+            pass
 
     def switch_to_frame(self, frame: str | int | WebElement):
         self.driver.switch_to.frame(frame)
@@ -83,7 +217,7 @@ class DriverOnlyOffice:
     def switch_window(self, id):
         handles = self.driver.window_handles
         target = handles[id]
-        self.driver.switch_to.window(target)
+        self.set_window_handle(target)
 
     def get_window_handles(self) -> list[str]:
         return self.driver.window_handles
@@ -93,3 +227,42 @@ class DriverOnlyOffice:
 
     def set_window_handle(self, window_name: str):
         self.driver.switch_to.window(window_name)
+        self._window_handle = window_name
+        self._frame_path = []
+        self._prefetched = None
+
+    def activate_window(self, window_name: str) -> None:
+        """
+        Переключается на окно, запоминая путь по iframe уходящего окна и
+        восстанавливая путь целевого. Нужен, когда несколько вкладок
+        чередуют команды на одном драйвере: ссылки на элементы внутри iframe
+        (например, SqlManagerPage.card) остаются рабочими.
+        """
+        if window_name == self._window_handle:
+            return
+        if self._window_handle is not None:
+            self._window_frames[self._window_handle] = list(self._frame_path)
+        self.set_window_handle(window_name)
+        path = self._window_frames.get(window_name)
+        if path:
+            try:
+                self._switch_to_path(path)
+            except (WebDriverException, IndexError):
+                self._switch_to_path([])
+
+    def close_window(self, window_name: str, fallback: str | None = None) -> None:
+        """
+        Закрывает окно window_name и переключается на fallback (если задан).
+        Уже закрытое окно не считается ошибкой.
+        """
+        self._window_frames.pop(window_name, None)
+        try:
+            self.driver.switch_to.window(window_name)
+            self.driver.close()
+        except WebDriverException:
+            pass
+        self._window_handle = None
+        self._frame_path = []
+        self._prefetched = None
+        if fallback is not None:
+            self.set_window_handle(fallback)
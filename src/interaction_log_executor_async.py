@@ -0,0 +1,310 @@
+"""
+Asyncio replay of interaction logs for OnlyOffice SQL plugin.
+
+Design goals:
+- reuse SimpleInteractionLogExecutor routing/skip rules as-is;
+- one DriverOwner task serializes every WebDriver command;
+- long waits are awaitables (async routes), so other tabs keep clicking
+  while one tab waits for connections, preview or export.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import os
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from .async_driver import DriverOwner
+from .driver import DriverOnlyOffice
+from .interaction_log_executor_simple import (
+    InteractionStep,
+    SimpleInteractionLogExecutor,
+    _apply_external_profile,
+    read_interaction_log,
+)
+from .pages_common.async_waits import AsyncWaits
+
+AsyncStepHandler = Callable[[InteractionStep], Awaitable[None]]
+
+
+class AsyncInteractionLogExecutor:
+    """
+    Async replay executor for one tab:
+    - applies skip rules of the wrapped sync executor;
+    - dispatches to async routes (event/action and/or testId) when present;
+    - otherwise runs the sync executor step as one serialized driver command.
+    """
+
+    def __init__(
+        self,
+        executor: SimpleInteractionLogExecutor,
+        owner: DriverOwner,
+        *,
+        handle: str | None = None,
+        name: str | None = None,
+        async_click_routes_exact: dict[str, AsyncStepHandler] | None = None,
+        async_click_routes_prefix: dict[str, AsyncStepHandler] | None = None,
+        async_step_routes: dict[tuple[str, str], AsyncStepHandler] | None = None,
+    ):
+        self.executor = executor
+        self.owner = owner
+        self.name = name or "tab"
+        self.logger = executor.logger
+        self.waits = AsyncWaits(owner, handle)
+        self.async_click_routes_exact: dict[str, AsyncStepHandler] = {}
+        self.async_click_routes_prefix: dict[str, AsyncStepHandler] = {}
+        self.async_step_routes: dict[tuple[str, str], AsyncStepHandler] = {}
+        self.set_async_routes(
+            async_click_routes_exact,
+            async_click_routes_prefix,
+            async_step_routes,
+        )
+
+    @property
+    def context(self) -> dict[str, Any]:
+        return self.executor.context
+
+    @property
+    def handle(self) -> str | None:
+        return self.waits.handle
+
+    def set_async_routes(
+        self,
+        exact: dict[str, AsyncStepHandler] | None = None,
+        prefix: dict[str, AsyncStepHandler] | None = None,
+        step_routes: dict[tuple[str, str], AsyncStepHandler] | None = None,
+    ) -> None:
+        self.async_click_routes_exact = dict(exact or {})
+        self.async_click_routes_prefix = dict(prefix or {})
+        self.async_step_routes = dict(step_routes or {})
+
+    # ---------- public API ----------
+    async def prepare(self, home_handle: str | None = None) -> None:
+        """
+        Runs the sync prepare hook as one command (from home_handle window)
+        and binds this executor to the window the hook ended in.
+        """
+        hook = self.executor.prepare_hook
+        if hook is None:
+            self.logger.info("[%s] Prepare hook is not configured: skip prepare", self.name)
+        else:
+            await self.owner.call(hook, handle=home_handle)
+        driver = self.executor.driver
+        self.waits.handle = await self.owner.call(driver.get_current_window_handle)
+        self.logger.info("[%s] Tab bound to window=%s", self.name, self.waits.handle)
+
+    async def replay_file(
+        self,
+        log_path: str | Path,
+        *,
+        prepare_plugin_home: bool = True,
+        home_handle: str | None = None,
+        stop_on_error: bool = True,
+    ) -> None:
+        steps = read_interaction_log(log_path)
+        self.logger.info(
+            "[%s] Async replay file=%s steps=%s prepare_plugin_home=%s",
+            self.name,
+            log_path,
+            len(steps),
+            prepare_plugin_home,
+        )
+        if prepare_plugin_home:
+            await self.prepare(home_handle)
+        elif self.waits.handle is None:
+            driver = self.executor.driver
+            self.waits.handle = await self.owner.call(driver.get_current_window_handle)
+        await self.replay_steps(steps, stop_on_error=stop_on_error)
+
+    async def replay_steps(
+        self,
+        steps: list[InteractionStep],
+        *,
+        stop_on_error: bool = True,
+    ) -> None:
+        self.logger.info("[%s] Async replay started: total_steps=%s", self.name, len(steps))
+        started = perf_counter()
+        for step in steps:
+            try:
+                await self.execute_step(step)
+            except Exception as exc:
+                message = (
+                    f"[{self.name}] Replay failed on line={step.index}, "
+                    f"seq={getattr(step, 'seq', None)}, "
+                    f"event={getattr(step, 'event', None)}/{getattr(step, 'action', None)}, "
+                    f"testId={getattr(step, 'testId', None)}"
+                )
+                self.logger.exception(message)
+                if stop_on_error:
+                    raise RuntimeError(message) from exc
+        self.logger.info(
+            "[%s] Async replay finished in %.3fs", self.name, perf_counter() - started
+        )
+
+    async def execute_step(self, step: InteractionStep) -> None:
+        if self.executor._should_skip_step(step):
+            return
+        handler = self._match_async_route(step)
+        if handler is None:
+            await self.waits.call(self.executor.execute_step, step)
+            return
+        await handler(step)
+
+    # ---------- routes ----------
+    def _match_async_route(self, step: InteractionStep) -> AsyncStepHandler | None:
+        event, action = step.action_key
+        for key in ((event, action), (event, "*"), ("*", action)):
+            handler = self.async_step_routes.get(key)
+            if handler is not None:
+                self.logger.info(
+                    "[%s] Route async step line=%s key=%s", self.name, step.index, key
+                )
+                return handler
+
+        test_id = getattr(step, "testId", None) or ""
+        if not test_id:
+            return None
+        exact = self.async_click_routes_exact.get(test_id)
+        if exact is not None:
+            self.logger.info(
+                "[%s] Route async exact line=%s testId=%s", self.name, step.index, test_id
+            )
+            return exact
+        for prefix, handler in self.async_click_routes_prefix.items():
+            if test_id.startswith(prefix):
+                self.logger.info(
+                    "[%s] Route async prefix line=%s testId=%s prefix=%s",
+                    self.name,
+                    step.index,
+                    test_id,
+                    prefix,
+                )
+                return handler
+        return None
+
+
+def _apply_async_profile(executor: AsyncInteractionLogExecutor) -> None:
+    module_name = os.getenv("OO_SIMPLE_ROUTES_MODULE", "").strip()
+    if not module_name:
+        return
+    module = importlib.import_module(module_name)
+    build_async_routes_fn = getattr(module, "build_async_routes", None)
+    if not callable(build_async_routes_fn):
+        executor.logger.info("Routes profile has no async routes: %s", module_name)
+        return
+    exact, prefix, step_routes = build_async_routes_fn(executor)
+    executor.set_async_routes(exact, prefix, step_routes)
+    executor.logger.info("Async routes profile loaded: %s", module_name)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Replay one or more interaction logs concurrently in separate "
+            "OnlyOffice tabs using asyncio and a single WebDriver session."
+        )
+    )
+    parser.add_argument(
+        "--log",
+        type=Path,
+        action="append",
+        required=True,
+        help="Path to interaction log JSONL. Repeat to replay several logs.",
+    )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="How many tabs replay each log.",
+    )
+    parser.add_argument(
+        "--debugger-address",
+        default="127.0.0.1:9222",
+        help="OnlyOffice remote debugger address.",
+    )
+    parser.add_argument(
+        "--no-prepare",
+        action="store_true",
+        help="Do not call prepare hook before replay.",
+    )
+    return parser
+
+
+async def _replay_all(
+    owner: DriverOwner,
+    executors: list[tuple[AsyncInteractionLogExecutor, Path]],
+    *,
+    prepare: bool,
+) -> list[BaseException | None]:
+    home_handle = await owner.call(owner.driver.get_current_window_handle)
+    if prepare:
+        # Prepare opens a new editor window from the home page: run it tab by tab.
+        for executor, _ in executors:
+            await executor.prepare(home_handle)
+    results = await asyncio.gather(
+        *(
+            executor.replay_file(log_path, prepare_plugin_home=False)
+            for executor, log_path in executors
+        ),
+        return_exceptions=True,
+    )
+    return [r if isinstance(r, BaseException) else None for r in results]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.tabs < 1:
+        parser.error("--tabs must be >= 1")
+    for log_path in args.log:
+        if not log_path.exists():
+            parser.error(f"Log file not found: {log_path}")
+
+    driver = DriverOnlyOffice(debugger_address=args.debugger_address)
+    owner = DriverOwner(driver)
+    executors: list[tuple[AsyncInteractionLogExecutor, Path]] = []
+    for log_path in args.log:
+        for tab_index in range(args.tabs):
+            sync_executor = SimpleInteractionLogExecutor(driver=driver)
+            _apply_external_profile(sync_executor)
+            executor = AsyncInteractionLogExecutor(
+                sync_executor,
+                owner,
+                name=f"{log_path.stem}#{tab_index + 1}",
+            )
+            _apply_async_profile(executor)
+            executors.append((executor, log_path))
+
+    async def _run() -> list[BaseException | None]:
+        async with owner:
+            return await _replay_all(owner, executors, prepare=not args.no_prepare)
+
+    try:
+        errors = asyncio.run(_run())
+    except Exception as exc:
+        print(f"[replay-async] failed: {exc}")
+        return 2
+    finally:
+        executors[0][0].executor.close()
+
+    failed = 0
+    for (executor, log_path), error in zip(executors, errors):
+        status = "ok" if error is None else f"failed: {error}"
+        if error is not None:
+            failed += 1
+        print(f"[replay-async] {executor.name} ({log_path.name}): {status}")
+    print(
+        f"[replay-async] driver commands={owner.commands} busy={owner.busy_sec:.3f}s"
+    )
+    if failed:
+        return 2
+    print("[replay-async] completed successfully")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,24 +10,37 @@ Design goals:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import importlib
 import json
 import logging
 import os
 import re
+import time
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Callable
 
 from selenium.webdriver.common.by import By
 
 from .driver import DriverOnlyOffice
-from .utils.logging_utils import get_logger
+from .tab_lifecycle import TabLifecycleManager
+from .utils.logging_utils import event_context, events_enabled, get_logger, log_event
+from .utils.pacing import ReplayPacer
+from .utils.visual import VisualMismatch, baseline_cache_stats
+from .utils.visual_pool import VisualCheckPool, VisualCheckResult
 
 
 _GENERATED_TEST_ID_SUFFIX_RE = re.compile(r"[A-Za-z0-9]+(?:_[A-Za-z0-9]+)+$")
 _SELECTOR_TEST_ID_RE = re.compile(r"""^\[data-testid=(["'])(.+?)\1\]$""")
 
 StepHandler = Callable[["InteractionStep"], None]
+StateCapture = Callable[[], dict[str, Any]]
+StateRestore = Callable[[dict[str, Any]], None]
+
+VISUAL_ASYNC_MODES = ("step", "case")
 
 
 class InteractionStep:
@@ -111,6 +124,11 @@ class SimpleInteractionLogExecutor:
         default_click_handler: StepHandler | None = None,
         prepare_hook: Callable[[], None] | None = None,
         context: dict[str, Any] | None = None,
+        lookahead: bool = False,
+        checkpoint_path: str | Path | None = None,
+        pace: float | None = None,
+        step_results_path: str | Path | None = None,
+        visual_async: str | None = None,
     ):
         self.driver = driver or DriverOnlyOffice(debugger_address=debugger_address)
         self.logger = get_logger("interaction_log_executor_simple")
@@ -119,6 +137,22 @@ class SimpleInteractionLogExecutor:
         self.context: dict[str, Any] = dict(context or {})
         self.default_click_handler: StepHandler | None = default_click_handler
         self.prepare_hook: Callable[[], None] | None = prepare_hook
+        self.lookahead: bool = lookahead
+        self.checkpoint_path: Path | None = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_state_hook: StateCapture | None = None
+        self.restore_state_hook: StateRestore | None = None
+        self.fingerprint_hook: StateCapture | None = None
+        self._checkpoint_stream = None
+        self.pace: float | None = pace
+        self.last_pacing: dict[str, Any] | None = None
+        self.step_results_path: Path | None = Path(step_results_path) if step_results_path else None
+        self._step_results_stream = None
+        self._step_route: str | None = None
+        self._step_event: dict[str, Any] = {}
+        self._step_labels: dict[str, Any] = {"connection": None, "query": None}
+        self.visual_async: str | None = None
+        self.last_visual: dict[str, Any] | None = None
+        self.set_visual_async(visual_async if visual_async is not None else os.getenv("VISUAL_ASYNC"))
 
         default_exact, default_prefix = self._build_click_routes()
         self.click_routes_exact: dict[str, StepHandler] = {}
@@ -158,21 +192,36 @@ class SimpleInteractionLogExecutor:
         *,
         prepare_plugin_home: bool = True,
         stop_on_error: bool = True,
+        resume_from: int | None = None,
     ) -> None:
+        """
+        resume_from: log line of the first step to run. Requires checkpoint_path
+        with a passed step right before that line; the window, profile state and
+        UI fingerprint are restored/validated and the prepare hook is skipped.
+        """
         steps = read_interaction_log(log_path)
         self.logger.info(
-            "Replay file=%s steps=%s prepare_plugin_home=%s stop_on_error=%s",
+            "Replay file=%s steps=%s prepare_plugin_home=%s stop_on_error=%s resume_from=%s",
             log_path,
             len(steps),
             prepare_plugin_home,
             stop_on_error,
+            resume_from,
         )
-        if prepare_plugin_home:
+        start = 0
+        if resume_from is not None:
+            start = self._resume_checkpoint(log_path, steps, resume_from)
+        if start == 0 and prepare_plugin_home:
             if self.prepare_hook is None:
                 self.logger.info("Prepare hook is not configured: skip prepare")
             else:
                 self.prepare_hook()
-        self.replay_steps(steps, stop_on_error=stop_on_error)
+        self._open_checkpoint(log_path, steps, start)
+        try:
+            with event_context(case=Path(log_path).stem):
+                self.replay_steps(steps[start:], stop_on_error=stop_on_error)
+        finally:
+            self._close_checkpoint()
 
     def replay_steps(
         self,
@@ -181,25 +230,97 @@ class SimpleInteractionLogExecutor:
         stop_on_error: bool = True,
     ) -> None:
         self.logger.info("Replay started: total_steps=%s", len(steps))
-        for step in steps:
-            try:
-                self.execute_step(step)
-            except Exception as exc:
-                seq = getattr(step, "seq", None)
-                event = getattr(step, "event", None)
-                action = getattr(step, "action", None)
-                test_id = getattr(step, "testId", None)
-                message = (
-                    f"Replay failed on line={step.index}, seq={seq}, "
-                    f"event={event}/{action}, testId={test_id}"
-                )
-                self.logger.exception(message)
-                if stop_on_error:
-                    raise RuntimeError(message) from exc
+        pacer = ReplayPacer(self.pace) if self.pace is not None else None
+        visual_pool = VisualCheckPool() if self.visual_async else None
+        # VISUAL_ASYNC=case: step results, step events and checkpoints wait
+        # here until the step's visual checks are collected, so a failed check
+        # is reported on its step and resume never starts past it.
+        held_steps: list[dict[str, Any]] = []
+        hold = visual_pool is not None and self.visual_async == "case"
+        self._open_step_results()
+        try:
+            with visual_pool.activate() if visual_pool is not None else nullcontext():
+                for position, step in enumerate(steps):
+                    if pacer is not None:
+                        pacer.before_step(step.get("time"))
+                    if self.lookahead:
+                        self._schedule_lookahead(steps, position + 1)
+                    started_at = time.time()
+                    started = perf_counter()
+                    duration: float | None = None
+                    commands = self._command_counts()
+                    try:
+                        with event_context(line=step.index, seq=getattr(step, "seq", None)) as ctx:
+                            self._step_event = ctx
+                            if visual_pool is not None:
+                                visual_pool.current_step = {"line": step.index, "seq": ctx.get("seq")}
+                            self.execute_step(step)
+                            # Step duration excludes waiting for background visual checks.
+                            duration = perf_counter() - started
+                            if visual_pool is not None and self.visual_async == "step":
+                                self._check_visual_results(visual_pool.collect())
+                        if hold:
+                            held_steps.append(self._hold_step(step, started_at, duration, commands))
+                        else:
+                            if self._step_results_stream is not None:
+                                self._write_step_result(step, started_at, duration)
+                            if events_enabled():
+                                self._log_step_event(step, duration, commands)
+                            if self._checkpoint_stream is not None:
+                                self._write_checkpoint(step)
+                    except Exception as exc:
+                        if duration is None:
+                            duration = perf_counter() - started
+                        if hold:
+                            held_steps.append(
+                                self._hold_step(step, started_at, duration, commands, error=exc)
+                            )
+                        else:
+                            if self._step_results_stream is not None:
+                                self._write_step_result(step, started_at, duration, error=exc)
+                            if events_enabled():
+                                self._log_step_event(step, duration, commands, error=exc)
+                        if visual_pool is not None and self.visual_async == "step":
+                            self._check_visual_results(visual_pool.collect(), stop_on_error=False)
+                        seq = getattr(step, "seq", None)
+                        event = getattr(step, "event", None)
+                        action = getattr(step, "action", None)
+                        test_id = getattr(step, "testId", None)
+                        message = (
+                            f"Replay failed on line={step.index}, seq={seq}, "
+                            f"event={event}/{action}, testId={test_id}"
+                        )
+                        self.logger.exception(message)
+                        if stop_on_error:
+                            raise RuntimeError(message) from exc
+                    finally:
+                        self._step_event = {}
+                        if self.lookahead:
+                            self._cancel_lookahead()
+            if hold:
+                results = visual_pool.collect()
+                self._flush_held_steps(held_steps, results, stop_on_error=stop_on_error)
+                self._check_visual_results(results, stop_on_error=stop_on_error)
+        finally:
+            if visual_pool is not None:
+                # After a failed step some checks may still be pending: report
+                # them, but let the step error propagate.
+                results = visual_pool.collect()
+                self._flush_held_steps(held_steps, results, stop_on_error=stop_on_error)
+                self._check_visual_results(results, stop_on_error=False)
+                visual_pool.close()
+                self.last_visual = visual_pool.stats()
+                self.logger.info("Visual checks %s", self.last_visual)
+            self._close_step_results()
+            if pacer is not None:
+                pacer.finish()
+                self.last_pacing = pacer.summary()
+                self.logger.info("Pacing %s", self.last_pacing)
         self.logger.info("Replay finished")
 
     def execute_step(self, step: InteractionStep) -> None:
         event, action = step.action_key
+        self._set_step_route("none")
         self.logger.info(
             "Step line=%s seq=%s event/action=%s/%s testId=%s",
             step.index,
@@ -210,12 +331,14 @@ class SimpleInteractionLogExecutor:
         )
 
         if self._should_skip_step(step):
+            self._set_step_route("skip")
             return
         if self._dispatch_by_step_route(step, event, action):
             return
         if self._dispatch_by_test_id(step):
             return
         if event == "click" and self.default_click_handler is not None:
+            self._set_step_route("default-click")
             self.logger.info(
                 "Route default-click line=%s testId=%s",
                 step.index,
@@ -267,6 +390,435 @@ class SimpleInteractionLogExecutor:
     def set_prepare_hook(self, hook: Callable[[], None] | None) -> None:
         self.prepare_hook = hook
 
+    def set_checkpoint(self, path: str | Path | None) -> None:
+        self.checkpoint_path = Path(path) if path else None
+
+    def set_checkpoint_hooks(
+        self,
+        capture: StateCapture | None = None,
+        restore: StateRestore | None = None,
+        fingerprint: StateCapture | None = None,
+    ) -> None:
+        self.checkpoint_state_hook = capture
+        self.restore_state_hook = restore
+        self.fingerprint_hook = fingerprint
+
+    def set_step_results(self, path: str | Path | None) -> None:
+        self.step_results_path = Path(path) if path else None
+
+    def set_pace(self, factor: float | None) -> None:
+        """Think-time scale for replay_steps: None — off, 0 — flat-out with report."""
+        self.pace = factor
+
+    def set_visual_async(self, mode: str | None) -> None:
+        """
+        Background visual checks: "step" collects them at the end of each step
+        (a failure fails that step), "case" at the end of replay_steps; None,
+        "" or "0" compares synchronously inside BasePage.screenshot.
+        """
+        mode = (mode or "").strip().lower()
+        if mode in ("", "0", "off", "false", "no"):
+            self.visual_async = None
+            return
+        if mode in ("1", "on", "true", "yes"):
+            mode = "step"
+        if mode not in VISUAL_ASYNC_MODES:
+            raise ValueError(f"visual_async must be one of {VISUAL_ASYNC_MODES}, got {mode!r}")
+        self.visual_async = mode
+
+    def set_lookahead(self, enabled: bool) -> None:
+        self.lookahead = bool(enabled)
+        if not self.lookahead:
+            self._cancel_lookahead()
+
+    # ---------- lookahead ----------
+    def _schedule_lookahead(
+        self,
+        steps: list[InteractionStep],
+        start: int,
+    ) -> None:
+        """
+        Registers prefetch of the next non-skipped step locator as a driver idle
+        task. Page objects run it right after an action that is followed by a
+        long settle wait, so the frame walk happens off the critical path.
+        """
+        set_idle_task = getattr(self.driver, "set_idle_task", None)
+        prefetch = getattr(self.driver, "prefetch_in_frames", None)
+        if not callable(set_idle_task) or not callable(prefetch):
+            return
+        for next_step in steps[start:]:
+            if any(self._rule_matches(next_step, rule) for rule in self.skip_rules):
+                continue
+            locator = self._locator_from_step(next_step)
+            if locator is None:
+                return
+
+            def _prefetch(
+                locator: tuple[str, str] = locator,
+                line: int = next_step.index,
+            ) -> None:
+                found = prefetch(*locator)
+                self.logger.info(
+                    "Lookahead line=%s locator=%s found=%s", line, locator, found
+                )
+
+            set_idle_task(_prefetch)
+            return
+
+    def _cancel_lookahead(self) -> None:
+        """
+        Drops the idle task after a step. If it never ran, nothing was
+        prefetched for the upcoming step and any leftover entry is stale.
+        """
+        cancel_idle_task = getattr(self.driver, "cancel_idle_task", None)
+        clear_prefetched = getattr(self.driver, "clear_prefetched", None)
+        if callable(cancel_idle_task) and cancel_idle_task():
+            if callable(clear_prefetched):
+                clear_prefetched()
+
+    # ---------- checkpoint / resume ----------
+    @staticmethod
+    def _log_digest(log_path: str | Path) -> str:
+        return hashlib.sha1(Path(log_path).read_bytes()).hexdigest()
+
+    def _state_fingerprint(self) -> dict[str, Any]:
+        fingerprint: dict[str, Any] = {"window": self.driver.get_current_window_handle()}
+        if self.fingerprint_hook is not None:
+            fingerprint.update(self.fingerprint_hook())
+        return fingerprint
+
+    def _read_checkpoint(self) -> list[dict[str, Any]]:
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return []
+        with self.checkpoint_path.open("r", encoding="utf-8") as stream:
+            return [json.loads(line) for line in stream if line.strip()]
+
+    def _open_checkpoint(
+        self,
+        log_path: str | Path,
+        steps: list[InteractionStep],
+        start: int,
+    ) -> None:
+        """
+        Starts the checkpoint file: header + entries of the kept prefix
+        (steps before start), then one entry per passed step is appended.
+        """
+        if self.checkpoint_path is None:
+            return
+        kept: list[dict[str, Any]] = []
+        if start > 0:
+            first_line = steps[start].index
+            kept = [
+                e for e in self._read_checkpoint()[1:] if e["line"] < first_line
+            ]
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        self._checkpoint_stream = self.checkpoint_path.open("w", encoding="utf-8")
+        header = {
+            "kind": "header",
+            "log": str(Path(log_path).resolve()),
+            "log_sha1": self._log_digest(log_path),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        for entry in [header, *kept]:
+            self._checkpoint_stream.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._checkpoint_stream.flush()
+        self.logger.info(
+            "Checkpoint file=%s kept_steps=%s", self.checkpoint_path, len(kept)
+        )
+
+    def _write_checkpoint(self, step: InteractionStep) -> None:
+        entry = self._checkpoint_entry(step)
+        if entry is not None:
+            self._append_checkpoint(entry)
+
+    def _checkpoint_entry(self, step: InteractionStep) -> dict[str, Any] | None:
+        try:
+            return {
+                "kind": "step",
+                "line": step.index,
+                "seq": getattr(step, "seq", None),
+                "window_handle": self.driver.get_current_window_handle(),
+                "state": self.checkpoint_state_hook() if self.checkpoint_state_hook else {},
+                "fingerprint": self._state_fingerprint(),
+            }
+        except Exception:
+            # A broken checkpoint must not fail a passed step: resume just
+            # cannot start right after this line.
+            self.logger.warning("Checkpoint skipped line=%s", step.index, exc_info=True)
+            return None
+
+    def _append_checkpoint(self, entry: dict[str, Any]) -> None:
+        self._checkpoint_stream.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._checkpoint_stream.flush()
+
+    def _hold_step(
+        self,
+        step: InteractionStep,
+        started_at: float,
+        duration_sec: float,
+        commands_before: tuple[int, int],
+        error: BaseException | None = None,
+    ) -> dict[str, Any]:
+        """Step result, step event and checkpoint of a step, built now and written by _flush_held_steps."""
+        return {
+            "line": step.index,
+            "result": (
+                self._step_result_entry(step, started_at, duration_sec, error)
+                if self._step_results_stream is not None
+                else None
+            ),
+            "event": (
+                self._step_event_fields(step, duration_sec, commands_before, error)
+                if events_enabled()
+                else None
+            ),
+            "checkpoint": (
+                self._checkpoint_entry(step)
+                if self._checkpoint_stream is not None and error is None
+                else None
+            ),
+        }
+
+    def _flush_held_steps(
+        self,
+        held: list[dict[str, Any]],
+        results: list[VisualCheckResult],
+        *,
+        stop_on_error: bool,
+    ) -> None:
+        """
+        Writes steps held back until their visual checks were collected. A step
+        with a failed check is written as failed with the visual error and gets
+        no checkpoint; with stop_on_error the steps after it get no checkpoint
+        either, as if the replay had stopped there.
+        """
+        errors: dict[Any, str] = {}
+        for result in results:
+            if result.error is not None:
+                line = result.step.get("line")
+                text = f"{type(result.error).__name__}: {result.error}"
+                errors[line] = f"{errors[line]}; {text}" if line in errors else text
+        pending, held[:] = list(held), []
+        checkpoints = True
+        for item in pending:
+            error = errors.get(item["line"])
+            if error is not None:
+                for record in (item["result"], item["event"]):
+                    if record is not None and record["status"] == "ok":
+                        record.update(status="failed", error=error)
+                item["checkpoint"] = None
+                if stop_on_error:
+                    checkpoints = False
+            if item["result"] is not None and self._step_results_stream is not None:
+                self._append_step_result(item["result"])
+            if item["event"] is not None:
+                log_event("step", **item["event"])
+            if checkpoints and item["checkpoint"] is not None and self._checkpoint_stream is not None:
+                self._append_checkpoint(item["checkpoint"])
+
+    def _close_checkpoint(self) -> None:
+        if self._checkpoint_stream is not None:
+            self._checkpoint_stream.close()
+            self._checkpoint_stream = None
+
+    # ---------- step results ----------
+    def _open_step_results(self) -> None:
+        """Appends to step_results_path: a resumed replay continues the same file."""
+        if self.step_results_path is None:
+            return
+        self.step_results_path.parent.mkdir(parents=True, exist_ok=True)
+        self._step_results_stream = self.step_results_path.open("a", encoding="utf-8")
+        self._step_labels = {"connection": None, "query": None}
+
+    def _write_step_result(
+        self,
+        step: InteractionStep,
+        started_at: float,
+        duration_sec: float,
+        error: BaseException | None = None,
+    ) -> None:
+        self._append_step_result(self._step_result_entry(step, started_at, duration_sec, error))
+
+    def _step_result_entry(
+        self,
+        step: InteractionStep,
+        started_at: float,
+        duration_sec: float,
+        error: BaseException | None = None,
+    ) -> dict[str, Any]:
+        # Connection/query stay set until the log names another one, so a
+        # preview click is attributed to the connection selected before it.
+        for label, field in (("connection", "connectionName"), ("query", "queryName")):
+            value = str(step.get(field) or "").strip()
+            if value:
+                self._step_labels[label] = value
+        event, action = step.action_key
+        return {
+            "line": step.index,
+            "seq": getattr(step, "seq", None),
+            "event": event,
+            "action": action,
+            "test_id": getattr(step, "testId", None),
+            "route": self._step_route,
+            **self._step_labels,
+            "status": "failed" if error is not None else "ok",
+            "started_at": round(started_at, 3),
+            "duration_sec": round(duration_sec, 4),
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+        }
+
+    def _append_step_result(self, entry: dict[str, Any]) -> None:
+        self._step_results_stream.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._step_results_stream.flush()
+
+    def _set_step_route(self, route: str) -> None:
+        # Page-method events inside the handler carry the route as well.
+        self._step_route = route
+        self._step_event["route"] = route
+
+    def _command_counts(self) -> tuple[int, int]:
+        """WebDriver commands so far: the step's own and the lookahead prefetch."""
+        return (
+            getattr(self.driver, "command_count", 0),
+            getattr(self.driver, "lookahead_command_count", 0),
+        )
+
+    def _log_step_event(
+        self,
+        step: InteractionStep,
+        duration_sec: float,
+        commands_before: tuple[int, int],
+        error: BaseException | None = None,
+    ) -> None:
+        log_event("step", **self._step_event_fields(step, duration_sec, commands_before, error))
+
+    def _step_event_fields(
+        self,
+        step: InteractionStep,
+        duration_sec: float,
+        commands_before: tuple[int, int],
+        error: BaseException | None = None,
+    ) -> dict[str, Any]:
+        event, action = step.action_key
+        commands, lookahead_commands = self._command_counts()
+        return {
+            "line": step.index,
+            "seq": getattr(step, "seq", None),
+            "event": event,
+            "action": action,
+            "test_id": getattr(step, "testId", None),
+            "route": self._step_route,
+            "status": "failed" if error is not None else "ok",
+            "duration_sec": round(duration_sec, 4),
+            "commands": commands - commands_before[0],
+            "lookahead_commands": lookahead_commands - commands_before[1],
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+        }
+
+    def _check_visual_results(
+        self, results: list[VisualCheckResult], *, stop_on_error: bool = True
+    ) -> None:
+        """
+        Reports background visual checks against the step they were captured
+        on and raises VisualMismatch listing the failed ones.
+        """
+        failures = []
+        for result in results:
+            status = "ok" if result.passed else "failed"
+            if result.error is not None:
+                if not isinstance(result.error, VisualMismatch):
+                    status = "error"
+                failures.append(result)
+                self.logger.error(
+                    "Visual check failed: name=%s line=%s seq=%s: %s",
+                    result.name,
+                    result.step.get("line"),
+                    result.step.get("seq"),
+                    result.error,
+                )
+            if events_enabled():
+                log_event(
+                    "visual",
+                    **result.step,
+                    name=result.name,
+                    status=status,
+                    compare_sec=round(result.compare_sec, 4),
+                    error=(
+                        f"{type(result.error).__name__}: {result.error}"
+                        if result.error is not None
+                        else None
+                    ),
+                )
+        if failures and stop_on_error:
+            details = "; ".join(
+                f"{r.name} (line={r.step.get('line')}, seq={r.step.get('seq')}): {r.error}"
+                for r in failures
+            )
+            raise VisualMismatch(
+                f"{len(failures)} visual check(s) failed: {details}"
+            ) from failures[0].error
+
+    def _close_step_results(self) -> None:
+        if self._step_results_stream is not None:
+            self._step_results_stream.close()
+            self._step_results_stream = None
+
+    def _resume_checkpoint(
+        self,
+        log_path: str | Path,
+        steps: list[InteractionStep],
+        resume_from: int,
+    ) -> int:
+        """
+        Validates the checkpoint against the current UI and returns the position
+        of the step at line resume_from. Raises RuntimeError when the prefix
+        cannot be skipped safely.
+        """
+        if self.checkpoint_path is None:
+            raise RuntimeError("resume_from requires checkpoint_path")
+        start = next((i for i, s in enumerate(steps) if s.index >= resume_from), None)
+        if start is None:
+            raise RuntimeError(f"No step at or after line={resume_from}")
+        if start == 0:
+            return 0
+
+        entries = self._read_checkpoint()
+        if not entries or entries[0].get("log_sha1") != self._log_digest(log_path):
+            raise RuntimeError(
+                f"Checkpoint {self.checkpoint_path} was not written for this log"
+            )
+        previous_line = steps[start - 1].index
+        entry = next(
+            (e for e in reversed(entries[1:]) if e["line"] == previous_line), None
+        )
+        if entry is None:
+            raise RuntimeError(
+                f"Checkpoint has no passed step at line={previous_line}: "
+                f"cannot resume from line={steps[start].index}"
+            )
+
+        if entry["window_handle"] not in self.driver.get_window_handles():
+            raise RuntimeError(
+                f"Checkpoint window {entry['window_handle']} after line={previous_line} "
+                f"is closed: cannot resume from line={steps[start].index}"
+            )
+        self.driver.set_window_handle(entry["window_handle"])
+        if self.restore_state_hook is not None:
+            self.restore_state_hook(entry.get("state") or {})
+        current = self._state_fingerprint()
+        if current != entry["fingerprint"]:
+            raise RuntimeError(
+                f"UI state differs from checkpoint after line={previous_line}: "
+                f"expected={entry['fingerprint']} actual={current}"
+            )
+        self.logger.info(
+            "Resume from line=%s: skipped %s steps, fingerprint=%s",
+            steps[start].index,
+            start,
+            current,
+        )
+        return start
+
     # ---------- routes ----------
     def _build_click_routes(
         self,
@@ -291,6 +843,7 @@ class SimpleInteractionLogExecutor:
             handler = self.step_routes.get(key)
             if handler is None:
                 continue
+            self._set_step_route(f"step:{key[0]}/{key[1]}")
             self.logger.info(
                 "Route step line=%s key=%s",
                 step.index,
@@ -307,6 +860,7 @@ class SimpleInteractionLogExecutor:
 
         exact = self.click_routes_exact.get(test_id)
         if exact:
+            self._set_step_route(f"exact:{test_id}")
             self.logger.info(
                 "Route exact line=%s testId=%s",
                 step.index,
@@ -317,6 +871,7 @@ class SimpleInteractionLogExecutor:
 
         for prefix, handler in self.click_routes_prefix.items():
             if test_id.startswith(prefix):
+                self._set_step_route(f"prefix:{prefix}")
                 self.logger.info(
                     "Route prefix line=%s testId=%s prefix=%s",
                     step.index,
@@ -454,6 +1009,61 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Do not call prepare hook before replay.",
     )
+    parser.add_argument(
+        "--lookahead",
+        action="store_true",
+        help="Pre-resolve next step locator while the current step waits for a loader.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Write a checkpoint JSONL after each passed step.",
+    )
+    parser.add_argument(
+        "--resume-from",
+        type=int,
+        default=None,
+        help=(
+            "Log line to resume from; steps before it are skipped if the UI still "
+            "matches the --checkpoint fingerprint."
+        ),
+    )
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=None,
+        help=(
+            "Replay recorded think times scaled by FACTOR (1 realistic, 0.1 fast, "
+            "0 flat-out) and report achieved vs recorded duration."
+        ),
+    )
+    parser.add_argument(
+        "--close-tabs",
+        action="store_true",
+        help="Close windows opened by this replay when it ends.",
+    )
+    parser.add_argument(
+        "--max-tabs",
+        type=int,
+        default=None,
+        help="Close the oldest editor tabs so that at most N stay open after the replay.",
+    )
+    parser.add_argument(
+        "--step-results",
+        type=Path,
+        default=None,
+        help="Append one JSONL line per step (route, duration, outcome) to this file.",
+    )
+    parser.add_argument(
+        "--visual-async",
+        choices=VISUAL_ASYNC_MODES,
+        default=None,
+        help=(
+            "Compare screenshots in a background thread pool and collect the results at "
+            "the end of each step or of the case (default: env VISUAL_ASYNC, else synchronous)."
+        ),
+    )
     return parser
 
 
@@ -505,6 +1115,11 @@ def _apply_external_profile(executor: SimpleInteractionLogExecutor) -> None:
         executor.set_prepare_hook(build_prepare_fn(executor))
         configured = True
 
+    build_checkpoint_fn = getattr(module, "build_checkpoint_hooks", None)
+    if callable(build_checkpoint_fn):
+        executor.set_checkpoint_hooks(*build_checkpoint_fn(executor))
+        configured = True
+
     if configured:
         executor.logger.info("External routes profile loaded: %s", module_name)
     else:
@@ -525,20 +1140,63 @@ def main(argv: list[str] | None = None) -> int:
     if not log_path.exists():
         parser.error(f"Log file not found: {log_path}")
 
+    if args.resume_from is not None and args.checkpoint is None:
+        parser.error("--resume-from requires --checkpoint")
+
     driver = DriverOnlyOffice(debugger_address=args.debugger_address)
-    executor = SimpleInteractionLogExecutor(driver=driver)
+    executor = SimpleInteractionLogExecutor(
+        driver=driver,
+        lookahead=args.lookahead,
+        checkpoint_path=args.checkpoint,
+        pace=args.pace,
+        step_results_path=args.step_results,
+        visual_async=args.visual_async,
+    )
+    tabs = None
+    if args.close_tabs or args.max_tabs is not None:
+        tabs = TabLifecycleManager(
+            driver, max_live_tabs=args.max_tabs, close_on_end=args.close_tabs
+        )
+        tabs.begin_case(log_path.name)
     try:
         _apply_external_profile(executor)
         executor.replay_file(
             log_path=log_path,
             prepare_plugin_home=not args.no_prepare,
             stop_on_error=True,
+            resume_from=args.resume_from,
         )
     except Exception as exc:
         print(f"[replay-simple] failed: {exc}")
         return 2
     finally:
+        if tabs is not None:
+            try:
+                tabs.end_case()
+            except Exception as exc:
+                print(f"[replay-simple] tab cleanup failed: {exc}")
         executor.close()
+        if executor.last_pacing is not None:
+            pacing = executor.last_pacing
+            print(
+                f"[replay-simple] pacing factor={pacing['factor']} "
+                f"recorded={pacing['recorded_sec']}s actual={pacing['actual_sec']}s "
+                f"achieved_ratio={pacing['achieved_ratio']} late_steps={pacing['late_steps']}"
+            )
+        if executor.last_visual is not None:
+            visual = executor.last_visual
+            print(
+                f"[replay-simple] visual checks={visual['checks']} failed={visual['failed']} "
+                f"capture={visual['capture_sec']}s compare={visual['compare_sec']}s "
+                f"wait={visual['wait_sec']}s workers={visual['workers']}"
+            )
+        cache = baseline_cache_stats()
+        if cache["hits"] or cache["misses"]:
+            print(
+                f"[replay-simple] visual baseline cache hits={cache['hits']} "
+                f"misses={cache['misses']} hit_rate={cache['hit_rate']} "
+                f"entries={cache['entries']} bytes={cache['bytes']}"
+            )
 
     print("[replay-simple] completed successfully")
     return 0
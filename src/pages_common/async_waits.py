@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import Any, Callable
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+
+from ..async_driver import DriverOwner
+from .base_page import BasePage
+
+
+class AsyncWaits:
+    """
+    Async-аналоги ожиданий BasePage (_wait_find, _wait_locator, WebDriverWait.until/until_not).
+
+    Каждая проверка условия — одна короткая команда через DriverOwner,
+    между проверками корутина спит (asyncio.sleep) и отдаёт управление
+    другим вкладкам. handle — окно вкладки, в котором выполняются команды.
+    """
+
+    IGNORED_EXCEPTIONS: tuple[type[BaseException], ...] = (NoSuchElementException,)
+
+    def __init__(
+        self,
+        owner: DriverOwner,
+        handle: str | None = None,
+        poll_frequency: float = 0.5,
+    ):
+        self.owner = owner
+        self.handle = handle
+        self.poll_frequency = poll_frequency
+
+    async def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Выполняет синхронный вызов page-объекта в окне этой вкладки."""
+        return await self.owner.call(fn, *args, handle=self.handle, **kwargs)
+
+    async def until(
+        self,
+        condition: Callable[[], Any],
+        timeout: float = 10,
+        message: str = "",
+    ) -> Any:
+        """Ждёт truthy-результата condition(); TimeoutException по истечении timeout."""
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                value = await self.call(condition)
+                if value:
+                    return value
+            except self.IGNORED_EXCEPTIONS:
+                pass
+            if monotonic() >= deadline:
+                raise TimeoutException(message or f"condition not met in {timeout}s")
+            await asyncio.sleep(self.poll_frequency)
+
+    async def until_not(
+        self,
+        condition: Callable[[], Any],
+        timeout: float = 10,
+        message: str = "",
+    ) -> bool:
+        """Ждёт falsy-результата condition() (игнорируемое исключение тоже считается успехом)."""
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                value = await self.call(condition)
+                if not value:
+                    return True
+            except self.IGNORED_EXCEPTIONS:
+                return True
+            if monotonic() >= deadline:
+                raise TimeoutException(message or f"condition still true after {timeout}s")
+            await asyncio.sleep(self.poll_frequency)
+
+    async def wait_find(
+        self,
+        page: BasePage,
+        locator: tuple[str, str],
+        timeout: float = 10,
+    ) -> WebElement:
+        """Аналог BasePage._wait_find_locator."""
+        by, selector = locator
+        return await self.until(
+            lambda: page.driver.find_element_in_frames(by, selector),
+            timeout,
+            f"Элемент {by}='{selector}' не найден в iframe",
+        )
+
+    async def wait_locator(
+        self,
+        page: BasePage,
+        locator: tuple[str, str],
+        timeout: float = 3,
+        require_displayed: bool = True,
+        require_enabled: bool = True,
+    ) -> WebElement | None:
+        """Аналог BasePage._wait_locator: элемент или None при таймауте."""
+        try:
+            return await self.until(
+                lambda: page._locator_ready(locator, require_displayed, require_enabled),
+                timeout,
+            )
+        except TimeoutException:
+            return None
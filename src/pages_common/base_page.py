@@ -1,4 +1,8 @@
+import functools
+import inspect
 import time
+from contextvars import ContextVar
+from time import perf_counter
 
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -7,8 +11,54 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.action_chains import ActionChains
 
-from ..utils.logging_utils import get_logger
+from ..utils.logging_utils import events_enabled, get_logger, log_event
 from ..utils.visual import assert_screenshot
+from ..utils.visual_pool import active_visual_pool
+
+_page_call_active: ContextVar[bool] = ContextVar("page_call_active", default=False)
+
+
+def _page_method_event(name: str, fn):
+    """
+    Обёртка публичного метода page object: при включённом журнале событий
+    пишет событие page_method (длительность, число команд WebDriver).
+    Вложенные вызовы других методов page objects отдельно не пишутся.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if not events_enabled() or _page_call_active.get():
+            return fn(self, *args, **kwargs)
+        token = _page_call_active.set(True)
+        commands = getattr(self.driver, "command_count", 0)
+        started = perf_counter()
+        error: BaseException | None = None
+        try:
+            return fn(self, *args, **kwargs)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _page_call_active.reset(token)
+            log_event(
+                "page_method",
+                method=name,
+                status="failed" if error is not None else "ok",
+                duration_sec=round(perf_counter() - started, 4),
+                commands=getattr(self.driver, "command_count", 0) - commands,
+                error=f"{type(error).__name__}: {error}" if error is not None else None,
+            )
+
+    return wrapper
+
+
+def _wrap_page_methods(cls: type) -> None:
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value):
+            continue
+        if inspect.iscoroutinefunction(value):
+            continue
+        setattr(cls, attr, _page_method_event(f"{cls.__name__}.{attr}", value))
 
 
 class BasePage:
@@ -16,6 +66,10 @@ class BasePage:
     Базовый Page Object, использует find_element_in_frames для неявного поиска в iframe.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _wrap_page_methods(cls)
+
     def __init__(self, driver, timeout: int = 10):
         self.driver = driver
         self.wait = WebDriverWait(driver.driver, timeout)
@@ -52,6 +106,15 @@ class BasePage:
             )
         return el
 
+    def _run_lookahead(self) -> None:
+        """
+        Вызывается сразу после действия, за которым следует долгое ожидание:
+        драйвер успевает заранее найти элемент следующего шага replay.
+        """
+        run_idle = getattr(self.driver, "run_idle_task", None)
+        if callable(run_idle):
+            run_idle()
+
     def _js_click(self, element: WebElement) -> None:
         # self.driver.driver.execute_script(
         #     "arguments[0].scrollIntoView({block:'center'});", element
@@ -245,7 +308,16 @@ class BasePage:
 
     # --- Visual regression helpers ---
     def screenshot(self, name: str, element: WebElement | None = None, **kwargs):
-        """Снимает скрин и сравнивает с baseline (см. utils.visual.assert_screenshot)."""
+        """
+        Снимает скрин и сравнивает с baseline (см. utils.visual.assert_screenshot).
+        Если executor включил фоновый пул (VISUAL_ASYNC), здесь только снимок:
+        сравнение уходит в пул, результат executor соберёт в конце шага/кейса,
+        а метод возвращает None.
+        """
+        pool = active_visual_pool()
+        if pool is not None:
+            pool.submit(self.driver.driver, name, element=element, logger=self.logger, **kwargs)
+            return None
         return assert_screenshot(
             self.driver.driver, name=name, element=element, logger=self.logger, **kwargs
         )
@@ -284,20 +356,34 @@ class BasePage:
         Ждёт появления локатора (учитывая iframe), опционально проверяет visible/enabled,
         затем кликает. Возвращает True при успехе, False при таймауте.
         """
-        by, selector = locator
-
         def _ready(_):
-            el = self.driver.find_element_in_frames(by, selector)
-            if not el:
-                return False
-            if require_displayed and not el.is_displayed():
-                return False
-            if require_enabled and not el.is_enabled():
-                return False
-            return el
+            return self._locator_ready(locator, require_displayed, require_enabled)
 
         try:
             el = WebDriverWait(self.driver.driver, timeout).until(_ready)
             return el
         except TimeoutException:
             return None
+
+    def _locator_ready(
+        self,
+        locator: tuple[str, str],
+        require_displayed: bool = True,
+        require_enabled: bool = True,
+    ) -> WebElement | bool:
+        """
+        Одна проверка без ожидания: элемент найден (с учётом iframe) и,
+        опционально, видим/доступен. Возвращает элемент или False.
+        """
+        by, selector = locator
+        el = self.driver.find_element_in_frames(by, selector)
+        if not el:
+            return False
+        if require_displayed and not el.is_displayed():
+            return False
+        if require_enabled and not el.is_enabled():
+            return False
+        return el
+
+
+_wrap_page_methods(BasePage)
@@ -41,6 +41,17 @@ class EditorPage(BasePage):
         self._log("click_close")
         self._js_click_locator(self.CLOSE_BUTTON)
 
+    def click_close_if_shown(self) -> bool:
+        """
+        Кликает по кнопке закрытия всплывающего окна, если она уже показана
+        (одна проверка без ожидания). Возвращает True, если кликнул.
+        """
+        self._log("click_close_if_shown")
+        el = self._locator_ready(self.CLOSE_BUTTON)
+        if el:
+            self._js_click(el)
+        return bool(el)
+
     def try_click_close(self) -> bool:
         """
         Пытается кликнуть по кнопке закрытия всплывающего окна (div.tool.close).
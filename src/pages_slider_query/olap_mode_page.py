@@ -47,18 +47,16 @@ class OlapModePage(BasePage):
             raise RuntimeError("Pivot cube select is disabled or not ready")
         Select(select_el).select_by_visible_text(visible_text)
 
-    def click_toolbar_create(self, timeout: int = 30) -> None:
+    def click_toolbar_create(self, timeout: int = 30, wait: bool = True) -> None:
         self._log("click_toolbar_create timeout=%s", timeout)
         btn = self._find_locator(self.PIVOT_TOOLBAR_CREATE_BUTTON)
         self._click(btn)
+        if not wait:
+            return
+        self._run_lookahead()
 
         def _is_disabled(_):
-            current = self.driver.find_element_in_frames(*self.PIVOT_TOOLBAR_CREATE_BUTTON)
-            if not current:
-                return False
-            disabled_attr = current.get_attribute("disabled")
-            aria_disabled = str(current.get_attribute("aria-disabled") or "").lower()
-            return (not current.is_enabled()) or (disabled_attr is not None) or (aria_disabled == "true")
+            return self.toolbar_create_disabled()
 
         # После клика кнопка обычно блокируется на время загрузки.
         try:
@@ -70,6 +68,15 @@ class OlapModePage(BasePage):
         if not ready:
             raise TimeoutException("olap-pivot-toolbar-create did not re-enable after click")
 
+    def toolbar_create_disabled(self) -> bool:
+        """Одна проверка: кнопка создания сводной заблокирована (идёт построение)."""
+        current = self.driver.find_element_in_frames(*self.PIVOT_TOOLBAR_CREATE_BUTTON)
+        if not current:
+            return False
+        disabled_attr = current.get_attribute("disabled")
+        aria_disabled = str(current.get_attribute("aria-disabled") or "").lower()
+        return (not current.is_enabled()) or (disabled_attr is not None) or (aria_disabled == "true")
+
     def click_header(self) -> None:
         self._log("click_pivot_header")
         self._click_locator(self.PIVOT_HEADER)
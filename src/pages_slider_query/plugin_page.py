@@ -107,4 +107,27 @@ class PluginPage(BasePage):
         """
         self._js_click_locator(self.CLOSE_PLUGIN_BUTTON)
         time.sleep(0.1)
-
+
+    def read_plugin_version(self) -> str | None:
+        """
+        Версия плагина из его config.json (читается из iframe плагина).
+        None, если плагин в текущем окне не открыт или версия не найдена.
+        """
+        if self.driver.find_element_in_frames(*self.MAIN_SQL_MODE_BUTTON) is None:
+            return None
+        version = self.driver.driver.execute_script(
+            """
+            try {
+                const info = window.Asc && window.Asc.plugin && window.Asc.plugin.info;
+                if (info && info.version) { return String(info.version); }
+                const xhr = new XMLHttpRequest();
+                xhr.open("GET", "config.json", false);
+                xhr.send(null);
+                return String(JSON.parse(xhr.responseText).version || "") || null;
+            } catch (e) {
+                return null;
+            }
+            """
+        )
+        self._log("plugin version=%s", version)
+        return version
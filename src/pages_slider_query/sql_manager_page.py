@@ -134,17 +134,7 @@ class SqlManagerPage(BasePage):
         self._log("wait_connections_ready timeout=%s", timeout)
 
         def _all_success(_):
-            list_root = self._find_locator(self.CONNECTION_LIST_UL)
-            items = list_root.find_elements(*self.CONNECTION_ITEM)
-            if not items:
-                return False
-            for li in items:
-                cls = li.get_attribute("class") or ""
-                if "connection-item" not in cls:
-                    return False
-                if "connection-success" not in cls and "connection-error" not in cls:
-                    return False
-            return True
+            return self.connections_ready()
 
         try:
             WebDriverWait(self.driver.driver, timeout).until(_all_success)
@@ -154,6 +144,22 @@ class SqlManagerPage(BasePage):
                 f"Не все соединения стали connection-success за {timeout}с"
             )
 
+    def connections_ready(self) -> bool:
+        """Одна проверка: все соединения уже в состоянии connection-success/connection-error."""
+        list_root = self.driver.find_element_in_frames(*self.CONNECTION_LIST_UL)
+        if list_root is None:
+            return False
+        items = list_root.find_elements(*self.CONNECTION_ITEM)
+        if not items:
+            return False
+        for li in items:
+            cls = li.get_attribute("class") or ""
+            if "connection-item" not in cls:
+                return False
+            if "connection-success" not in cls and "connection-error" not in cls:
+                return False
+        return True
+
     def expand_connection(self, connection_title: str):
         """Кликает по стрелке expand у соединения с указанным заголовком."""
         self._log("expand_connection %s", connection_title)
@@ -280,13 +286,17 @@ class SqlManagerPage(BasePage):
         Select(select_el).select_by_visible_text(connection_name)
         return select_el
 
-    def click_query_preview(self, timeout: int = 10):
+    def click_query_preview(self, timeout: int = 10, wait: bool = True):
         """
         Жмет кнопку предпросмотра в карточке.
+        wait=False — только клик, ожидание лоадера остаётся вызывающему (см. preview_loading).
         """
         self._log("click_query_preview timeout=%s", timeout)
         btn = self._find_child_by_testid(self.card, "sql-manager-query-preview")
         self._js_click(btn)
+        if not wait:
+            return btn
+        self._run_lookahead()
         try:
             WebDriverWait(self.driver.driver, timeout).until_not(
                 lambda d: self.card.find_element(*self.PREVIEW_LOADER)
@@ -296,6 +306,18 @@ class SqlManagerPage(BasePage):
         time.sleep(0.5)
         return btn
 
+    def preview_loading(self) -> bool:
+        """Одна проверка: лоадер предпросмотра в текущей карточке ещё виден."""
+        try:
+            self.card.find_element(*self.PREVIEW_LOADER)
+        except NoSuchElementException:
+            return False
+        return True
+
+    def export_loading(self) -> bool:
+        """Одна проверка: лоадер выгрузки присутствует на странице."""
+        return self.driver.find_element_in_frames(*self.PREVIEW_LOADER) is not None
+
     def click_query_delete(self):
         """
         Жмет кнопку удаления запроса в карточке.
@@ -356,14 +378,18 @@ class SqlManagerPage(BasePage):
         Select(sel).select_by_visible_text(visible_text)
         return sel
 
-    def confirm_export(self, timeout: int = 10):
+    def confirm_export(self, timeout: int = 10, wait: bool = True):
         """
         Жмет кнопку 'Выгрузить', ждёт исчезновения лоадера предпросмотра,
         возвращает (title, text) из success-диалога.
+        wait=False — только клик, ожидание лоадера остаётся вызывающему (см. export_loading).
         """
         self._log("confirm_export timeout=%s", timeout)
         btn = self._find_locator(self.EXPORT_CONFIRM_BTN)
         ActionChains(self.driver.driver).move_to_element(btn).click().perform()
+        if not wait:
+            return btn
+        self._run_lookahead()
         # ждём появления лоадера
         try:
             WebDriverWait(self.driver.driver, timeout).until(
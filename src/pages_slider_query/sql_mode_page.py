@@ -32,13 +32,17 @@ class SqlModePage(BasePage):
         super().__init__(driver, timeout=10)
         self.sql_manager = SqlManagerPage(driver)
 
-    def click_sql_manager(self) -> None:
+    def click_sql_manager(self, wait: bool = True) -> None:
         """
         Нажимает на кнопку в левом меню под названием\n
         Менеджер SQL
+        wait=False — без ожидания проверки соединений (см. SqlManagerPage.connections_ready).
         """
         self._log("click_make_sql")
         self._js_click_locator(self.SQL_MANAGER_BUTTON)
+        if not wait:
+            return
+        self._run_lookahead()
         self.sql_manager.wait_connections_ready(timeout=40)
 
     def click_report_manager(self) -> None:
@@ -0,0 +1,460 @@
+"""
+Parallel replay of interaction-log cases with a pool of worker processes.
+
+Each worker attaches its own DriverOnlyOffice session to a debugger address
+("option 2" from features/load-testing-spec.md), opens its own editor window
+through the routes profile prepare hook and takes cases from a shared queue.
+
+Contention between sessions on the same DevTools endpoint is measured, not
+assumed:
+- window-handle collisions: two workers ending up in the same editor window;
+- command latency inflation: a trivial `return 1` script timed before each
+  case, compared with the worker's baseline measured while it held the
+  address lock (no other worker issuing commands).
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+PROBE_SAMPLES = 5
+
+
+@dataclass(frozen=True)
+class PoolTask:
+    index: int
+    case_file: str
+    case_dir: str
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    prepare: bool = True
+    warm_tabs: int = 0
+    close_tabs: bool = False
+    max_tabs: int | None = None
+    pace: float | None = None
+    lookahead: bool = False
+
+
+def _probe_latency_ms(driver) -> float:
+    samples = []
+    for _ in range(PROBE_SAMPLES):
+        started = perf_counter()
+        driver.driver.execute_script("return 1;")
+        samples.append((perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def _attach_case_log(case_dir: Path) -> logging.Handler:
+    """Mirrors the project log into <case_dir>/run-case.log for one case."""
+    from .utils.logging_utils import add_log_handler
+
+    handler = logging.FileHandler(case_dir / "run-case.log", encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s %(message)s"))
+    add_log_handler(handler)
+    return handler
+
+
+def _build_warm_pool(driver, home_handle: str, size: int, routes_module: str):
+    """WarmTabPool from the profile's build_warm_tab_hooks, or None if absent."""
+    import importlib
+
+    from .interaction_log_executor_simple import (
+        SimpleInteractionLogExecutor,
+        _apply_external_profile,
+    )
+    from .utils.multitab import WarmTabPool
+
+    build_hooks_fn = getattr(importlib.import_module(routes_module), "build_warm_tab_hooks", None)
+    if not callable(build_hooks_fn):
+        return None
+    executor = SimpleInteractionLogExecutor(driver=driver)
+    _apply_external_profile(executor)
+    return WarmTabPool(driver, build_hooks_fn(executor), size=size, home_handle=home_handle)
+
+
+def _publish_warm_tabs(warm_pool, claimed_handles, worker_id: int) -> None:
+    """
+    Claims every tab of the worker's warm pool (idle and busy) in the shared
+    dict and drops claims of the tabs it has closed. Call under the address
+    lock right after the pool opened or closed tabs, so other workers' tab
+    cleanup never sees an unclaimed warm tab.
+    """
+    owned = {t.handle for t in warm_pool.idle} | set(warm_pool.busy)
+    for handle, owner in list(claimed_handles.items()):
+        if owner == worker_id and handle not in owned:
+            claimed_handles.pop(handle, None)
+    for handle in owned:
+        claimed_handles[handle] = worker_id
+
+
+def _worker_main(
+    worker_id: int,
+    debugger_address: str,
+    routes_module: str,
+    options: PoolOptions,
+    log_dir: str,
+    tasks: mp.Queue,
+    results: mp.Queue,
+    address_lock,
+    claimed_handles,
+    stop_event,
+) -> None:
+    os.environ["OO_SIMPLE_ROUTES_MODULE"] = routes_module
+    os.environ["LOG_DIR"] = log_dir
+    from .driver import DriverOnlyOffice
+    from .interaction_log_executor_simple import (
+        SimpleInteractionLogExecutor,
+        _apply_external_profile,
+    )
+    from .tab_lifecycle import TabLifecycleManager
+    from .utils.logging_utils import remove_log_handler, shutdown_logging
+    from .utils.visual import baseline_cache_stats
+
+    prepare = options.prepare
+    try:
+        with address_lock:
+            driver = DriverOnlyOffice(debugger_address=debugger_address)
+            home_handle = driver.get_current_window_handle()
+            baseline_ms = _probe_latency_ms(driver)
+            warm_pool = None
+            if prepare and options.warm_tabs > 0:
+                warm_pool = _build_warm_pool(
+                    driver, home_handle, options.warm_tabs, routes_module
+                )
+                if warm_pool is not None:
+                    warm_pool.fill()
+                    _publish_warm_tabs(warm_pool, claimed_handles, worker_id)
+            tabs = None
+            if options.close_tabs or options.max_tabs is not None:
+                tabs = TabLifecycleManager(
+                    driver,
+                    home_handle=home_handle,
+                    max_live_tabs=options.max_tabs,
+                    close_on_end=options.close_tabs,
+                )
+    except Exception as exc:
+        results.put(
+            {
+                "kind": "worker_error",
+                "worker": worker_id,
+                "debugger_address": debugger_address,
+                "error": repr(exc),
+            }
+        )
+        shutdown_logging()
+        return
+    results.put(
+        {
+            "kind": "worker_ready",
+            "worker": worker_id,
+            "debugger_address": debugger_address,
+            "baseline_latency_ms": baseline_ms,
+            "warm_tabs": warm_pool.size if warm_pool is not None else 0,
+        }
+    )
+
+    while not stop_event.is_set():
+        try:
+            task: PoolTask = tasks.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        if task is None:
+            break
+
+        case_dir = Path(task.case_dir)
+        case_dir.mkdir(parents=True, exist_ok=True)
+        handler = _attach_case_log(case_dir)
+        result: dict[str, Any] = {
+            "kind": "case",
+            "index": task.index,
+            "case_file": task.case_file,
+            "case_dir": task.case_dir,
+            "worker": worker_id,
+            "debugger_address": debugger_address,
+            "window_handle": None,
+            "handle_collision": None,
+            "error": None,
+        }
+        started = perf_counter()
+        if tabs is not None:
+            tabs.begin_case(case_dir.name)
+        try:
+            result["probe_latency_ms"] = _probe_latency_ms(driver)
+            executor = SimpleInteractionLogExecutor(
+                driver=driver,
+                pace=options.pace,
+                lookahead=options.lookahead,
+                step_results_path=case_dir / "steps.jsonl",
+            )
+            _apply_external_profile(executor)
+            if prepare and (warm_pool is not None or executor.prepare_hook is not None):
+                # Opening a window goes through the home page window list: serialize
+                # per address so two sessions never race on it.
+                with address_lock:
+                    if warm_pool is not None:
+                        handle = warm_pool.acquire()
+                        _publish_warm_tabs(warm_pool, claimed_handles, worker_id)
+                    else:
+                        driver.set_window_handle(home_handle)
+                        executor.prepare_hook()
+                        handle = driver.get_current_window_handle()
+                    owner = claimed_handles.get(handle)
+                    if owner is not None and owner != worker_id:
+                        result["handle_collision"] = owner
+                    claimed_handles[handle] = worker_id
+            else:
+                handle = driver.get_current_window_handle()
+            result["window_handle"] = handle
+            result["prepare_sec"] = round(perf_counter() - started, 3)
+            try:
+                executor.replay_file(task.case_file, prepare_plugin_home=False)
+            finally:
+                result["pacing"] = executor.last_pacing
+            result["status"] = "ok"
+            result["returncode"] = 0
+        except Exception as exc:
+            result["status"] = "failed"
+            result["returncode"] = 2
+            result["error"] = f"{type(exc).__name__}: {exc}"
+        finally:
+            if tabs is not None:
+                try:
+                    with address_lock:
+                        # Never close other workers' windows (their warm tabs are
+                        # claimed as soon as they open) or tabs of our warm pool.
+                        tabs.unprotect(list(tabs.protected))
+                        tabs.protect(h for h, w in claimed_handles.items() if w != worker_id)
+                        if warm_pool is not None:
+                            tabs.protect(t.handle for t in warm_pool.idle)
+                            tabs.protect(warm_pool.busy)
+                        result["tabs_closed"] = len(tabs.end_case())
+                        result["live_tabs"] = len(tabs.live_tabs())
+                except Exception:
+                    logging.getLogger(__name__).warning("tab cleanup failed", exc_info=True)
+            if warm_pool is not None and result["window_handle"] in warm_pool.busy:
+                # Replacement tabs start loading now, while the next case runs.
+                try:
+                    with address_lock:
+                        warm_pool.release(
+                            result["window_handle"], reusable=result["status"] == "ok"
+                        )
+                        _publish_warm_tabs(warm_pool, claimed_handles, worker_id)
+                except Exception:
+                    logging.getLogger(__name__).warning("warm tab release failed", exc_info=True)
+            result["duration_sec"] = round(perf_counter() - started, 3)
+            remove_log_handler(handler)
+            handler.close()
+            result["run_logs"] = [p.name for p in sorted(case_dir.glob("run-*.log"))]
+        results.put(result)
+
+    stats = {"visual_cache": baseline_cache_stats()}
+    if warm_pool is not None:
+        stats.update(warm_pool.stats())
+    results.put({"kind": "worker_stats", "worker": worker_id, **stats})
+    if warm_pool is not None:
+        try:
+            with address_lock:
+                warm_pool.close()
+                _publish_warm_tabs(warm_pool, claimed_handles, worker_id)
+        except Exception:
+            pass
+    try:
+        driver.driver.quit()
+    except Exception:
+        pass
+    # Spawned workers exit without atexit: drain a queued log explicitly.
+    shutdown_logging()
+
+
+def _contention_report(
+    workers: dict[int, dict[str, Any]],
+    cases: list[dict[str, Any]],
+    wall_sec: float,
+) -> dict[str, Any]:
+    per_worker: list[dict[str, Any]] = []
+    for worker_id, info in sorted(workers.items()):
+        own = [c for c in cases if c.get("worker") == worker_id]
+        probes = [c["probe_latency_ms"] for c in own if c.get("probe_latency_ms") is not None]
+        baseline = info.get("baseline_latency_ms")
+        median_probe = round(statistics.median(probes), 3) if probes else None
+        inflation = (
+            round(median_probe / baseline, 2)
+            if median_probe is not None and baseline
+            else None
+        )
+        per_worker.append(
+            {
+                "worker": worker_id,
+                "debugger_address": info.get("debugger_address"),
+                "error": info.get("error"),
+                "cases": len(own),
+                "baseline_latency_ms": baseline,
+                "median_probe_latency_ms": median_probe,
+                "latency_inflation": inflation,
+                "median_prepare_sec": (
+                    round(statistics.median(c["prepare_sec"] for c in own if "prepare_sec" in c), 3)
+                    if any("prepare_sec" in c for c in own)
+                    else None
+                ),
+                "warm_tabs": info.get("warm_tabs", 0),
+                "warm_hits": info.get("warm_hits"),
+                "cold_opens": info.get("cold_opens"),
+                "visual_cache": info.get("visual_cache"),
+            }
+        )
+
+    collisions = [
+        {
+            "index": c["index"],
+            "worker": c["worker"],
+            "window_handle": c["window_handle"],
+            "claimed_by": c["handle_collision"],
+        }
+        for c in cases
+        if c.get("handle_collision") is not None
+    ]
+    inflations = [w["latency_inflation"] for w in per_worker if w["latency_inflation"]]
+    return {
+        "workers": len(workers),
+        "wall_sec": round(wall_sec, 3),
+        "throughput_cases_per_min": round(len(cases) / wall_sec * 60, 3) if wall_sec else None,
+        "handle_collisions": collisions,
+        "max_latency_inflation": max(inflations) if inflations else None,
+        "per_worker": per_worker,
+    }
+
+
+def run_pool(
+    tasks: list[PoolTask],
+    *,
+    debugger_addresses: list[str],
+    routes_module: str,
+    run_root: Path,
+    prepare: bool = True,
+    warm_tabs: int = 0,
+    close_tabs: bool = False,
+    max_tabs: int | None = None,
+    pace: float | None = None,
+    lookahead: bool = False,
+    continue_on_error: bool = False,
+    log=print,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """
+    Runs tasks on one worker process per entry of debugger_addresses
+    (repeat an address to attach several sessions to it). Worker logs go to
+    <run_root>/worker-N, per-case logs to the task case_dir. warm_tabs > 0
+    gives every worker a WarmTabPool (profile build_warm_tab_hooks) instead
+    of running the prepare hook per case. close_tabs/max_tabs enable a
+    TabLifecycleManager per worker (windows opened by a case are closed at
+    its end, live tabs are capped). pace/lookahead go to every case executor
+    as the replay CLI's --pace/--lookahead. on_result is called with every case
+    result as soon as it arrives (late ones too). Returns case results in
+    completion order and the contention report.
+    """
+    ctx = mp.get_context("spawn")
+    manager = ctx.Manager()
+    task_queue: mp.Queue = ctx.Queue()
+    result_queue: mp.Queue = ctx.Queue()
+    stop_event = ctx.Event()
+    claimed_handles = manager.dict()
+    locks = {address: ctx.Lock() for address in debugger_addresses}
+
+    for task in tasks:
+        task_queue.put(task)
+    for _ in debugger_addresses:
+        task_queue.put(None)
+
+    started = perf_counter()
+    processes = []
+    for worker_id, address in enumerate(debugger_addresses, start=1):
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                address,
+                routes_module,
+                PoolOptions(prepare, warm_tabs, close_tabs, max_tabs, pace, lookahead),
+                str(run_root / f"worker-{worker_id}"),
+                task_queue,
+                result_queue,
+                locks[address],
+                claimed_handles,
+                stop_event,
+            ),
+            name=f"replay-worker-{worker_id}",
+        )
+        proc.start()
+        processes.append(proc)
+
+    workers: dict[int, dict[str, Any]] = {}
+    cases: list[dict[str, Any]] = []
+    try:
+        while len(cases) < len(tasks):
+            try:
+                message = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    break
+                continue
+            kind = message.pop("kind")
+            if kind == "worker_ready":
+                workers[message["worker"]] = message
+                log(
+                    f"[replay-pool] worker {message['worker']} ready: "
+                    f"{message['debugger_address']} baseline={message['baseline_latency_ms']}ms"
+                )
+            elif kind == "worker_stats":
+                workers.setdefault(message["worker"], {}).update(message)
+            elif kind == "worker_error":
+                workers[message["worker"]] = message
+                log(f"[replay-pool] worker {message['worker']} failed to start: {message['error']}")
+            else:
+                cases.append(message)
+                if on_result is not None:
+                    on_result(message)
+                log(
+                    f"[replay-pool] ({len(cases)}/{len(tasks)}) {message['status']}: "
+                    f"worker={message['worker']} duration={message['duration_sec']}s "
+                    f"probe={message.get('probe_latency_ms')}ms case={Path(message['case_file']).name}"
+                )
+                if message["status"] != "ok" and not continue_on_error:
+                    break
+    finally:
+        # Late messages: cases finished after a stop, warm-pool stats on exit.
+        stop_event.set()
+        while True:
+            try:
+                message = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    break
+                continue
+            kind = message.pop("kind")
+            if kind == "case":
+                cases.append(message)
+                if on_result is not None:
+                    on_result(message)
+            elif kind == "worker_stats":
+                workers.setdefault(message["worker"], {}).update(message)
+        for proc in processes:
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+        manager.shutdown()
+
+    report = _contention_report(workers, cases, perf_counter() - started)
+    return cases, report
+
+
+__all__ = ["PoolOptions", "PoolTask", "run_pool"]
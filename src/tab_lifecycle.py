@@ -0,0 +1,182 @@
+"""
+Lifecycle of editor windows opened by replays.
+
+Every prepare opens a new editor window (HomePage.open_creation_cell) and
+nothing closes it, so long batches pile up tabs and OnlyOffice slows down.
+TabLifecycleManager remembers the windows that existed when a case started,
+closes the ones the case opened when it ends, keeps the number of live
+editor tabs under a cap and logs per-tab memory via CDP Performance.getMetrics.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from selenium.common.exceptions import WebDriverException
+
+from .driver import DriverOnlyOffice
+from .utils.logging_utils import get_logger
+
+MEMORY_METRICS = ("JSHeapUsedSize", "JSHeapTotalSize", "Nodes", "Documents", "Frames")
+
+
+class TabLifecycleManager:
+    """
+    Tracks windows per case on one DriverOnlyOffice.
+
+    Several sessions attached to one debugger address see each other's
+    windows: protect() the windows claimed by other sessions before
+    end_case()/enforce_cap().
+
+    Пример:
+        tabs = TabLifecycleManager(driver, max_live_tabs=4)
+        with tabs.case("001_case"):
+            executor.replay_file(log)
+    """
+
+    def __init__(
+        self,
+        driver: DriverOnlyOffice,
+        *,
+        home_handle: str | None = None,
+        max_live_tabs: int | None = None,
+        close_on_end: bool = True,
+        log_memory: bool = True,
+    ):
+        self.driver = driver
+        self.home_handle = home_handle or driver.get_current_window_handle()
+        self.max_live_tabs = max_live_tabs
+        self.close_on_end = close_on_end
+        self.log_memory = log_memory
+        self.protected: set[str] = {self.home_handle}
+        self.case_name: str | None = None
+        self._before: set[str] = set()
+        self.closed_total = 0
+        self.logger = get_logger("tab_lifecycle")
+
+    # ---------- windows ----------
+    def live_tabs(self) -> list[str]:
+        """Editor windows except the home window, oldest first."""
+        return [h for h in self.driver.get_window_handles() if h != self.home_handle]
+
+    def protect(self, handles: Iterable[str]) -> None:
+        """Windows that end_case/enforce_cap never close (e.g. idle warm tabs)."""
+        self.protected.update(handles)
+
+    def unprotect(self, handles: Iterable[str]) -> None:
+        self.protected.difference_update(handles)
+        self.protected.add(self.home_handle)
+
+    def _close(self, handles: list[str]) -> list[str]:
+        closed = []
+        for handle in handles:
+            if self.log_memory:
+                self._log_tab_memory(handle, "close")
+            self.driver.close_window(handle)
+            closed.append(handle)
+        if closed:
+            self.driver.set_window_handle(self.home_handle)
+            self.closed_total += len(closed)
+        return closed
+
+    def enforce_cap(self, keep: Iterable[str] = ()) -> list[str]:
+        """
+        Closes the oldest unprotected tabs until at most max_live_tabs remain.
+        keep: windows in use right now (never closed).
+        """
+        if self.max_live_tabs is None:
+            return []
+        keep = set(keep) | self.protected
+        live = self.live_tabs()
+        excess = len(live) - self.max_live_tabs
+        victims = [h for h in live if h not in keep][: max(0, excess)]
+        if victims:
+            self.logger.info(
+                "max_live_tabs=%s live=%s: closing %s oldest",
+                self.max_live_tabs,
+                len(live),
+                len(victims),
+            )
+        return self._close(victims)
+
+    # ---------- cases ----------
+    def begin_case(self, name: str | None = None) -> None:
+        self.case_name = name
+        self._before = set(self.driver.get_window_handles())
+        self.logger.info("case start name=%s live_tabs=%s", name, len(self._before) - 1)
+
+    def end_case(self) -> list[str]:
+        """
+        Closes windows opened since begin_case (unless close_on_end=False),
+        applies the cap and logs memory of the remaining tabs.
+        """
+        opened = [
+            h
+            for h in self.driver.get_window_handles()
+            if h not in self._before and h not in self.protected
+        ]
+        closed = self._close(opened) if self.close_on_end else []
+        closed += self.enforce_cap()
+        if self.log_memory:
+            self.memory_snapshot()
+        self.logger.info(
+            "case end name=%s opened=%s closed=%s live_tabs=%s",
+            self.case_name,
+            len(opened),
+            len(closed),
+            len(self.live_tabs()),
+        )
+        self.case_name = None
+        return closed
+
+    @contextmanager
+    def case(self, name: str | None = None) -> Iterator["TabLifecycleManager"]:
+        self.begin_case(name)
+        try:
+            yield self
+        finally:
+            try:
+                self.end_case()
+            except WebDriverException:
+                self.logger.warning("case end cleanup failed name=%s", name, exc_info=True)
+
+    # ---------- memory ----------
+    def tab_metrics(self, handle: str) -> dict[str, float]:
+        """CDP Performance.getMetrics of one window (memory-related subset)."""
+        self.driver.set_window_handle(handle)
+        execute_cdp = self.driver.driver.execute_cdp_cmd
+        execute_cdp("Performance.enable", {})
+        raw = execute_cdp("Performance.getMetrics", {})
+        metrics = {m["name"]: m["value"] for m in raw.get("metrics", [])}
+        return {name: metrics[name] for name in MEMORY_METRICS if name in metrics}
+
+    def _log_tab_memory(self, handle: str, reason: str) -> dict[str, float] | None:
+        try:
+            metrics = self.tab_metrics(handle)
+        except WebDriverException as exc:
+            self.logger.info("tab memory %s handle=%s unavailable: %s", reason, handle, exc.msg)
+            return None
+        self.logger.info(
+            "tab memory %s handle=%s heap_used=%.1fMB heap_total=%.1fMB nodes=%s",
+            reason,
+            handle,
+            metrics.get("JSHeapUsedSize", 0) / 2**20,
+            metrics.get("JSHeapTotalSize", 0) / 2**20,
+            int(metrics.get("Nodes", 0)),
+        )
+        return metrics
+
+    def memory_snapshot(self) -> dict[str, dict[str, float]]:
+        """Metrics of every live tab; returns to the previously current window."""
+        current = self.driver.get_current_window_handle()
+        snapshot = {}
+        for handle in [self.home_handle, *self.live_tabs()]:
+            metrics = self._log_tab_memory(handle, "snapshot")
+            if metrics is not None:
+                snapshot[handle] = metrics
+        self.driver.set_window_handle(current)
+        return snapshot
+
+
+__all__ = ["TabLifecycleManager"]
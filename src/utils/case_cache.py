@@ -0,0 +1,141 @@
+"""
+Ключ кэша результата кейса для инкрементальных прогонов.
+
+Ключ = sha1 от: содержимого JSONL кейса, имени профиля маршрутов, исходников
+всех модулей src/test, которые импортируют профиль и раннер кейса
+(транзитивно — page objects, executor, driver, utils; для пула —
+src/replay_pool.py), версии плагина, опций прогона, влияющих на исход
+(runner, pace, lookahead, VISUAL_MODE/VISUAL_STRICT/VISUAL_ASYNC и т.п.), и
+содержимого baseline визуальных проверок (все файлы: какие снимет кейс,
+заранее не известно). Кейс с прошедшим прогоном под тем же ключом
+(cases.cache_key в ResultsStore) можно не запускать.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LOCAL_PACKAGES = ("src", "test")
+
+
+def _module_path(name: str, root: Path) -> Path | None:
+    base = root.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imported_modules(path: Path, module: str) -> set[str]:
+    """Имена модулей проекта, импортируемых файлом (включая относительные импорты)."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    package = module if path.name == "__init__.py" else module.rpartition(".")[0]
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".")
+                base = ".".join(parts[: len(parts) - node.level + 1])
+                target = f"{base}.{node.module}" if node.module else base
+            else:
+                target = node.module or ""
+            names.add(target)
+            # from pkg import submodule
+            names.update(f"{target}.{alias.name}" for alias in node.names)
+    return {n for n in names if n.split(".", 1)[0] in LOCAL_PACKAGES}
+
+
+def source_closure(module: str, root: Path = REPO_ROOT) -> list[Path]:
+    """Файлы модуля и всех модулей проекта, которые он импортирует транзитивно."""
+    seen: dict[str, Path] = {}
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        path = _module_path(name, root)
+        if path is None:
+            continue
+        seen[name] = path
+        pending.extend(_imported_modules(path, name) - seen.keys())
+        # Пакеты по пути тоже исполняются при импорте.
+        parts = name.split(".")
+        pending.extend(".".join(parts[:i]) for i in range(1, len(parts)))
+    return sorted(set(seen.values()))
+
+
+def files_digest(root: Path) -> str:
+    """sha1 от относительных имён и содержимого всех файлов под root (пусто, если папки нет)."""
+    digest = hashlib.sha1()
+    if root.is_dir():
+        for path in sorted(p for p in root.rglob("*") if p.is_file()):
+            digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            digest.update(hashlib.sha1(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+class CaseCacheKeys:
+    """
+    runner_modules: модули, которые запускают кейс помимо профиля (раннер
+    пула, launcher). options: опции прогона, меняющие исход (JSON-значения).
+    baseline_dir: папка baseline визуальных проверок.
+
+    Пример:
+        keys = CaseCacheKeys(
+            "test.slider_query.run_replay_simple",
+            plugin_version="1.4.2",
+            runner_modules=["src.replay_pool"],
+            options={"runner": "pool", "pace": None, "VISUAL_STRICT": "true"},
+            baseline_dir=Path("artifacts/visual/baseline"),
+        )
+        key = keys.key(Path("test_cases/slider_query/case.jsonl"))
+    """
+
+    def __init__(
+        self,
+        routes_module: str,
+        plugin_version: str,
+        root: Path = REPO_ROOT,
+        *,
+        runner_modules: Iterable[str] = (),
+        options: dict[str, Any] | None = None,
+        baseline_dir: Path | None = None,
+    ):
+        self.routes_module = routes_module
+        self.plugin_version = plugin_version
+        self.sources = source_closure(routes_module, root)
+        if not self.sources:
+            raise ModuleNotFoundError(f"routes module not found under {root}: {routes_module}")
+        for module in runner_modules:
+            self.sources = sorted(set(self.sources) | set(source_closure(module, root)))
+        digest = hashlib.sha1()
+        for path in self.sources:
+            digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            digest.update(path.read_bytes())
+        self.code_digest = digest.hexdigest()
+        self.options = dict(options or {})
+        self.options_digest = json.dumps(self.options, sort_keys=True, ensure_ascii=False)
+        self.baseline_digest = files_digest(baseline_dir) if baseline_dir is not None else ""
+
+    def key(self, case_file: str | Path) -> str:
+        digest = hashlib.sha1()
+        for part in (
+            hashlib.sha1(Path(case_file).read_bytes()).hexdigest(),
+            self.routes_module,
+            self.code_digest,
+            self.plugin_version,
+            self.options_digest,
+            self.baseline_digest,
+        ):
+            digest.update(part.encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+
+__all__ = ["CaseCacheKeys", "files_digest", "source_closure"]
@@ -0,0 +1,77 @@
+"""
+Порядок кейсов батча по истории прогонов (ResultsStore.case_history).
+
+Сначала кейсы, чей последний выполненный прогон упал, — быстрая обратная
+связь. В параллельном режиме внутри каждой группы кейсы идут от самых
+длинных к коротким (LPT): общая очередь пула раздаёт их освободившимся
+воркерам, и длинный кейс не оказывается последним. Без параллельности
+остальные кейсы сохраняют порядок имён.
+
+Прогноз длительности батча — сумма медиан для последовательного режима и
+моделирование той же общей очереди на N воркерах для пула. Кейсы без
+истории получают медиану известных.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .results_store import _percentile
+
+
+@dataclass
+class ScheduledCase:
+    index: int
+    case_path: Path
+    predicted_sec: float
+    recently_failed: bool = False
+    known: bool = True
+
+
+def predict_makespan(durations: list[float], workers: int = 1) -> float:
+    """Время до конца очереди, если каждый кейс берёт первый освободившийся воркер."""
+    if workers <= 1:
+        return sum(durations)
+    free_at = [0.0] * workers
+    for duration in durations:
+        heapq.heappush(free_at, heapq.heappop(free_at) + duration)
+    return max(free_at)
+
+
+def schedule_cases(
+    pending: list[tuple[int, Path]],
+    history: dict[str, dict[str, Any]],
+    *,
+    workers: int = 1,
+) -> list[ScheduledCase]:
+    """pending — (индекс, файл кейса) в порядке имён; возвращает новый порядок."""
+    known = [
+        history[p.stem]["duration_p50"]
+        for _, p in pending
+        if p.stem in history and history[p.stem]["duration_p50"] is not None
+    ]
+    fallback = _percentile(known, 50) or 0.0
+    scheduled = []
+    for idx, case_path in pending:
+        entry = history.get(case_path.stem)
+        duration = entry["duration_p50"] if entry else None
+        scheduled.append(
+            ScheduledCase(
+                index=idx,
+                case_path=case_path,
+                predicted_sec=duration if duration is not None else fallback,
+                recently_failed=bool(entry) and entry["last_status"] != "ok",
+                known=duration is not None,
+            )
+        )
+    if workers > 1:
+        scheduled.sort(key=lambda c: (not c.recently_failed, -c.predicted_sec, c.index))
+    else:
+        scheduled.sort(key=lambda c: (not c.recently_failed, c.index))
+    return scheduled
+
+
+__all__ = ["ScheduledCase", "predict_makespan", "schedule_cases"]
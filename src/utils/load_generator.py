@@ -0,0 +1,287 @@
+"""
+Open-loop нагрузка по interaction-логам на одном WebDriver.
+
+Сессии (прогоны лога) стартуют с фиксированным интервалом независимо от
+того, успели ли закончиться предыдущие, и садятся на вкладки из WarmTabPool.
+Для каждого шага пишется запланированное (intended) и фактическое время
+старта: задержка от запланированного старта до конца шага — это латентность
+с поправкой на coordinated omission; от фактического — время обслуживания.
+
+Запланированный старт шага = старт сессии по расписанию + смещение шага в
+записи (поле `time`) × pace. При pace=0 по расписанию идёт только старт
+сессии, шаги внутри неё — подряд.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterable
+
+from ..driver import DriverOnlyOffice
+from ..interaction_log_executor_simple import (
+    InteractionStep,
+    SimpleInteractionLogExecutor,
+    read_interaction_log,
+)
+from .logging_utils import get_logger
+from .multitab import WarmTabPool
+from .pacing import parse_step_time
+
+SessionExecutorFactory = Callable[[str], SimpleInteractionLogExecutor]
+
+
+@dataclass
+class StepRecord:
+    session: int
+    log: str
+    line: int
+    intended_start: float  # секунды от старта генератора
+    actual_start: float
+    end: float
+    status: str = "ok"
+    error: str | None = None
+    phase: str | None = None
+
+    @property
+    def start_lag(self) -> float:
+        return self.actual_start - self.intended_start
+
+    @property
+    def service_time(self) -> float:
+        return self.end - self.actual_start
+
+    @property
+    def corrected_latency(self) -> float:
+        return self.end - self.intended_start
+
+
+@dataclass
+class _Session:
+    index: int
+    log: Path
+    steps: list[InteractionStep]
+    offsets: list[float]
+    intended_start: float
+    pace: float | None = None
+    phase: str | None = None
+    handle: str | None = None
+    executor: SimpleInteractionLogExecutor | None = None
+    position: int = 0
+    actual_start: float | None = None
+    error: str | None = None
+    records: list[StepRecord] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.error is not None or self.position >= len(self.steps)
+
+    def next_intended(self, pace: float) -> float:
+        return self.intended_start + self.offsets[self.position] * pace
+
+
+def _offsets(steps: list[InteractionStep]) -> list[float]:
+    """Смещения шагов от первого шага записи в секундах (без времени — как у предыдущего)."""
+    offsets: list[float] = []
+    first: float | None = None
+    last = 0.0
+    for step in steps:
+        recorded = parse_step_time(step.get("time"))
+        if recorded is not None:
+            if first is None:
+                first = recorded
+            last = max(last, recorded - first)
+        offsets.append(last)
+    return offsets
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    """Перцентиль по ближайшему рангу (q в процентах)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(records: Iterable[StepRecord]) -> dict[str, dict[str, float | None]]:
+    """p50/p95/p99/max (мс) для service_time, corrected_latency и start_lag."""
+    records = [r for r in records if r.status == "ok"]
+    result: dict[str, dict[str, float | None]] = {}
+    for metric in ("service_time", "corrected_latency", "start_lag"):
+        values = [getattr(r, metric) * 1000 for r in records]
+        result[metric] = {
+            f"p{q}": (round(v, 1) if (v := _percentile(values, q)) is not None else None)
+            for q in (50, 95, 99)
+        }
+        result[metric]["max"] = round(max(values), 1) if values else None
+    return result
+
+
+class OpenLoopLoadGenerator:
+    """
+    Пример:
+        pool = WarmTabPool(driver, hooks, size=3)
+        gen = OpenLoopLoadGenerator(driver, pool, executor_factory, interval=10, pace=1)
+        records = gen.run(logs, sessions=6)
+        print(latency_summary(records))
+    """
+
+    def __init__(
+        self,
+        driver: DriverOnlyOffice,
+        tab_pool: WarmTabPool,
+        executor_factory: SessionExecutorFactory,
+        *,
+        interval: float = 10.0,
+        pace: float = 1.0,
+        max_concurrent: int | None = None,
+    ):
+        self.driver = driver
+        self.tab_pool = tab_pool
+        self.executor_factory = executor_factory
+        self.interval = interval
+        self.pace = pace
+        self.max_concurrent = max_concurrent or tab_pool.size
+        self.sessions: list[_Session] = []
+        self.logger = get_logger("load_generator")
+        self._t0 = 0.0
+
+    def _now(self) -> float:
+        return perf_counter() - self._t0
+
+    def schedule(self, logs: list[str | Path], sessions: int) -> list[_Session]:
+        """Сессия i играет logs[i % len(logs)] и стартует в i * interval."""
+        parsed = {Path(p): read_interaction_log(p) for p in logs}
+        paths = list(parsed)
+        self.sessions = []
+        for index in range(sessions):
+            log = paths[index % len(paths)]
+            steps = parsed[log]
+            self.sessions.append(
+                _Session(index, log, steps, _offsets(steps), index * self.interval)
+            )
+        return self.sessions
+
+    def run(self, logs: list[str | Path], sessions: int) -> list[StepRecord]:
+        self.schedule(logs, sessions)
+        pending = list(self.sessions)
+        active: list[_Session] = []
+        records: list[StepRecord] = []
+        self.tab_pool.fill()
+        self._t0 = perf_counter()
+
+        while pending or active:
+            now = self._now()
+            # 1) старт сессий, чей срок наступил (если есть свободная вкладка)
+            while pending and pending[0].intended_start <= now and len(active) < self.max_concurrent:
+                session = pending.pop(0)
+                self._start_session(session)
+                if session.done:
+                    self._finish_session(session)
+                else:
+                    active.append(session)
+
+            # 2) шаг с самым ранним запланированным стартом
+            due = [s for s in active if self._next_intended(s) <= self._now()]
+            if due:
+                session = min(due, key=self._next_intended)
+                records.append(self._run_step(session))
+                if session.done:
+                    active.remove(session)
+                    self._finish_session(session)
+                continue
+
+            # 3) ждём ближайшего события
+            upcoming = [self._next_intended(s) for s in active]
+            if pending and len(active) < self.max_concurrent:
+                upcoming.append(pending[0].intended_start)
+            if upcoming:
+                time.sleep(max(0.0, min(upcoming) - self._now()))
+        return records
+
+    def _next_intended(self, session: _Session) -> float:
+        return session.next_intended(self.pace if session.pace is None else session.pace)
+
+    def _start_session(self, session: _Session) -> None:
+        session.actual_start = self._now()
+        try:
+            session.handle = self.tab_pool.acquire()
+            session.executor = self.executor_factory(session.handle)
+        except Exception as exc:
+            session.error = f"{type(exc).__name__}: {exc}"
+            self.logger.exception("session=%s failed to start", session.index)
+            return
+        self.logger.info(
+            "session=%s start log=%s intended=%.3fs actual=%.3fs handle=%s",
+            session.index,
+            session.log.name,
+            session.intended_start,
+            session.actual_start,
+            session.handle,
+        )
+
+    def _run_step(self, session: _Session) -> StepRecord:
+        step = session.steps[session.position]
+        intended = self._next_intended(session)
+        session.position += 1
+        self.driver.activate_window(session.handle)
+        record = StepRecord(
+            session=session.index,
+            log=session.log.name,
+            line=step.index,
+            intended_start=intended,
+            actual_start=self._now(),
+            end=0.0,
+            phase=session.phase,
+        )
+        try:
+            session.executor.execute_step(step)
+        except Exception as exc:
+            record.status = "failed"
+            record.error = f"{type(exc).__name__}: {exc}"
+            session.error = record.error
+            self.logger.exception("session=%s failed on line=%s", session.index, step.index)
+        record.end = self._now()
+        session.records.append(record)
+        return record
+
+    def _finish_session(self, session: _Session) -> None:
+        if session.handle is not None:
+            try:
+                self.tab_pool.release(session.handle, reusable=session.error is None)
+            except Exception:
+                self.logger.warning("session=%s tab release failed", session.index, exc_info=True)
+        self.logger.info(
+            "session=%s done steps=%s error=%s", session.index, len(session.records), session.error
+        )
+
+    def session_summary(self) -> list[dict[str, object]]:
+        return [
+            {
+                "session": s.index,
+                "log": s.log.name,
+                "intended_start": round(s.intended_start, 3),
+                "actual_start": round(s.actual_start, 3) if s.actual_start is not None else None,
+                "steps_done": len(s.records),
+                "error": s.error,
+            }
+            for s in self.sessions
+        ]
+
+    @staticmethod
+    def write_records(records: list[StepRecord], path: str | Path) -> Path:
+        """JSONL: одна строка на шаг (все времена в секундах от старта генератора)."""
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("w", encoding="utf-8") as stream:
+            for record in records:
+                stream.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        return out
+
+
+__all__ = ["OpenLoopLoadGenerator", "StepRecord", "latency_summary"]
@@ -0,0 +1,472 @@
+"""
+Декларативный профиль нагрузки (JSON или TOML) поверх OpenLoopLoadGenerator.
+
+Профиль задаёт сценарии (interaction-логи с весами) и фазы с целевой
+конкурентностью: число или [от, до] — линейная рампа за длительность фазы.
+Пока активных сессий меньше цели, стартуют новые; сценарий выбирается
+взвешенным round-robin (детерминированно). При снижении цели сессии не
+прерываются — их просто не заменяют.
+
+Пример (TOML):
+    think_time_scale = 1.0
+
+    [[scenarios]]
+    log = "test_cases/slider_query/interaction-log-1771241377641.jsonl"
+    weight = 3
+
+    [[phases]]
+    name = "ramp-up"
+    duration = 60
+    concurrency = [0, 3]
+
+    [[phases]]
+    name = "steady"
+    duration = 300
+    concurrency = 3
+    think_time_scale = 0.5
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from ..driver import DriverOnlyOffice
+from ..interaction_log_executor_simple import InteractionStep, read_interaction_log
+from .load_generator import (
+    OpenLoopLoadGenerator,
+    SessionExecutorFactory,
+    StepRecord,
+    _offsets,
+    _Session,
+)
+from .multitab import WarmTabPool
+
+PROFILE_KEYS = {"name", "think_time_scale", "step_cost", "tabs", "scenarios", "phases"}
+SCENARIO_KEYS = {"log", "weight", "name"}
+PHASE_KEYS = {"name", "duration", "concurrency", "think_time_scale"}
+
+
+class LoadProfileError(ValueError):
+    """Профиль не прошёл проверку; problems — все найденные ошибки."""
+
+    def __init__(self, source: str, problems: list[str]):
+        self.source = source
+        self.problems = problems
+        super().__init__(f"{source}: " + "; ".join(problems))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    log: Path
+    weight: float = 1.0
+
+
+@dataclass(frozen=True)
+class Phase:
+    name: str
+    start: float  # секунды от начала профиля
+    duration: float
+    concurrency_from: int
+    concurrency_to: int
+    think_time_scale: float | None = None
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def target(self, t: float) -> int:
+        """Целевая конкурентность в момент t (рампа округляется к ближайшему целому)."""
+        if self.concurrency_from == self.concurrency_to:
+            return self.concurrency_to
+        progress = min(1.0, max(0.0, (t - self.start) / self.duration))
+        value = self.concurrency_from + (self.concurrency_to - self.concurrency_from) * progress
+        return int(value + 0.5)
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    name: str
+    scenarios: tuple[Scenario, ...]
+    phases: tuple[Phase, ...]
+    think_time_scale: float = 1.0
+    step_cost: float = 0.5  # оценка длительности шага для dry-run, секунды
+    tabs: int | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.phases[-1].end
+
+    @property
+    def peak_concurrency(self) -> int:
+        return max(max(p.concurrency_from, p.concurrency_to) for p in self.phases)
+
+    def phase_at(self, t: float) -> Phase | None:
+        for phase in self.phases:
+            if phase.start <= t < phase.end:
+                return phase
+        return None
+
+    def scale_for(self, phase: Phase) -> float:
+        return self.think_time_scale if phase.think_time_scale is None else phase.think_time_scale
+
+
+class ScenarioPicker:
+    """Smooth weighted round-robin: при весах 3:1 порядок a a b a, a a b a, ..."""
+
+    def __init__(self, scenarios: tuple[Scenario, ...]):
+        self.scenarios = scenarios
+        self._current = [0.0] * len(scenarios)
+        self._total = sum(s.weight for s in scenarios)
+
+    def next(self) -> Scenario:
+        for i, scenario in enumerate(self.scenarios):
+            self._current[i] += scenario.weight
+        best = max(range(len(self.scenarios)), key=lambda i: self._current[i])
+        self._current[best] -= self._total
+        return self.scenarios[best]
+
+
+# ---------- parsing ----------
+def _is_number(value: Any) -> bool:
+    # TOML принимает inf/nan: с ними plan_schedule зацикливается или молча пуст.
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return isinstance(value, int) or math.isfinite(value)
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _check_scale(value: Any, where: str, problems: list[str]) -> float | None:
+    if value is None:
+        return None
+    if not _is_number(value) or value < 0:
+        problems.append(f"{where}: think_time_scale must be a finite number >= 0")
+        return None
+    return float(value)
+
+
+def _unknown(data: dict, allowed: set[str], where: str, problems: list[str]) -> None:
+    for key in sorted(set(data) - allowed):
+        problems.append(f"{where}: unknown key {key!r}")
+
+
+def parse_profile(data: Any, *, base_dir: Path, source: str = "<profile>") -> LoadProfile:
+    """Проверяет словарь профиля целиком и собирает все ошибки в LoadProfileError."""
+    problems: list[str] = []
+    if not isinstance(data, dict):
+        raise LoadProfileError(source, ["top level must be a table/object"])
+    _unknown(data, PROFILE_KEYS, "profile", problems)
+
+    scale = _check_scale(data.get("think_time_scale", 1.0), "profile", problems)
+    step_cost = data.get("step_cost", 0.5)
+    if not _is_number(step_cost) or step_cost < 0:
+        problems.append("profile: step_cost must be a finite number >= 0")
+    tabs = data.get("tabs")
+    if tabs is not None and (not _is_count(tabs) or tabs < 1):
+        problems.append("profile: tabs must be an integer >= 1")
+
+    scenarios: list[Scenario] = []
+    raw_scenarios = data.get("scenarios")
+    if not isinstance(raw_scenarios, list) or not raw_scenarios:
+        problems.append("profile: scenarios must be a non-empty list")
+        raw_scenarios = []
+    for i, raw in enumerate(raw_scenarios):
+        where = f"scenarios[{i}]"
+        if not isinstance(raw, dict):
+            problems.append(f"{where}: must be a table/object")
+            continue
+        _unknown(raw, SCENARIO_KEYS, where, problems)
+        log = raw.get("log")
+        weight = raw.get("weight", 1)
+        if not isinstance(log, str) or not log:
+            problems.append(f"{where}: log is required")
+            continue
+        path = Path(log) if Path(log).is_absolute() else base_dir / log
+        if not path.is_file():
+            problems.append(f"{where}: log not found: {log}")
+        if not _is_number(weight) or weight <= 0:
+            problems.append(f"{where}: weight must be a finite number > 0")
+            continue
+        scenarios.append(Scenario(str(raw.get("name") or path.stem), path, float(weight)))
+
+    phases: list[Phase] = []
+    raw_phases = data.get("phases")
+    if not isinstance(raw_phases, list) or not raw_phases:
+        problems.append("profile: phases must be a non-empty list")
+        raw_phases = []
+    start = 0.0
+    for i, raw in enumerate(raw_phases):
+        where = f"phases[{i}]"
+        if not isinstance(raw, dict):
+            problems.append(f"{where}: must be a table/object")
+            continue
+        _unknown(raw, PHASE_KEYS, where, problems)
+        duration = raw.get("duration")
+        concurrency = raw.get("concurrency")
+        if not _is_number(duration) or duration <= 0:
+            problems.append(f"{where}: duration must be a finite number > 0 (seconds)")
+            continue
+        if _is_count(concurrency):
+            bounds = (concurrency, concurrency)
+        elif (
+            isinstance(concurrency, list)
+            and len(concurrency) == 2
+            and all(_is_count(c) for c in concurrency)
+        ):
+            bounds = (concurrency[0], concurrency[1])
+        else:
+            problems.append(f"{where}: concurrency must be an integer >= 0 or [from, to]")
+            continue
+        phase_scale = _check_scale(raw.get("think_time_scale"), where, problems)
+        phases.append(
+            Phase(str(raw.get("name") or f"phase-{i + 1}"), start, float(duration), *bounds, phase_scale)
+        )
+        start += float(duration)
+
+    if phases and not any(max(p.concurrency_from, p.concurrency_to) > 0 for p in phases):
+        problems.append("phases: concurrency is 0 in every phase")
+    if problems:
+        raise LoadProfileError(source, problems)
+    return LoadProfile(
+        name=str(data.get("name") or source),
+        scenarios=tuple(scenarios),
+        phases=tuple(phases),
+        think_time_scale=scale if scale is not None else 1.0,
+        step_cost=float(step_cost),
+        tabs=tabs,
+    )
+
+
+def load_profile(path: str | Path, *, base_dir: str | Path | None = None) -> LoadProfile:
+    """
+    Читает профиль .toml или .json. Относительные пути логов считаются от
+    base_dir (по умолчанию — каталог файла профиля).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in (".toml", ".json"):
+        raise LoadProfileError(str(path), ["expected a .toml or .json file"])
+    try:
+        text = path.read_text(encoding="utf-8")
+        data = tomllib.loads(text) if suffix == ".toml" else json.loads(text)
+    except (OSError, ValueError) as exc:
+        raise LoadProfileError(str(path), [f"cannot read: {exc}"]) from exc
+    return parse_profile(
+        data,
+        base_dir=Path(base_dir) if base_dir is not None else path.parent,
+        source=path.name,
+    )
+
+
+# ---------- dry-run ----------
+def plan_schedule(profile: LoadProfile, *, tick: float = 0.25) -> dict[str, Any]:
+    """
+    Расписание без браузера: та же логика допуска, что у ProfileLoadGenerator,
+    но длительность сессии оценивается как записанная длительность × масштаб
+    think time + шаги × step_cost.
+    """
+    logs = {s.log: read_interaction_log(s.log) for s in profile.scenarios}
+    picker = ScenarioPicker(profile.scenarios)
+    cap = profile.tabs or profile.peak_concurrency
+    active: list[float] = []  # оценки времени окончания
+    sessions: list[dict[str, Any]] = []
+    peak = {p.name: 0 for p in profile.phases}
+    t = 0.0
+    while t < profile.duration:
+        active = [end for end in active if end > t]
+        phase = profile.phase_at(t)
+        target = min(phase.target(t), cap)
+        while len(active) < target:
+            scenario = picker.next()
+            steps = logs[scenario.log]
+            scale = profile.scale_for(phase)
+            estimate = (_offsets(steps)[-1] if steps else 0.0) * scale + len(steps) * profile.step_cost
+            active.append(t + estimate)
+            sessions.append(
+                {
+                    "session": len(sessions),
+                    "phase": phase.name,
+                    "scenario": scenario.name,
+                    "start": round(t, 3),
+                    "estimated_end": round(t + estimate, 3),
+                    "steps": len(steps),
+                    "think_time_scale": scale,
+                }
+            )
+        peak[phase.name] = max(peak[phase.name], len(active))
+        t += tick
+    return {
+        "profile": profile.name,
+        "duration_sec": profile.duration,
+        "tabs": cap,
+        "estimated_end_sec": max((s["estimated_end"] for s in sessions), default=0.0),
+        "phases": [
+            {
+                "name": p.name,
+                "start": p.start,
+                "duration": p.duration,
+                "concurrency": [p.concurrency_from, p.concurrency_to],
+                "think_time_scale": profile.scale_for(p),
+                "sessions_started": sum(1 for s in sessions if s["phase"] == p.name),
+                "peak_active": peak[p.name],
+            }
+            for p in profile.phases
+        ],
+        "scenarios": {
+            s.name: sum(1 for x in sessions if x["scenario"] == s.name) for s in profile.scenarios
+        },
+        "sessions": sessions,
+    }
+
+
+# ---------- runner ----------
+class ProfileLoadGenerator(OpenLoopLoadGenerator):
+    """
+    Выполняет LoadProfile: сессии стартуют, пока активных меньше целевой
+    конкурентности текущей фазы (но не больше размера пула вкладок); после
+    конца последней фазы новые не стартуют, активные доигрываются.
+
+    Если сессия не стартовала (нет вкладки, упала фабрика executor), новые
+    старты откладываются на start_backoff × 2^(n-1) сек после n-й ошибки
+    подряд; после max_start_failures ошибок подряд новые сессии больше не
+    стартуют (aborted), активные доигрываются. Итог — start_summary().
+
+    Пример:
+        profile = load_profile("test_cases/load_profiles/sql_mix.toml")
+        gen = ProfileLoadGenerator(driver, pool, executor_factory, profile)
+        records = gen.run_profile()
+    """
+
+    def __init__(
+        self,
+        driver: DriverOnlyOffice,
+        tab_pool: WarmTabPool,
+        executor_factory: SessionExecutorFactory,
+        profile: LoadProfile,
+        *,
+        poll_interval: float = 0.25,
+        start_backoff: float = 1.0,
+        max_start_failures: int = 3,
+    ):
+        super().__init__(
+            driver,
+            tab_pool,
+            executor_factory,
+            interval=0.0,
+            pace=profile.think_time_scale,
+        )
+        self.profile = profile
+        self.poll_interval = poll_interval
+        self.start_backoff = start_backoff
+        self.max_start_failures = max_start_failures
+        self.start_failures = 0
+        self.aborted: str | None = None
+        self._logs: dict[Path, list[InteractionStep]] = {}
+
+    def _new_session(self, scenario: Scenario, phase: Phase, now: float) -> _Session:
+        if scenario.log not in self._logs:
+            self._logs[scenario.log] = read_interaction_log(scenario.log)
+        steps = self._logs[scenario.log]
+        session = _Session(
+            len(self.sessions),
+            scenario.log,
+            steps,
+            _offsets(steps),
+            now,
+            pace=self.profile.scale_for(phase),
+            phase=phase.name,
+        )
+        self.sessions.append(session)
+        return session
+
+    def run_profile(self) -> list[StepRecord]:
+        picker = ScenarioPicker(self.profile.scenarios)
+        self.sessions = []
+        active: list[_Session] = []
+        records: list[StepRecord] = []
+        self.start_failures = 0
+        self.aborted = None
+        failures_in_row = 0
+        next_start = 0.0
+        self.tab_pool.fill()
+        self._t0 = perf_counter()
+        end = self.profile.duration
+
+        while True:
+            now = self._now()
+            # 1) добираем активные сессии до цели текущей фазы
+            phase = self.profile.phase_at(now) if now < end else None
+            if phase is not None and self.aborted is None and now >= next_start:
+                target = min(phase.target(now), self.max_concurrent)
+                while len(active) < target:
+                    session = self._new_session(picker.next(), phase, now)
+                    self._start_session(session)
+                    if session.executor is None:
+                        self._finish_session(session)
+                        self.start_failures += 1
+                        failures_in_row += 1
+                        if failures_in_row >= self.max_start_failures:
+                            self.aborted = (
+                                f"{failures_in_row} session starts failed in a row: {session.error}"
+                            )
+                            self.logger.error("profile aborted: %s", self.aborted)
+                        else:
+                            next_start = now + self.start_backoff * 2 ** (failures_in_row - 1)
+                        break
+                    failures_in_row = 0
+                    if session.done:
+                        self._finish_session(session)
+                    else:
+                        active.append(session)
+            if not active and (now >= end or self.aborted is not None):
+                break
+
+            # 2) шаг с самым ранним запланированным стартом
+            due = [s for s in active if self._next_intended(s) <= self._now()]
+            if due:
+                session = min(due, key=self._next_intended)
+                records.append(self._run_step(session))
+                if session.done:
+                    active.remove(session)
+                    self._finish_session(session)
+                continue
+
+            # 3) ждём ближайшего шага или следующей проверки цели
+            upcoming = [self._next_intended(s) for s in active]
+            if now < end:
+                upcoming.append(min(now + self.poll_interval, end))
+            time.sleep(max(0.0, min(upcoming) - self._now()))
+        return records
+
+    def start_summary(self) -> dict[str, object]:
+        return {"start_failures": self.start_failures, "aborted": self.aborted}
+
+    def session_summary(self) -> list[dict[str, object]]:
+        summary = super().session_summary()
+        for item, session in zip(summary, self.sessions):
+            item["phase"] = session.phase
+            item["think_time_scale"] = session.pace
+        return summary
+
+
+__all__ = [
+    "LoadProfile",
+    "LoadProfileError",
+    "Phase",
+    "ProfileLoadGenerator",
+    "Scenario",
+    "ScenarioPicker",
+    "load_profile",
+    "parse_profile",
+    "plan_schedule",
+]
@@ -1,23 +1,107 @@
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import threading
+import time
 from contextlib import contextmanager
 from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
+from typing import Any, Iterator
 
 from .config import env_get, load_dotenv
 
 _hook_installed = False
+_listener: "_LogListener | None" = None
+_event_log: "EventLog | None" = None
+_event_context: ContextVar[dict[str, Any]] = ContextVar("log_event_context", default={})
+
+
+class _FlushMarker:
+    """Служебный элемент очереди: listener отмечает, что всё до него записано."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class _ReplayQueueHandler(logging.handlers.QueueHandler):
+    """
+    Кладёт запись в очередь без полного форматирования: на вызывающем потоке
+    только склеивается сообщение (args могут измениться позже) и traceback
+    превращается в текст; время, уровень и вывод — в потоке listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Других обработчиков у логгера в этом режиме нет: запись можно не копировать.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _LogListener(logging.handlers.QueueListener):
+    def handle(self, record) -> None:
+        if isinstance(record, _FlushMarker):
+            record.done.set()
+            return
+        super().handle(record)
+
+
+class EventLog:
+    """
+    JSONL-журнал событий рядом с текстовым логом (run-<ts>.events.jsonl).
+
+    Записи копятся в буфере файла и сбрасываются на диск при его заполнении,
+    не реже чем раз в flush_interval секунд и при закрытии.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        run_id: str,
+        *,
+        buffer_size: int = 256 * 1024,
+        flush_interval: float = 2.0,
+    ):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.flush_interval = flush_interval
+        self._stream = self.path.open("a", encoding="utf-8", buffering=buffer_size)
+        self._lock = threading.Lock()
+        self._flushed_at = perf_counter()
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._stream.closed:
+                return
+            self._stream.write(line)
+            if perf_counter() - self._flushed_at >= self.flush_interval:
+                self._stream.flush()
+                self._flushed_at = perf_counter()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._stream.closed:
+                self._stream.close()
+
 
 def setup_logging(
     level: str | None = None,
     log_dir: str | Path | None = None,
     root_name: str | None = None,
     install_excepthook: bool = True,
+    queued: bool | None = None,
+    events: bool | None = None,
 ) -> logging.Logger:
     """
     Инициализирует логгер проекта (консоль + файл) с иерархическими отступами.
@@ -26,6 +110,10 @@ def setup_logging(
         level: уровень логирования (строка как в logging). По умолчанию LOG_LEVEL или INFO.
         log_dir: каталог для логов. По умолчанию <repo>/artifacts/logs.
         root_name: корневое имя логгера. По умолчанию LOG_ROOT или 'oo'.
+        queued: писать файл и консоль в отдельном потоке (QueueListener), вызов
+            логгера только кладёт запись в очередь. По умолчанию LOG_QUEUE.
+        events: вести JSONL-журнал событий (log_event) рядом с текстовым логом.
+            По умолчанию LOG_EVENTS; run id — LOG_RUN_ID или <ts>-<pid>.
     Returns:
         Logger с именем <root_name>.
     """
@@ -34,6 +122,10 @@ def setup_logging(
         return logging.getLogger(root_name or env_get("LOG_ROOT", "oo"))
 
     level_name = (level or env_get("LOG_LEVEL", "INFO")).upper()
+    if queued is None:
+        queued = (env_get("LOG_QUEUE", "") or "").lower() in ("1", "true", "yes", "on")
+    if events is None:
+        events = (env_get("LOG_EVENTS", "") or "").lower() in ("1", "true", "yes", "on")
     root = root_name or env_get("LOG_ROOT", "oo")
 
     base_dir = Path(__file__).resolve().parents[2]
@@ -53,13 +145,29 @@ def setup_logging(
 
     file_handler = logging.FileHandler(logfile, encoding="utf-8")
     file_handler.setFormatter(fmt)
-    logger.addHandler(file_handler)
 
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(fmt)
-    logger.addHandler(stream_handler)
+
+    if queued:
+        global _listener
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        logger.addHandler(_ReplayQueueHandler(log_queue))
+        _listener = _LogListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(stream_handler)
 
     logger.log_file = logfile  # type: ignore[attr-defined]
+    logger.events_file = None  # type: ignore[attr-defined]
+    if events:
+        global _event_log
+        run_id = env_get("LOG_RUN_ID") or f"{timestamp}-{os.getpid()}"
+        _event_log = EventLog(logfile.with_suffix(".events.jsonl"), run_id)
+        logger.events_file = _event_log.path  # type: ignore[attr-defined]
+    if queued or events:
+        atexit.register(shutdown_logging)
 
     setup_logging._configured = True
 
@@ -68,6 +176,87 @@ def setup_logging(
     return logger
 
 
+def flush_logging(timeout: float = 5.0) -> None:
+    """В режиме очереди ждёт, пока listener запишет всё, что было залогировано до вызова."""
+    if _listener is None:
+        return
+    marker = _FlushMarker()
+    _listener.queue.put_nowait(marker)
+    marker.done.wait(timeout)
+
+
+def shutdown_logging() -> None:
+    """
+    Дописывает очередь, останавливает listener и закрывает журнал событий
+    (atexit; в spawn-процессах — явно).
+    """
+    global _listener, _event_log
+    if _event_log is not None:
+        event_log, _event_log = _event_log, None
+        event_log.close()
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+
+
+def events_enabled() -> bool:
+    return _event_log is not None
+
+
+def log_event(kind: str, **fields: Any) -> None:
+    """
+    Пишет событие в JSONL-журнал (если он включён): ts, run_id, type, поля
+    текущего event_context и переданные поля.
+    """
+    event_log = _event_log
+    if event_log is None:
+        return
+    event_log.write(
+        {
+            "ts": round(time.time(), 3),
+            "run_id": event_log.run_id,
+            "type": kind,
+            **_event_context.get(),
+            **fields,
+        }
+    )
+
+
+@contextmanager
+def event_context(**fields: Any) -> Iterator[dict[str, Any]]:
+    """
+    Поля, которые добавляются ко всем событиям внутри блока (кейс, шаг, route).
+    Возвращённый словарь можно дополнять по ходу шага.
+    """
+    context = {**_event_context.get(), **fields}
+    token = _event_context.set(context)
+    try:
+        yield context
+    finally:
+        _event_context.reset(token)
+
+
+def add_log_handler(handler: logging.Handler, root_name: str | None = None) -> None:
+    """
+    Дополнительный обработчик логов проекта (например, лог одного кейса).
+    В режиме очереди он работает в потоке listener, а не на вызывающем.
+    """
+    if _listener is not None:
+        _listener.handlers = (*_listener.handlers, handler)
+    else:
+        setup_logging(root_name=root_name).addHandler(handler)
+
+
+def remove_log_handler(handler: logging.Handler, root_name: str | None = None) -> None:
+    """Снимает обработчик из add_log_handler, дописав в него уже залогированное."""
+    if _listener is not None:
+        flush_logging()
+        _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+    else:
+        setup_logging(root_name=root_name).removeHandler(handler)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Возвращает дочерний логгер с пространством <root>.<name>.
@@ -0,0 +1,639 @@
+"""
+Многовкладочный прогон на одном WebDriver (вариант 1 из features/load-testing-spec.md).
+
+TabSession — вкладка OnlyOffice (window handle) на общем DriverOnlyOffice
+со своим Timer и своим состоянием replay. MultiTabRunner создаёт вкладки,
+выполняет общую подготовку и чередует шаги сценариев/interaction-логов
+между вкладками (round-robin, псевдо-параллельность).
+
+run_wait_aware: «долгие» шаги (LongStep) только запускают действие, вкладка
+паркуется и дёшево опрашивается, пока остальные вкладки продолжают работу.
+
+WarmTabPool: заранее открытые вкладки редактора с уже запущенным плагином;
+загрузка идёт в браузере, пока на другой вкладке выполняется кейс.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable
+
+from ..driver import DriverOnlyOffice
+from ..interaction_log_executor_simple import (
+    InteractionStep,
+    SimpleInteractionLogExecutor,
+    read_interaction_log,
+)
+from ..pages_slider_query.home_page import HomePage
+from .logging_utils import get_logger
+from .timer import Timer
+
+TabStep = Callable[["TabSession"], None]
+ExecutorFactory = Callable[["TabSession"], SimpleInteractionLogExecutor]
+
+
+@dataclass(frozen=True)
+class LongStep:
+    """
+    Шаг с долгим ожиданием результата (preview, export, проверка соединений, OLAP).
+
+    dispatch(step) выполняет действие без ожидания и возвращает probe() —
+    одну дешёвую проверку готовности (True — можно продолжать).
+    """
+
+    dispatch: Callable[[InteractionStep], Callable[[], bool]]
+    timeout: float = 60
+    raise_on_timeout: bool = True
+    settle_sec: float = 0.0
+
+
+LongStepRoutes = tuple[
+    dict[str, LongStep],
+    dict[str, LongStep],
+    dict[tuple[str, str], LongStep],
+]
+LongStepsFactory = Callable[["TabSession"], LongStepRoutes]
+
+
+@dataclass
+class _Parked:
+    label: str
+    step: InteractionStep
+    long_step: LongStep
+    probe: Callable[[], bool]
+    parked_at: float
+    next_poll_at: float
+    ready_at: float | None = None
+
+
+class TabSession:
+    """
+    Одна вкладка: общий драйвер + конкретный handle.
+
+    Пример:
+        with tab:
+            sql_manager_page.click_query_preview()
+    """
+
+    def __init__(self, driver: DriverOnlyOffice, handle: str, name: str):
+        self.driver = driver
+        self.handle = handle
+        self.name = name
+        self.timer = Timer()
+        self.executor: SimpleInteractionLogExecutor | None = None
+        self.steps: list[InteractionStep] = []
+        self.position = 0
+        self.error: BaseException | None = None
+        self.long_steps: LongStepRoutes | None = None
+        self.scheduled_sec = 0.0
+        self.blocked_sec = 0.0
+
+    @property
+    def context(self) -> dict[str, Any]:
+        if self.executor is None:
+            raise RuntimeError(f"Tab {self.name} has no executor")
+        return self.executor.context
+
+    @property
+    def done(self) -> bool:
+        return self.error is not None or self.position >= len(self.steps)
+
+    def activate(self) -> "TabSession":
+        self.driver.activate_window(self.handle)
+        return self
+
+    def run(self, step_fn: TabStep, name: str | None = None) -> None:
+        """Активирует вкладку и выполняет step_fn(tab) с замером в Timer вкладки."""
+        self.activate()
+        if not self.timer.running:
+            self.timer.start()
+        with self.timer.step(name or getattr(step_fn, "__name__", "step")):
+            step_fn(self)
+
+    def load_log(self, log_path: str | Path) -> None:
+        self.steps = read_interaction_log(log_path)
+        self.position = 0
+        self.error = None
+
+    def next_step(self) -> InteractionStep:
+        step = self.steps[self.position]
+        self.position += 1
+        return step
+
+    def __enter__(self) -> "TabSession":
+        return self.activate()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+class MultiTabRunner:
+    """
+    Оркестратор вкладок на одном DriverOnlyOffice.
+
+    executor_factory создаёт отдельный SimpleInteractionLogExecutor на каждую
+    вкладку (свой context: page-объекты, card, query_name), драйвер общий.
+    """
+
+    def __init__(
+        self,
+        driver: DriverOnlyOffice,
+        *,
+        executor_factory: ExecutorFactory | None = None,
+        long_steps_factory: LongStepsFactory | None = None,
+        home_handle: str | None = None,
+    ):
+        self.driver = driver
+        self.executor_factory = executor_factory
+        self.long_steps_factory = long_steps_factory
+        self.home_handle = home_handle or driver.get_current_window_handle()
+        self.tabs: list[TabSession] = []
+        self.scenarios: list[tuple[str, list[TabStep]]] = []
+        self.logger = get_logger("multitab")
+
+    # ---------- tabs ----------
+    def open_tab(self, name: str | None = None) -> TabSession:
+        """Открывает новый редактор с домашней страницы и возвращает его вкладку."""
+        self.driver.activate_window(self.home_handle)
+        HomePage(self.driver).open_creation_cell()
+        handle = self.driver.get_current_window_handle()
+        tab = TabSession(self.driver, handle, name or f"tab{len(self.tabs) + 1}")
+        if self.executor_factory is not None:
+            tab.executor = self.executor_factory(tab)
+        if self.long_steps_factory is not None:
+            tab.long_steps = self.long_steps_factory(tab)
+        self.tabs.append(tab)
+        self.logger.info("open_tab name=%s handle=%s", tab.name, handle)
+        return tab
+
+    def create_tabs(
+        self,
+        n: int,
+        prep_fn: TabStep | None = None,
+    ) -> list[TabSession]:
+        """Создаёт n вкладок и на каждой выполняет общую подготовку prep_fn(tab)."""
+        created = [self.open_tab() for _ in range(n)]
+        if prep_fn is not None:
+            for tab in created:
+                tab.timer.start()
+                tab.run(prep_fn, "prepare")
+        return created
+
+    # ---------- scenarios ----------
+    def add_scenario(self, name: str, steps: list[TabStep]) -> None:
+        """Сценарий i выполняется на вкладке i % len(tabs)."""
+        self.scenarios.append((name, list(steps)))
+
+    def scenario(self, name: str) -> Callable[[TabStep], TabStep]:
+        def _decorator(fn: TabStep) -> TabStep:
+            self.add_scenario(name, [fn])
+            return fn
+
+        return _decorator
+
+    def _assignments(self) -> list[tuple[TabSession, str, list[TabStep]]]:
+        if not self.tabs:
+            raise RuntimeError("No tabs: call create_tabs() first")
+        return [
+            (self.tabs[i % len(self.tabs)], name, steps)
+            for i, (name, steps) in enumerate(self.scenarios)
+        ]
+
+    def run_sequential(self) -> None:
+        for tab, name, steps in self._assignments():
+            for idx, step_fn in enumerate(steps, start=1):
+                tab.run(step_fn, f"{name}:{idx}")
+
+    def run_round_robin(self) -> None:
+        """По одному шагу каждого сценария за круг, пока шаги не кончатся."""
+        assignments = self._assignments()
+        longest = max((len(steps) for _, _, steps in assignments), default=0)
+        for idx in range(longest):
+            for tab, name, steps in assignments:
+                if idx < len(steps):
+                    tab.run(steps[idx], f"{name}:{idx + 1}")
+
+    def run_interleaved(self, schedule: Iterable[tuple[int, TabStep]]) -> None:
+        """Явный порядок: (индекс вкладки, шаг)."""
+        for tab_index, step_fn in schedule:
+            self.tabs[tab_index].run(step_fn)
+
+    # ---------- interaction logs ----------
+    def play(
+        self,
+        logs: list[str | Path] | str | Path,
+        *,
+        stop_on_error: bool = False,
+    ) -> None:
+        """
+        Чередует шаги interaction-логов между вкладками: лог i играется на
+        вкладке i % len(tabs) (один лог — на всех вкладках). За круг каждая
+        незавершённая вкладка выполняет один шаг своим executor.
+        stop_on_error=False: упавшая вкладка выбывает, остальные продолжают.
+        """
+        if not self.tabs:
+            raise RuntimeError("No tabs: call create_tabs() first")
+        self._load_logs(logs)
+        active = [tab for tab in self.tabs if not tab.done]
+        while active:
+            for tab in list(active):
+                self._play_one(tab, stop_on_error=stop_on_error)
+                if tab.done:
+                    active.remove(tab)
+        self.logger.info("play finished")
+
+    def run_wait_aware(
+        self,
+        logs: list[str | Path] | str | Path,
+        *,
+        poll_interval: float = 0.5,
+        stop_on_error: bool = False,
+    ) -> float:
+        """
+        Как play(), но долгие шаги не блокируют остальных: LongStep запускает
+        действие, вкладка паркуется, а её probe() вызывается не чаще раза в
+        poll_interval, пока другие вкладки выполняют свои шаги.
+        Возвращает общее время прогона (сек).
+        """
+        self._load_logs(logs)
+        started = perf_counter()
+        runnable = [tab for tab in self.tabs if not tab.done]
+        parked: dict[str, _Parked] = {}
+
+        while runnable or parked:
+            for tab in [t for t in self.tabs if t.name in parked]:
+                state = parked[tab.name]
+                if perf_counter() < state.next_poll_at:
+                    continue
+                if self._poll_parked(tab, state, poll_interval, stop_on_error):
+                    del parked[tab.name]
+                    if not tab.done:
+                        runnable.append(tab)
+
+            if runnable:
+                tab = runnable.pop(0)
+                state = self._dispatch_one(tab, stop_on_error=stop_on_error)
+                if state is not None:
+                    parked[tab.name] = state
+                elif not tab.done:
+                    runnable.append(tab)
+                continue
+
+            if parked:
+                wake_at = min(state.next_poll_at for state in parked.values())
+                delay = wake_at - perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        wall = perf_counter() - started
+        self.logger.info("run_wait_aware finished wall_sec=%.3f", wall)
+        for tab in self.tabs:
+            self.logger.info(
+                "tab=%s scheduled_sec=%.3f blocked_sec=%.3f error=%s",
+                tab.name,
+                tab.scheduled_sec,
+                tab.blocked_sec,
+                tab.error,
+            )
+        return wall
+
+    def _load_logs(self, logs: list[str | Path] | str | Path) -> None:
+        if not self.tabs:
+            raise RuntimeError("No tabs: call create_tabs() first")
+        paths = [logs] if isinstance(logs, (str, Path)) else list(logs)
+        for i, tab in enumerate(self.tabs):
+            if tab.executor is None:
+                raise RuntimeError(f"Tab {tab.name} has no executor")
+            tab.load_log(paths[i % len(paths)])
+            if not tab.timer.running:
+                tab.timer.start()
+        self.logger.info(
+            "play tabs=%s logs=%s", len(self.tabs), [str(p) for p in paths]
+        )
+
+    @staticmethod
+    def _step_label(step: InteractionStep) -> str:
+        event, action = step.action_key
+        return f"{step.index}:{event}/{action}:{getattr(step, 'testId', None) or '-'}"
+
+    def _play_one(self, tab: TabSession, *, stop_on_error: bool) -> None:
+        step = tab.next_step()
+        label = self._step_label(step)
+        started = perf_counter()
+        try:
+            tab.run(lambda t: t.executor.execute_step(step), label)
+        except Exception as exc:
+            self._fail(tab, step, exc, stop_on_error)
+        finally:
+            tab.scheduled_sec += perf_counter() - started
+
+    def _dispatch_one(self, tab: TabSession, *, stop_on_error: bool) -> _Parked | None:
+        """Выполняет следующий шаг; для LongStep — только запуск и парковка."""
+        step = tab.next_step()
+        long_step = self._match_long_step(tab, step)
+        if long_step is None:
+            tab.position -= 1
+            self._play_one(tab, stop_on_error=stop_on_error)
+            return None
+
+        label = self._step_label(step)
+        started = perf_counter()
+        try:
+            tab.activate()
+            probe = long_step.dispatch(step)
+        except Exception as exc:
+            self._fail(tab, step, exc, stop_on_error)
+            return None
+        finally:
+            tab.scheduled_sec += perf_counter() - started
+        now = perf_counter()
+        self.logger.info("tab=%s parked on %s", tab.name, label)
+        return _Parked(label, step, long_step, probe, parked_at=started, next_poll_at=now)
+
+    def _poll_parked(
+        self,
+        tab: TabSession,
+        state: _Parked,
+        poll_interval: float,
+        stop_on_error: bool,
+    ) -> bool:
+        """Одна проверка припаркованной вкладки; True — вкладку можно снимать с парковки."""
+        long_step = state.long_step
+        if state.ready_at is None:
+            started = perf_counter()
+            try:
+                tab.activate()
+                ready = bool(state.probe())
+            except Exception as exc:
+                tab.scheduled_sec += perf_counter() - started
+                self._fail(tab, state.step, exc, stop_on_error)
+                return True
+            now = perf_counter()
+            tab.scheduled_sec += now - started
+            timed_out = not ready and now - state.parked_at >= long_step.timeout
+            if not ready and not timed_out:
+                state.next_poll_at = now + poll_interval
+                return False
+            if timed_out and long_step.raise_on_timeout:
+                exc = TimeoutError(f"{state.label} not ready after {long_step.timeout}s")
+                self._fail(tab, state.step, exc, stop_on_error)
+                return True
+            state.ready_at = now
+            if ready and long_step.settle_sec > 0:
+                # Пауза после готовности тоже не держит другие вкладки.
+                state.next_poll_at = now + long_step.settle_sec
+                return False
+
+        now = perf_counter()
+        blocked = now - state.parked_at
+        tab.blocked_sec += blocked
+        tab.timer.record(state.label, blocked)
+        self.logger.info(
+            "tab=%s unparked %s blocked_sec=%.3f", tab.name, state.label, blocked
+        )
+        return True
+
+    def _match_long_step(self, tab: TabSession, step: InteractionStep) -> LongStep | None:
+        if tab.long_steps is None or tab.executor is None:
+            return None
+        if tab.executor._should_skip_step(step):
+            return None
+        exact, prefix, step_routes = tab.long_steps
+        event, action = step.action_key
+        for key in ((event, action), (event, "*"), ("*", action)):
+            if key in step_routes:
+                return step_routes[key]
+        test_id = getattr(step, "testId", None) or ""
+        if not test_id:
+            return None
+        if test_id in exact:
+            return exact[test_id]
+        for route_prefix, long_step in prefix.items():
+            if test_id.startswith(route_prefix):
+                return long_step
+        return None
+
+    def _fail(
+        self,
+        tab: TabSession,
+        step: InteractionStep,
+        exc: BaseException,
+        stop_on_error: bool,
+    ) -> None:
+        tab.error = exc
+        self.logger.exception(
+            "tab=%s failed on line=%s seq=%s", tab.name, step.index, getattr(step, "seq", None)
+        )
+        if stop_on_error:
+            raise exc
+
+    # ---------- metrics ----------
+    def summaries(self, unit: str = "ms") -> dict[str, list[dict[str, float | str]]]:
+        return {tab.name: tab.timer.summary(unit=unit) for tab in self.tabs}
+
+
+@dataclass(frozen=True)
+class WarmTabHooks:
+    """
+    Хуки профиля для WarmTabPool (все выполняются на общем драйвере).
+
+    open: из домашнего окна открывает редактор и запускает загрузку плагина
+        без ожиданий; заканчивается в новом окне.
+    ready: одна дешёвая проверка, что плагин во вкладке загружен.
+    finish: доводка вкладки один раз, сразу после первой успешной ready
+        (например, закрыть подсказку; короткое ожидание допустимо). Идёт в
+        fill() — его зовёт release() между кейсами — для вкладок, успевших
+        загрузиться, иначе при выдаче (при size=1 — обычно при выдаче).
+    on_acquire: одна проверка без ожидания при каждой выдаче (например,
+        закрыть подсказку, показанную уже после finish).
+    recycle: после кейса возвращает вкладку в исходное состояние; True —
+        вкладку можно вернуть в пул, иначе она закрывается.
+    """
+
+    open: Callable[[], None]
+    ready: Callable[[], bool] | None = None
+    finish: Callable[[], None] | None = None
+    on_acquire: Callable[[], None] | None = None
+    recycle: Callable[[], bool] | None = None
+
+
+@dataclass
+class _WarmTab:
+    handle: str
+    opened_at: float
+    uses: int = 0
+    ready: bool = False
+
+
+class WarmTabPool:
+    """
+    Пул тёплых вкладок редактора для пакетного прогона на одном драйвере.
+
+    fill() открывает вкладки до size и доводит уже загрузившиеся (ready +
+    finish), acquire() выдаёт готовую вкладку (или открывает «холодную»,
+    если пул пуст), release() закрывает/возвращает её и сразу доливает пул —
+    новые вкладки грузятся, пока идёт следующий кейс.
+
+    Пример:
+        pool = WarmTabPool(driver, hooks, size=2)
+        pool.fill()
+        handle = pool.acquire()
+        try:
+            executor.replay_file(log, prepare_plugin_home=False)
+        finally:
+            pool.release(handle)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        driver: DriverOnlyOffice,
+        hooks: WarmTabHooks,
+        *,
+        size: int = 2,
+        home_handle: str | None = None,
+        ready_timeout: float = 30,
+        poll_interval: float = 0.25,
+        max_uses: int = 1,
+    ):
+        self.driver = driver
+        self.hooks = hooks
+        self.size = size
+        self.home_handle = home_handle or driver.get_current_window_handle()
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.max_uses = max_uses
+        self.idle: deque[_WarmTab] = deque()
+        self.busy: dict[str, _WarmTab] = {}
+        self.warm_hits = 0
+        self.cold_opens = 0
+        self.acquire_wait_sec = 0.0
+        self.logger = get_logger("warm_tab_pool")
+
+    def _open(self) -> _WarmTab:
+        self.driver.activate_window(self.home_handle)
+        self.hooks.open()
+        tab = _WarmTab(self.driver.get_current_window_handle(), perf_counter())
+        self.logger.info("warm tab opened handle=%s", tab.handle)
+        return tab
+
+    def _check_ready(self, tab: _WarmTab) -> bool:
+        """Одна проверка ready активной вкладки; при первом успехе — finish."""
+        if not tab.ready and (self.hooks.ready is None or self.hooks.ready()):
+            if self.hooks.finish is not None:
+                self.hooks.finish()
+            tab.ready = True
+        return tab.ready
+
+    def _tend(self) -> int:
+        """Проверяет свободные вкладки, ещё не отмеченные готовыми. Возвращает число проверенных."""
+        checked = 0
+        for tab in self.idle:
+            if tab.ready:
+                continue
+            checked += 1
+            try:
+                self.driver.activate_window(tab.handle)
+                self._check_ready(tab)
+            except Exception:
+                self.logger.warning("warm tab check failed handle=%s", tab.handle, exc_info=True)
+        return checked
+
+    def fill(self) -> int:
+        """
+        Открывает вкладки, пока свободных меньше size, и доводит уже
+        загрузившиеся (см. WarmTabHooks.finish). Возвращает число открытых.
+        """
+        checked = self._tend()
+        opened = 0
+        while len(self.idle) < self.size:
+            self.idle.append(self._open())
+            opened += 1
+        if opened or checked:
+            self.driver.activate_window(self.home_handle)
+        return opened
+
+    def acquire(self) -> str:
+        """Выдаёт вкладку с загруженным плагином и переключается в неё."""
+        started = perf_counter()
+        warm = bool(self.idle)
+        if warm:
+            tab = self.idle.popleft()
+            self.warm_hits += 1
+        else:
+            tab = self._open()
+            self.cold_opens += 1
+        self.driver.activate_window(tab.handle)
+        deadline = perf_counter() + self.ready_timeout
+        while not self._check_ready(tab):
+            if perf_counter() >= deadline:
+                self.driver.close_window(tab.handle, fallback=self.home_handle)
+                raise TimeoutError(
+                    f"Warm tab {tab.handle} not ready in {self.ready_timeout}s"
+                )
+            time.sleep(self.poll_interval)
+        if self.hooks.on_acquire is not None:
+            self.hooks.on_acquire()
+        tab.uses += 1
+        self.busy[tab.handle] = tab
+        waited = perf_counter() - started
+        self.acquire_wait_sec += waited
+        self.logger.info(
+            "acquire handle=%s warm=%s age=%.3fs wait=%.3fs",
+            tab.handle,
+            warm,
+            max(0.0, started - tab.opened_at),
+            waited,
+        )
+        return tab.handle
+
+    def release(self, handle: str, *, reusable: bool = True, refill: bool = True) -> None:
+        """
+        Возвращает вкладку после кейса: recycle → обратно в пул, иначе закрыть.
+        refill — сразу открыть замену, чтобы она грузилась во время следующего кейса.
+        """
+        tab = self.busy.pop(handle, None)
+        if tab is None:
+            raise KeyError(f"Tab {handle} was not acquired from this pool")
+        recycled = False
+        if reusable and tab.uses < self.max_uses and self.hooks.recycle is not None:
+            try:
+                self.driver.activate_window(handle)
+                recycled = bool(self.hooks.recycle())
+            except Exception:
+                self.logger.warning("recycle failed handle=%s", handle, exc_info=True)
+        if recycled:
+            self.idle.append(tab)
+        else:
+            self.driver.close_window(handle, fallback=self.home_handle)
+        self.logger.info("release handle=%s recycled=%s", handle, recycled)
+        if refill:
+            self.fill()
+        else:
+            self.driver.activate_window(self.home_handle)
+
+    def close(self) -> None:
+        """Закрывает все свободные вкладки пула."""
+        while self.idle:
+            self.driver.close_window(self.idle.popleft().handle)
+        self.driver.set_window_handle(self.home_handle)
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "warm_hits": self.warm_hits,
+            "cold_opens": self.cold_opens,
+            "acquire_wait_sec": round(self.acquire_wait_sec, 3),
+        }
+
+
+__all__ = [
+    "LongStep",
+    "TabSession",
+    "MultiTabRunner",
+    "WarmTabHooks",
+    "WarmTabPool",
+]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from time import perf_counter
+from typing import Any
+
+
+def parse_step_time(value: Any) -> float | None:
+    """ISO-время шага из interaction-лога ("2026-02-16T11:28:08.989Z") в секунды epoch."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class ReplayPacer:
+    """
+    Воспроизводит паузы между шагами по полю `time` лога, масштабируя их на factor.
+
+    factor=1 — реальный темп, 0.1 — в 10 раз быстрее, 0 — без пауз (только отчёт).
+    Пауза перед шагом = (t_i - t_{i-1}) * factor минус время, уже ушедшее на
+    предыдущее действие; если действие шло дольше — шаг стартует сразу
+    (считается «опоздавшим»).
+
+    Пример:
+        pacer = ReplayPacer(0.1)
+        for step in steps:
+            pacer.before_step(step.get("time"))
+            execute(step)
+        print(pacer.summary())
+    """
+
+    def __init__(self, factor: float = 1.0):
+        if factor < 0:
+            raise ValueError("pace factor must be >= 0")
+        self.factor = factor
+        self.first_recorded: float | None = None
+        self.last_recorded: float | None = None
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.slept_sec = 0.0
+        self.late_steps = 0
+        self.steps = 0
+        self._prev_started: float | None = None
+
+    def before_step(self, recorded_time: Any) -> float:
+        """Ждёт до начала шага. Возвращает длительность сна в секундах."""
+        now = perf_counter()
+        if self.started is None:
+            self.started = now
+        self.steps += 1
+        recorded = parse_step_time(recorded_time)
+        slept = 0.0
+        if recorded is not None:
+            if self.first_recorded is None:
+                self.first_recorded = recorded
+            if self.last_recorded is not None and self._prev_started is not None:
+                gap = max(0.0, recorded - self.last_recorded) * self.factor
+                remaining = gap - (now - self._prev_started)
+                if remaining > 0:
+                    time.sleep(remaining)
+                    slept = remaining
+                elif gap > 0:
+                    self.late_steps += 1
+            self.last_recorded = recorded
+        self.slept_sec += slept
+        self._prev_started = perf_counter()
+        return slept
+
+    def finish(self) -> None:
+        self.finished = perf_counter()
+
+    def summary(self) -> dict[str, float | int | None]:
+        """recorded_sec — длительность записанной сессии, achieved_ratio — actual/recorded."""
+        recorded = (
+            self.last_recorded - self.first_recorded
+            if self.first_recorded is not None and self.last_recorded is not None
+            else None
+        )
+        end = self.finished if self.finished is not None else perf_counter()
+        actual = end - self.started if self.started is not None else 0.0
+        return {
+            "factor": self.factor,
+            "steps": self.steps,
+            "recorded_sec": round(recorded, 3) if recorded is not None else None,
+            "actual_sec": round(actual, 3),
+            "slept_sec": round(self.slept_sec, 3),
+            "late_steps": self.late_steps,
+            "achieved_ratio": round(actual / recorded, 3) if recorded else None,
+        }
+
+
+__all__ = ["ReplayPacer", "parse_step_time"]
@@ -0,0 +1,424 @@
+"""
+История прогонов в SQLite (artifacts/results.sqlite).
+
+Три таблицы: batches (один batch-* каталог), cases (строки results из
+summary.json) и steps (<case_dir>/steps.jsonl, который пишет executor с
+--step-results). Если батч упал или был прерван до summary.json, строки
+кейсов берутся из results.jsonl, который раннер дописывает по ходу. Импорт идемпотентен: повторный импорт того же run_root
+заменяет его строки, поэтому старые summary.json можно подгружать сколько
+угодно раз.
+
+Пример:
+    with ResultsStore() as store:
+        store.import_all("artifacts/replay_cases")
+        store.step_percentiles("preview", group_by="connection", last_batches=30)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / "artifacts" / "results.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY,
+    run_root TEXT NOT NULL UNIQUE,
+    started_at TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    cases_total INTEGER,
+    cases_executed INTEGER,
+    failures INTEGER,
+    imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    batch_id INTEGER NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+    idx INTEGER,
+    case_name TEXT NOT NULL,
+    case_file TEXT,
+    case_dir TEXT,
+    status TEXT,
+    returncode INTEGER,
+    duration_sec REAL,
+    prepare_sec REAL,
+    worker INTEGER,
+    error TEXT,
+    cache_key TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY,
+    case_id INTEGER NOT NULL REFERENCES cases(id) ON DELETE CASCADE,
+    line INTEGER,
+    seq INTEGER,
+    event TEXT,
+    action TEXT,
+    test_id TEXT,
+    route TEXT,
+    connection TEXT,
+    query TEXT,
+    status TEXT,
+    started_at REAL,
+    duration_sec REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_batches_started ON batches(started_at);
+CREATE INDEX IF NOT EXISTS idx_cases_batch ON cases(batch_id);
+CREATE INDEX IF NOT EXISTS idx_cases_name ON cases(case_name);
+CREATE INDEX IF NOT EXISTS idx_steps_case ON steps(case_id);
+CREATE INDEX IF NOT EXISTS idx_steps_route ON steps(route);
+CREATE INDEX IF NOT EXISTS idx_steps_test_id ON steps(test_id);
+CREATE INDEX IF NOT EXISTS idx_steps_connection ON steps(connection);
+"""
+
+STEP_COLUMNS = (
+    "line",
+    "seq",
+    "event",
+    "action",
+    "test_id",
+    "route",
+    "connection",
+    "query",
+    "status",
+    "started_at",
+    "duration_sec",
+    "error",
+)
+GROUP_COLUMNS = {"connection", "query", "route", "test_id", "case_name"}
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    """Перцентиль по ближайшему рангу (как в load_generator, без зависимости от selenium)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+SUMMARY_FILES = ("summary.json", "results.jsonl")
+
+
+def _batch_started_at(run_root: Path) -> str:
+    """Время из имени batch-YYYYmmdd-HHMMSS, иначе mtime summary.json/results.jsonl."""
+    try:
+        stamp = datetime.strptime(run_root.name.removeprefix("batch-"), "%Y%m%d-%H%M%S")
+    except ValueError:
+        summary = next(p for p in (run_root / n for n in SUMMARY_FILES) if p.is_file())
+        stamp = datetime.fromtimestamp(summary.stat().st_mtime)
+    return stamp.isoformat(timespec="seconds")
+
+
+def _load_summary(run_root: Path) -> dict[str, Any]:
+    """summary.json, а для незавершённого батча — сводка из results.jsonl."""
+    path = run_root / "summary.json"
+    if path.is_file() or not (run_root / "results.jsonl").is_file():
+        return json.loads(path.read_text(encoding="utf-8"))
+    results = _read_jsonl(run_root / "results.jsonl")
+    executed = [r for r in results if r.get("status") != "skipped"]
+    return {
+        "cases_executed": len(executed),
+        "failures": sum(1 for r in executed if r.get("status") != "ok"),
+        "interrupted": True,
+        "results": results,
+    }
+
+
+def _batch_roots(replay_root: Path) -> list[Path]:
+    return [
+        path
+        for path in sorted(replay_root.glob("batch-*"))
+        if any((path / name).is_file() for name in SUMMARY_FILES)
+    ]
+
+
+def _local_case_dir(run_root: Path, case_dir: str) -> Path:
+    """steps.jsonl кейса; батч мог быть записан на другой машине или перемещён."""
+    path = Path(case_dir)
+    if not path.is_dir():
+        path = run_root / case_dir.replace("\\", "/").rsplit("/", 1)[-1]
+    return path / "steps.jsonl"
+
+
+def _read_jsonl(path: Path) -> list[dict[str, Any]]:
+    if not path.is_file():
+        return []
+    steps = []
+    with path.open("r", encoding="utf-8") as stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                steps.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Последняя строка могла оборваться, если прогон убили.
+                continue
+    return steps
+
+
+class ResultsStore:
+    def __init__(self, path: str | Path = DEFAULT_DB_PATH, *, read_only: bool = False):
+        """read_only — для отчётов: без создания схемы и миграций, запись невозможна."""
+        self.path = Path(path)
+        if read_only:
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            self.conn.row_factory = sqlite3.Row
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Колонки, добавленные после первых версий базы."""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(cases)")}
+        if "cache_key" not in columns:
+            self.conn.execute("ALTER TABLE cases ADD COLUMN cache_key TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cases_cache_key ON cases(cache_key)")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------- import ----------
+    def import_batch(self, run_root: str | Path) -> int:
+        """Импортирует <run_root>/summary.json и steps.jsonl кейсов. Возвращает batch id."""
+        run_root = Path(run_root).resolve()
+        summary = _load_summary(run_root)
+        results: list[dict[str, Any]] = summary.get("results") or []
+        with self.conn:
+            self.conn.execute("DELETE FROM batches WHERE run_root = ?", (str(run_root),))
+            batch_id = self.conn.execute(
+                "INSERT INTO batches (run_root, started_at, mode, cases_total, cases_executed, "
+                "failures, imported_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(run_root),
+                    _batch_started_at(run_root),
+                    "pool" if "contention" in summary else "sequential",
+                    summary.get("cases_total"),
+                    summary.get("cases_executed", len(results)),
+                    summary.get("failures"),
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            ).lastrowid
+            for result in results:
+                case_file = result.get("case_file") or ""
+                case_dir = result.get("case_dir")
+                case_id = self.conn.execute(
+                    "INSERT INTO cases (batch_id, idx, case_name, case_file, case_dir, status, "
+                    "returncode, duration_sec, prepare_sec, worker, error, cache_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        batch_id,
+                        result.get("index"),
+                        Path(case_file).stem or "-",
+                        case_file,
+                        case_dir,
+                        result.get("status"),
+                        result.get("returncode"),
+                        result.get("duration_sec"),
+                        result.get("prepare_sec"),
+                        result.get("worker"),
+                        result.get("error"),
+                        result.get("cache_key"),
+                    ),
+                ).lastrowid
+                if case_dir:
+                    self._insert_steps(case_id, _read_jsonl(_local_case_dir(run_root, case_dir)))
+        return batch_id
+
+    def _insert_steps(self, case_id: int, steps: Iterable[dict[str, Any]]) -> None:
+        placeholders = ", ".join("?" for _ in STEP_COLUMNS)
+        self.conn.executemany(
+            f"INSERT INTO steps (case_id, {', '.join(STEP_COLUMNS)}) VALUES (?, {placeholders})",
+            ((case_id, *(step.get(c) for c in STEP_COLUMNS)) for step in steps),
+        )
+
+    def import_all(self, replay_root: str | Path) -> list[Path]:
+        """Все batch-* под replay_root (старые прогоны тоже)."""
+        imported = []
+        for run_root in _batch_roots(Path(replay_root)):
+            try:
+                self.import_batch(run_root)
+            except (OSError, ValueError):
+                continue
+            imported.append(run_root)
+        return imported
+
+    def import_new(self, replay_root: str | Path) -> list[Path]:
+        """Только batch-* под replay_root, которых ещё нет в базе."""
+        known = {row["run_root"] for row in self.conn.execute("SELECT run_root FROM batches")}
+        imported = []
+        for run_root in _batch_roots(Path(replay_root)):
+            if str(run_root.resolve()) in known:
+                continue
+            try:
+                self.import_batch(run_root)
+            except (OSError, ValueError):
+                continue
+            imported.append(run_root)
+        return imported
+
+    # ---------- queries ----------
+    def recent_batch_ids(self, last_batches: int | None = None) -> list[int]:
+        sql = "SELECT id FROM batches ORDER BY started_at DESC, id DESC"
+        params: tuple[Any, ...] = ()
+        if last_batches is not None:
+            sql += " LIMIT ?"
+            params = (last_batches,)
+        return [row["id"] for row in self.conn.execute(sql, params)]
+
+    def cached_pass(self, cache_key: str) -> dict[str, Any] | None:
+        """
+        Последний выполненный прогон кейса с тем же ключом кэша (см.
+        case_cache), если он прошёл. skipped не считается; упавший после
+        прохода прогон с тем же ключом отменяет кэш.
+        """
+        row = self.conn.execute(
+            "SELECT b.run_root, b.started_at, c.duration_sec, c.status FROM cases c "
+            "JOIN batches b ON b.id = c.batch_id "
+            "WHERE c.cache_key = ? AND c.status != 'skipped' "
+            "ORDER BY b.started_at DESC, b.id DESC LIMIT 1",
+            (cache_key,),
+        ).fetchone()
+        if row is None or row["status"] != "ok":
+            return None
+        return {k: row[k] for k in ("run_root", "started_at", "duration_sec")}
+
+    def case_history(self, *, last_batches: int | None = 20) -> dict[str, dict[str, Any]]:
+        """
+        По case_name за последние last_batches батчей: статус последнего
+        выполненного прогона (skipped не считается), медиана длительности
+        прошедших прогонов (если их нет — всех) и число прогонов.
+        """
+        batch_ids = self.recent_batch_ids(last_batches)
+        if not batch_ids:
+            return {}
+        marks = ", ".join("?" for _ in batch_ids)
+        history: dict[str, dict[str, Any]] = {}
+        durations: dict[str, tuple[list[float], list[float]]] = {}
+        for row in self.conn.execute(
+            "SELECT c.case_name, c.status, c.duration_sec FROM cases c "
+            "JOIN batches b ON b.id = c.batch_id "
+            f"WHERE c.batch_id IN ({marks}) AND c.status != 'skipped' "
+            "ORDER BY b.started_at DESC, b.id DESC",
+            batch_ids,
+        ):
+            entry = history.setdefault(row["case_name"], {"last_status": row["status"], "runs": 0})
+            entry["runs"] += 1
+            if row["duration_sec"] is not None:
+                ok_values, all_values = durations.setdefault(row["case_name"], ([], []))
+                all_values.append(row["duration_sec"])
+                if row["status"] == "ok":
+                    ok_values.append(row["duration_sec"])
+        for name, entry in history.items():
+            ok_values, all_values = durations.get(name, ([], []))
+            entry["duration_p50"] = _percentile(ok_values or all_values, 50)
+        return history
+
+    def latest_batch(self, under: str | Path | None = None) -> Path | None:
+        """Последний импортированный батч (по индексу started_at), чей summary.json ещё на месте."""
+        sql = "SELECT run_root FROM batches"
+        params: tuple[Any, ...] = ()
+        if under is not None:
+            root = str(Path(under).resolve())
+            sql += " WHERE substr(run_root, 1, ?) = ?"
+            params = (len(root), root)
+        sql += " ORDER BY started_at DESC, id DESC"
+        for row in self.conn.execute(sql, params):
+            path = Path(row["run_root"])
+            if (path / "summary.json").is_file():
+                return path
+        return None
+
+    def duration_samples(
+        self, kind: str = "case", *, last_batches: int | None = None
+    ) -> list[tuple[int, tuple[Any, ...], float]]:
+        """
+        (возраст батча: 0 — последний, ключ, длительность) пройденных кейсов
+        (ключ — case_name) или шагов (case_name, line, route).
+        """
+        batch_ids = self.recent_batch_ids(last_batches)
+        if not batch_ids:
+            return []
+        age = {batch_id: i for i, batch_id in enumerate(batch_ids)}
+        marks = ", ".join("?" for _ in batch_ids)
+        if kind == "case":
+            sql = (
+                "SELECT c.batch_id, c.case_name, c.duration_sec FROM cases c "
+                f"WHERE c.batch_id IN ({marks}) AND c.status = 'ok' AND c.duration_sec IS NOT NULL"
+            )
+        elif kind == "step":
+            sql = (
+                "SELECT c.batch_id, c.case_name, s.line, s.route, s.duration_sec FROM steps s "
+                "JOIN cases c ON c.id = s.case_id "
+                f"WHERE c.batch_id IN ({marks}) AND s.status = 'ok' AND s.duration_sec IS NOT NULL"
+            )
+        else:
+            raise ValueError("kind must be 'case' or 'step'")
+        return [
+            (age[row[0]], tuple(row[1:-1]), row[-1])
+            for row in self.conn.execute(sql, batch_ids)
+        ]
+
+    def step_percentiles(
+        self,
+        match: str | None = None,
+        *,
+        group_by: str = "connection",
+        last_batches: int | None = 30,
+        q: float = 95.0,
+        status: str | None = "ok",
+    ) -> list[dict[str, Any]]:
+        """
+        Перцентиль длительности шагов, у которых route или testId содержит match,
+        по группам group_by (connection/query/route/test_id/case_name) за
+        последние last_batches прогонов.
+        """
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"group_by must be one of {sorted(GROUP_COLUMNS)}")
+        batch_ids = self.recent_batch_ids(last_batches)
+        if not batch_ids:
+            return []
+        group_expr = "c.case_name" if group_by == "case_name" else f"s.{group_by}"
+        sql = (
+            f"SELECT {group_expr} AS grp, s.duration_sec AS duration FROM steps s "
+            "JOIN cases c ON c.id = s.case_id "
+            f"WHERE c.batch_id IN ({', '.join('?' for _ in batch_ids)})"
+        )
+        params: list[Any] = list(batch_ids)
+        if match:
+            sql += " AND (s.route LIKE ? OR s.test_id LIKE ?)"
+            params += [f"%{match}%", f"%{match}%"]
+        if status is not None:
+            sql += " AND s.status = ?"
+            params.append(status)
+        groups: dict[Any, list[float]] = {}
+        for row in self.conn.execute(sql, params):
+            groups.setdefault(row["grp"], []).append(row["duration"])
+        return [
+            {
+                group_by: group,
+                "count": len(values),
+                "p50": _percentile(values, 50),
+                f"p{q:g}": _percentile(values, q),
+                "max": max(values),
+            }
+            for group, values in sorted(groups.items(), key=lambda kv: str(kv[0]))
+        ]
+
+
+__all__ = ["DEFAULT_DB_PATH", "ResultsStore"]
@@ -0,0 +1,337 @@
+"""
+Таблица-таймлайн параллельных логов: колонка на вкладку/лог, строка на слот времени.
+
+Потоки шагов (каждый уже упорядочен по времени) сливаются heapq.merge без
+загрузки целиком. Событие занимает строку своего слота; если в одной колонке
+в слоте несколько событий, слот растягивается на несколько строк, а у
+остальных колонок там пустые ячейки. Ячейки хранятся разреженно в SQLite
+(timeline_cells: timeline, row, col), CSV/HTML собираются потоково.
+
+Пример:
+    builder = TimelineBuilder("artifacts/results.sqlite")
+    timeline_id = builder.build(
+        "batch-20260216", batch_case_streams("artifacts/replay_cases/batch-20260216-101500")
+    )
+    builder.export_csv(timeline_id, "timeline.csv")
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import html
+import json
+import math
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, TextIO
+
+from .results_store import DEFAULT_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timelines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    slot_sec REAL NOT NULL,
+    origin REAL,
+    rows INTEGER,
+    events INTEGER,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timeline_columns (
+    timeline_id INTEGER NOT NULL REFERENCES timelines(id) ON DELETE CASCADE,
+    col INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT,
+    PRIMARY KEY (timeline_id, col)
+);
+CREATE TABLE IF NOT EXISTS timeline_cells (
+    timeline_id INTEGER NOT NULL REFERENCES timelines(id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    t REAL NOT NULL,
+    label TEXT,
+    status TEXT,
+    duration_sec REAL,
+    PRIMARY KEY (timeline_id, row, col)
+) WITHOUT ROWID;
+"""
+
+INSERT_CHUNK = 10_000
+
+
+class TimelineEvent(NamedTuple):
+    t: float  # секунды (epoch или от старта прогона — одинаково во всех потоках)
+    column: str
+    label: str
+    status: str = "ok"
+    duration_sec: float | None = None
+
+
+class StepStream(NamedTuple):
+    """Упорядоченные по t события одного или нескольких столбцов из одного файла."""
+
+    source: str
+    events: Iterable[TimelineEvent]
+
+
+# ---------- readers ----------
+def _jsonl(path: Path) -> Iterator[dict]:
+    with path.open("r", encoding="utf-8") as stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def executor_step_stream(path: str | Path, column: str | None = None) -> StepStream:
+    """steps.jsonl исполнителя (--step-results): одна колонка на файл."""
+    path = Path(path)
+    name = column or path.parent.name
+
+    def _events() -> Iterator[TimelineEvent]:
+        for entry in _jsonl(path):
+            if entry.get("started_at") is None:
+                continue
+            label = f"{entry.get('event')}/{entry.get('action')}"
+            if entry.get("test_id"):
+                label += f" {entry['test_id']}"
+            yield TimelineEvent(
+                float(entry["started_at"]),
+                name,
+                label,
+                entry.get("status") or "ok",
+                entry.get("duration_sec"),
+            )
+
+    return StepStream(str(path), _events())
+
+
+def open_loop_step_stream(path: str | Path) -> StepStream:
+    """steps.jsonl open-loop/профильного генератора: колонка на сессию (вкладку)."""
+    path = Path(path)
+
+    def _events() -> Iterator[TimelineEvent]:
+        for entry in _jsonl(path):
+            yield TimelineEvent(
+                float(entry["actual_start"]),
+                f"session-{entry['session']}",
+                f"{entry.get('log')}:{entry.get('line')}",
+                entry.get("status") or "ok",
+                round(entry["end"] - entry["actual_start"], 4),
+            )
+
+    return StepStream(str(path), _events())
+
+
+def batch_case_streams(run_root: str | Path) -> list[StepStream]:
+    """Колонка на кейс батча (<case_dir>/steps.jsonl), удобно для режима пула."""
+    return [executor_step_stream(p) for p in sorted(Path(run_root).glob("*/steps.jsonl"))]
+
+
+# ---------- builder ----------
+def _checked(stream: StepStream) -> Iterator[tuple[TimelineEvent, str]]:
+    last = -math.inf
+    for event in stream.events:
+        if event.t < last:
+            raise ValueError(f"{stream.source}: events are not ordered by time ({event.t} < {last})")
+        last = event.t
+        yield event, stream.source
+
+
+class TimelineBuilder:
+    def __init__(self, db_path: str | Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "TimelineBuilder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def build(self, name: str, streams: Iterable[StepStream], *, slot_sec: float = 0.0) -> int:
+        """
+        Сливает потоки в таблицу; slot_sec=0 — строка на каждый момент времени,
+        >0 — события в пределах слота делят строку. Возвращает id таймлайна.
+        """
+        merged = heapq.merge(*(_checked(s) for s in streams), key=lambda item: item[0].t)
+        columns: dict[str, tuple[int, str]] = {}
+        with self.conn:
+            timeline_id = self.conn.execute(
+                "INSERT INTO timelines (name, slot_sec, created_at) VALUES (?, ?, ?)",
+                (name, slot_sec, datetime.now().isoformat(timespec="seconds")),
+            ).lastrowid
+            origin: float | None = None
+            slot_key: float | None = None
+            slot_base = 0  # первая строка текущего слота
+            slot_height = 0
+            in_slot: dict[int, int] = {}
+            events = 0
+            chunk: list[tuple] = []
+            for event, source in merged:
+                if origin is None:
+                    origin = event.t
+                key = math.floor((event.t - origin) / slot_sec) if slot_sec > 0 else event.t
+                if key != slot_key:
+                    slot_base += slot_height
+                    slot_key, slot_height, in_slot = key, 0, {}
+                if event.column not in columns:
+                    columns[event.column] = (len(columns), source)
+                col = columns[event.column][0]
+                offset = in_slot.get(col, 0)
+                in_slot[col] = offset + 1
+                slot_height = max(slot_height, offset + 1)
+                chunk.append(
+                    (
+                        timeline_id,
+                        slot_base + offset,
+                        col,
+                        event.t,
+                        event.label,
+                        event.status,
+                        event.duration_sec,
+                    )
+                )
+                events += 1
+                if len(chunk) >= INSERT_CHUNK:
+                    self._insert_cells(chunk)
+                    chunk = []
+            self._insert_cells(chunk)
+            self.conn.executemany(
+                "INSERT INTO timeline_columns (timeline_id, col, name, source) VALUES (?, ?, ?, ?)",
+                ((timeline_id, col, column, source) for column, (col, source) in columns.items()),
+            )
+            self.conn.execute(
+                "UPDATE timelines SET origin = ?, rows = ?, events = ? WHERE id = ?",
+                (origin, slot_base + slot_height, events, timeline_id),
+            )
+        return timeline_id
+
+    def _insert_cells(self, chunk: list[tuple]) -> None:
+        if chunk:
+            self.conn.executemany("INSERT INTO timeline_cells VALUES (?, ?, ?, ?, ?, ?, ?)", chunk)
+
+    # ---------- reading ----------
+    def info(self, timeline_id: int) -> dict[str, object]:
+        row = self.conn.execute(
+            "SELECT id, name, slot_sec, origin, rows, events, created_at FROM timelines WHERE id = ?",
+            (timeline_id,),
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"timeline {timeline_id} not found")
+        keys = ("id", "name", "slot_sec", "origin", "rows", "events", "created_at")
+        return dict(zip(keys, row))
+
+    def column_names(self, timeline_id: int) -> list[str]:
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT name FROM timeline_columns WHERE timeline_id = ? ORDER BY col",
+                (timeline_id,),
+            )
+        ]
+
+    def iter_rows(
+        self, timeline_id: int
+    ) -> Iterator[tuple[int, float, list[tuple[str, str, float | None] | None]]]:
+        """(row, t, ячейки по колонкам: (label, status, duration) или None)."""
+        width = len(self.column_names(timeline_id))
+        cursor = self.conn.execute(
+            "SELECT row, col, t, label, status, duration_sec FROM timeline_cells "
+            "WHERE timeline_id = ? ORDER BY row, col",
+            (timeline_id,),
+        )
+        current: int | None = None
+        t_row = 0.0
+        cells: list = []
+        while batch := cursor.fetchmany(INSERT_CHUNK):
+            for row, col, t, label, status, duration in batch:
+                if row != current:
+                    if current is not None:
+                        yield current, t_row, cells
+                    current, t_row, cells = row, t, [None] * width
+                t_row = min(t_row, t)
+                cells[col] = (label, status, duration)
+        if current is not None:
+            yield current, t_row, cells
+
+    # ---------- export ----------
+    @staticmethod
+    def _cell_text(cell: tuple[str, str, float | None] | None) -> str:
+        if cell is None:
+            return ""
+        label, status, duration = cell
+        text = label if duration is None else f"{label} ({duration:.3f}s)"
+        return text if status == "ok" else f"{text} [{status}]"
+
+    @staticmethod
+    def _time_text(t: float) -> str:
+        # Epoch из steps.jsonl исполнителя; у open-loop — секунды от старта.
+        if t > 1e9:
+            return datetime.fromtimestamp(t).isoformat(timespec="milliseconds")
+        return ""
+
+    def export_csv(self, timeline_id: int, path: str | Path) -> Path:
+        origin = self.info(timeline_id)["origin"] or 0.0
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("w", encoding="utf-8", newline="") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(["row", "t_sec", "time", *self.column_names(timeline_id)])
+            for row, t, cells in self.iter_rows(timeline_id):
+                writer.writerow(
+                    [row, f"{t - origin:.3f}", self._time_text(t), *map(self._cell_text, cells)]
+                )
+        return out
+
+    def export_html(self, timeline_id: int, path: str | Path, *, limit: int | None = None) -> Path:
+        origin = self.info(timeline_id)["origin"] or 0.0
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("w", encoding="utf-8") as stream:
+            self._html_head(stream, timeline_id)
+            rows = self.iter_rows(timeline_id)
+            for row, t, cells in islice(rows, limit) if limit else rows:
+                parts = [f"<td>{row}</td><td>{t - origin:.3f}</td>"]
+                for cell in cells:
+                    css = "" if cell is None or cell[1] == "ok" else ' class="failed"'
+                    parts.append(f"<td{css}>{html.escape(self._cell_text(cell))}</td>")
+                stream.write(f"<tr>{''.join(parts)}</tr>\n")
+            stream.write("</tbody></table></body></html>\n")
+        return out
+
+    def _html_head(self, stream: TextIO, timeline_id: int) -> None:
+        name = str(self.info(timeline_id)["name"])
+        headers = "".join(f"<th>{html.escape(c)}</th>" for c in self.column_names(timeline_id))
+        stream.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(name)}</title><style>"
+            "body{font:12px sans-serif}table{border-collapse:collapse}"
+            "th,td{border:1px solid #ccc;padding:2px 6px;white-space:nowrap}"
+            "thead th{position:sticky;top:0;background:#eee}td.failed{background:#fdd}"
+            f"</style></head><body><h3>{html.escape(name)}</h3><table>"
+            f"<thead><tr><th>row</th><th>t_sec</th>{headers}</tr></thead><tbody>\n"
+        )
+
+
+__all__ = [
+    "StepStream",
+    "TimelineBuilder",
+    "TimelineEvent",
+    "batch_case_streams",
+    "executor_step_stream",
+    "open_loop_step_stream",
+]
@@ -48,6 +48,11 @@ class Timer:
         self._laps.clear()
         return self
 
+    @property
+    def running(self) -> bool:
+        """True между start() и stop()."""
+        return self._start_at is not None
+
     def elapsed(self) -> float:
         """Возвращает время с момента start() в секундах."""
         self._ensure_started("elapsed")
@@ -68,6 +73,17 @@ class Timer:
         self._last_at = now
         return lap
 
+    def record(self, name: str, delta: float) -> Lap:
+        """
+        Добавляет метку с заранее измеренной длительностью (например, ожидание,
+        которое шло параллельно с другими действиями). last-mark не сдвигается.
+        """
+        self._ensure_started("record")
+        assert self._start_at is not None
+        lap = Lap(name=name, delta=delta, total=perf_counter() - self._start_at)
+        self._laps.append(lap)
+        return lap
+
     @contextmanager
     def step(self, name: str) -> Iterator[None]:
         """
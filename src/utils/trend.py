@@ -0,0 +1,146 @@
+"""
+Тренд длительностей между батчами и поиск статистически значимых замедлений.
+
+Последние `recent` батчей сравниваются с предыдущими `baseline` батчами
+односторонним U-критерием Манна–Уитни, без scipy: для малых выборок без
+связей — точное распределение U, иначе нормальное приближение с поправкой
+на связи и непрерывность. Регрессия — p-value, значимое по Холму на уровне
+alpha по всем ключам вызова (все кейсы или все шаги батчей), и медиана,
+выросшая не меньше чем на min_slowdown.
+
+Точный p-value важен на краях: при 5 против 20 и полном разделении он
+1/C(25, 5) ≈ 1.9e-5, а нормальное приближение даёт ≈ 3.9e-4 — ниже порога
+alpha/число шагов это не опускается никогда.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .results_store import _percentile
+
+# Точное распределение U считается, пока n1*n2 не больше этого (DP O(n1*n2)^2).
+EXACT_MAX_CELLS = 400
+
+
+@functools.lru_cache(maxsize=64)
+def _exact_u_counts(n1: int, n2: int) -> tuple[int, ...]:
+    """Число раскладок рангов с U = k (k = 0..n1*n2) при H0 без связей."""
+    # counts[m][k] — число способов получить U = k для m первых и n второй выборки.
+    counts = [[1] for _ in range(n1 + 1)]  # n = 0: U всегда 0
+    for n in range(1, n2 + 1):
+        new = [[1]] + [[0] * (m * n + 1) for m in range(1, n1 + 1)]
+        for m in range(1, n1 + 1):
+            row = new[m]
+            for k, ways in enumerate(counts[m]):  # c(m, n-1): наибольший элемент из второй
+                row[k] += ways
+            for k, ways in enumerate(new[m - 1]):  # c(m-1, n): из первой, обгоняет n
+                row[k + n] += ways
+        counts = new
+    return tuple(counts[n1])
+
+
+def _exact_u_upper_tail(n1: int, n2: int, u: int) -> float:
+    """P(U >= u) при H0 без связей."""
+    return sum(_exact_u_counts(n1, n2)[u:]) / math.comb(n1 + n2, n1)
+
+
+def mann_whitney_greater(recent: list[float], baseline: list[float]) -> float:
+    """p-value гипотезы «recent стохастически больше baseline»."""
+    n1, n2 = len(recent), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    if n1 * n2 <= EXACT_MAX_CELLS and len(set(recent) | set(baseline)) == n1 + n2:
+        u = sum(1 for r in recent for b in baseline if r > b)
+        return _exact_u_upper_tail(n1, n2, u)
+    combined = sorted([(v, 0) for v in recent] + [(v, 1) for v in baseline])
+    ranks_recent = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        ranks_recent += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        i = j + 1
+    n = n1 + n2
+    u = ranks_recent - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class TrendRow:
+    key: tuple[Any, ...]
+    baseline_n: int
+    recent_n: int
+    baseline_p50: float | None
+    baseline_p95: float | None
+    recent_p50: float | None
+    recent_p95: float | None
+    ratio: float | None  # recent_p50 / baseline_p50
+    p_value: float | None
+    regression: bool = False
+
+
+def trend_rows(
+    samples: Iterable[tuple[int, tuple[Any, ...], float]],
+    *,
+    recent: int = 5,
+    baseline: int = 20,
+    alpha: float = 0.01,
+    min_slowdown: float = 0.10,
+    min_samples: int = 3,
+) -> list[TrendRow]:
+    """
+    samples: (возраст батча, ключ, длительность) из ResultsStore.duration_samples.
+    Возраст < recent — окно сравнения, recent..recent+baseline-1 — база.
+    Поправка Холма — по всем проверенным ключам вызова, так что вероятность
+    хотя бы одной ложной тревоги на вызов не больше alpha.
+    """
+    groups: dict[tuple[Any, ...], tuple[list[float], list[float]]] = {}
+    for age, key, duration in samples:
+        if age >= recent + baseline:
+            continue
+        recent_values, baseline_values = groups.setdefault(key, ([], []))
+        (recent_values if age < recent else baseline_values).append(duration)
+
+    rows: list[TrendRow] = []
+    for key, (recent_values, baseline_values) in groups.items():
+        testable = len(recent_values) >= min_samples and len(baseline_values) >= min_samples
+        base_p50 = _percentile(baseline_values, 50)
+        recent_p50 = _percentile(recent_values, 50)
+        rows.append(
+            TrendRow(
+                key=key,
+                baseline_n=len(baseline_values),
+                recent_n=len(recent_values),
+                baseline_p50=base_p50,
+                baseline_p95=_percentile(baseline_values, 95),
+                recent_p50=recent_p50,
+                recent_p95=_percentile(recent_values, 95),
+                ratio=recent_p50 / base_p50 if base_p50 and recent_p50 is not None else None,
+                p_value=mann_whitney_greater(recent_values, baseline_values) if testable else None,
+            )
+        )
+
+    # Холм: i-й по возрастанию p сравнивается с alpha / (m - i), до первого незначимого.
+    tested = sorted((r for r in rows if r.p_value is not None), key=lambda r: r.p_value)
+    for i, row in enumerate(tested):
+        if row.p_value >= alpha / (len(tested) - i):
+            break
+        row.regression = row.ratio is not None and row.ratio >= 1 + min_slowdown
+    rows.sort(key=lambda r: (not r.regression, r.p_value if r.p_value is not None else 2.0, str(r.key)))
+    return rows
+
+
+__all__ = ["TrendRow", "mann_whitney_greater", "trend_rows"]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from io import BytesIO
 from pathlib import Path
-from typing import Literal
+from typing import Literal, NamedTuple
 
 import numpy as np
 from PIL import Image, ImageChops
@@ -11,11 +15,108 @@ from .config import env_get, load_dotenv
 
 Method = Literal["pixel", "ssim"]
 
+# Полоса строк, которую сравнивает _pixel_mismatch за один шаг: для Full HD
+# это ~370 КБ на временные массивы вместо трёх копий кадра.
+DIFF_TILE_ROWS = 64
+
+# SSIM: окно 7x7 и константы как у skimage.metrics.structural_similarity
+# (uint8, data_range=255); кадр предварительно уменьшается усреднением блоков.
+SSIM_WIN = 7
+SSIM_DOWNSCALE = 2
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+
 
 class VisualMismatch(Exception):
     """Поднимается при несовпадении скриншотов сверх допустимого порога."""
 
 
+class BaselineCache:
+    """
+    LRU декодированных baseline (uint8 HxWx3, только чтение) на весь процесс.
+
+    Размер ограничен суммой байт массивов; запись устаревает, если у PNG
+    изменились mtime или размер (update/refresh, ручная замена). Потокобезопасен:
+    декодирование идёт вне блокировки, так что два потока могут
+    одновременно декодировать один и тот же файл — сохранится последний.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[int, int, np.ndarray]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, path: Path) -> np.ndarray:
+        stat = path.stat()
+        key = str(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            if entry is not None:
+                self.invalidations += 1
+                self._drop(key)
+        with Image.open(path) as image:
+            arr = np.asarray(image.convert("RGB"))
+        arr.flags.writeable = False
+        if arr.nbytes <= self.max_bytes:
+            with self._lock:
+                if key in self._entries:
+                    self._drop(key)
+                self._entries[key] = (stat.st_mtime_ns, stat.st_size, arr)
+                self._bytes += arr.nbytes
+                while self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+                    self.evictions += 1
+        return arr
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key)[2].nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _cache_max_bytes() -> int:
+    load_dotenv()
+    try:
+        return int(float(env_get("VISUAL_CACHE_MB", "256")) * 1024 * 1024)
+    except ValueError:
+        return 256 * 1024 * 1024
+
+
+_baseline_cache = BaselineCache(_cache_max_bytes())
+
+
+def baseline_cache_stats() -> dict[str, object]:
+    """Статистика процессного кэша baseline (hit rate и т.п.)."""
+    return _baseline_cache.stats()
+
+
 def _shots_root() -> Path:
     load_dotenv()
     base_dir = Path(__file__).resolve().parents[2]
@@ -42,11 +143,17 @@ def _grab_image(driver, element=None, region=None) -> Image.Image:
     element: WebElement — снимок только элемента.
     region: (left, top, right, bottom) или (x, y, w, h) для кропа из полного скрина.
     """
+    return _decode_capture(_capture_png(driver, element=element), region=region)
+
+
+def _capture_png(driver, element=None) -> bytes:
+    """Только запрос PNG у WebDriver — часть снимка, которая должна идти на потоке replay."""
     if element is not None:
-        png = element.screenshot_as_png
-        return Image.open(BytesIO(png)).convert("RGB")
+        return element.screenshot_as_png
+    return driver.get_screenshot_as_png()
+
 
-    png = driver.get_screenshot_as_png()
+def _decode_capture(png: bytes, region=None) -> Image.Image:
     img = Image.open(BytesIO(png)).convert("RGB")
     if region:
         if len(region) == 4:
@@ -63,47 +170,207 @@ def _grab_image(driver, element=None, region=None) -> Image.Image:
     return img
 
 
-def _pixel_diff(baseline: Image.Image, current: Image.Image):
-    if baseline.size != current.size:
+class PixelDiff(NamedTuple):
+    ratio: float  # доля отличающихся пикселей; при exact=False — верхняя граница
+    passed: bool
+    exact: bool
+
+
+def _as_rgb_array(image: Image.Image | np.ndarray) -> np.ndarray:
+    """uint8 HxWx3; массив возвращается как есть, RGB-картинка — без convert."""
+    if isinstance(image, np.ndarray):
+        return image
+    return np.asarray(image if image.mode == "RGB" else image.convert("RGB"))
+
+
+def _mismatch_mask(b_arr: np.ndarray, c_arr: np.ndarray) -> np.ndarray:
+    # uint8 сравниваются как есть: != по каналам и OR, без расширения до int16.
+    ne = b_arr != c_arr
+    return ne[..., 0] | ne[..., 1] | ne[..., 2]
+
+
+def _pixel_mismatch(b_arr: np.ndarray, c_arr: np.ndarray, threshold: float) -> PixelDiff:
+    """
+    Сравнивает кадры полосами по DIFF_TILE_ROWS строк. Совпадающая полоса
+    отсекается одним array_equal. Сравнение останавливается, как только
+    исход известен: отличий уже больше порога (провал) или даже если все
+    оставшиеся пиксели отличаются, порог не будет превышен (успех).
+    """
+    if b_arr.shape != c_arr.shape:
         raise VisualMismatch(
-            f"Size mismatch: baseline {baseline.size} vs current {current.size}. "
+            f"Size mismatch: baseline {b_arr.shape[1::-1]} vs current {c_arr.shape[1::-1]}. "
             "Установите одинаковое окно или пересоздайте baseline (VISUAL_MODE=update)."
         )
-    # разница по каналам
-    b_arr = np.asarray(baseline, dtype=np.int16)
-    c_arr = np.asarray(current, dtype=np.int16)
-    diff = np.abs(b_arr - c_arr)
-    mask = np.any(diff > 0, axis=2)
-    ratio = float(mask.mean())
-
-    # дифф‑картинка: baseline + красная подсветка
-    diff_img = baseline.copy()
-    # np.asarray может вернуть read-only view; делаем копию, чтобы была доступна запись
-    highlight = np.asarray(diff_img).copy()
-    highlight[mask] = [255, 0, 0]
-    diff_img = Image.fromarray(highlight)
-    return ratio, diff_img
-
-
-def _ssim_score(baseline: Image.Image, current: Image.Image):
+    height, width = b_arr.shape[:2]
+    total = height * width
+    if total == 0:
+        return PixelDiff(0.0, True, True)
+    # Same test as the full-frame ratio (mismatched / total <= threshold):
+    # threshold * total rounds differently and flips results at the boundary.
+    mismatched = 0
+    for top in range(0, height, DIFF_TILE_ROWS):
+        b_band = b_arr[top : top + DIFF_TILE_ROWS]
+        c_band = c_arr[top : top + DIFF_TILE_ROWS]
+        if not np.array_equal(b_band, c_band):
+            mismatched += int(np.count_nonzero(_mismatch_mask(b_band, c_band)))
+            if mismatched / total > threshold:
+                return PixelDiff(mismatched / total, False, False)
+        remaining = (height - top - len(b_band)) * width
+        if remaining and (mismatched + remaining) / total <= threshold:
+            return PixelDiff((mismatched + remaining) / total, True, False)
+    return PixelDiff(mismatched / total, mismatched / total <= threshold, True)
+
+
+def _pixel_diff(
+    baseline: Image.Image | np.ndarray, current: Image.Image | np.ndarray, threshold: float
+):
+    """
+    (PixelDiff, дифф-картинка или None). Подсветка (baseline + красные
+    пиксели) строится только при провале — тогда же считается точная доля.
+    """
+    b_arr = _as_rgb_array(baseline)
+    c_arr = _as_rgb_array(current)
+    result = _pixel_mismatch(b_arr, c_arr, threshold)
+    if result.passed:
+        return result, None
+    mask = _mismatch_mask(b_arr, c_arr)
+    highlight = b_arr.copy()
+    highlight[mask] = (255, 0, 0)
+    result = PixelDiff(float(np.count_nonzero(mask)) / mask.size, False, True)
+    return result, Image.fromarray(highlight)
+
+
+# ---------- хеши baseline ----------
+def _content_hash(arr: np.ndarray) -> str:
+    """sha1 от размеров и пикселей RGB (не от PNG: кодирование может отличаться)."""
+    digest = hashlib.sha1(f"{arr.shape}".encode("ascii"))
+    digest.update(memoryview(np.ascontiguousarray(arr)))
+    return digest.hexdigest()
+
+
+def _dhash(image: Image.Image | np.ndarray) -> str:
+    """64-битный difference hash: знак разности соседних пикселей на сетке 9x8."""
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    small = np.asarray(image.resize((9, 8), Image.Resampling.BOX).convert("L"))
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def _hash_distance(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def _hash_path(baseline_path: Path) -> Path:
+    return baseline_path.with_suffix(".hash.json")
+
+
+def _write_baseline_hashes(baseline_path: Path, image: Image.Image | np.ndarray) -> dict:
+    """Хеши рядом с baseline/{name}.png; mtime и размер PNG — чтобы заметить подмену файла."""
+    stat = baseline_path.stat()
+    hashes = {
+        "content_sha1": _content_hash(_as_rgb_array(image)),
+        "dhash": _dhash(image),
+        "png_mtime_ns": stat.st_mtime_ns,
+        "png_size": stat.st_size,
+    }
+    _hash_path(baseline_path).write_text(json.dumps(hashes, indent=2), encoding="utf-8")
+    return hashes
+
+
+def _read_baseline_hashes(baseline_path: Path) -> dict | None:
+    """Хеши baseline или None, если их нет или PNG менялся после их записи."""
     try:
-        from skimage.metrics import structural_similarity as ssim  # type: ignore
-    except Exception as exc:  # pragma: no cover
-        raise ImportError(
-            "Для метода 'ssim' установите scikit-image (pip install scikit-image)."
-        ) from exc
+        hashes = json.loads(_hash_path(baseline_path).read_text(encoding="utf-8"))
+        stat = baseline_path.stat()
+    except (OSError, ValueError):
+        return None
+    if hashes.get("png_mtime_ns") != stat.st_mtime_ns or hashes.get("png_size") != stat.st_size:
+        return None
+    return hashes
+
+
+def _gray(image: Image.Image | np.ndarray, downscale: int) -> np.ndarray:
+    """uint8 яркость (PIL "L"), уменьшенная в downscale раз средним по блокам (Image.reduce)."""
+    gray = Image.fromarray(_as_rgb_array(image)).convert("L")
+    if downscale > 1:
+        gray = gray.reduce(downscale)
+    return np.asarray(gray)
+
+
+def _box_sum(x: np.ndarray, win: int) -> np.ndarray:
+    """
+    Суммы по всем окнам win x win целиком внутри x (без паддинга). Окно
+    маленькое, поэтому сдвинутые сложения по каждой оси: 2*(win-1) проходов
+    по массиву, в int32 — точно и без последовательного cumsum.
+    """
+    height, width = x.shape
+    rows = x[: height - win + 1].copy()
+    for k in range(1, win):
+        rows += x[k : height - win + 1 + k]
+    out = rows[:, : width - win + 1].copy()
+    for k in range(1, win):
+        out += rows[:, k : width - win + 1 + k]
+    return out
+
 
-    if baseline.size != current.size:
+def _ssim_map(b_gray: np.ndarray, c_gray: np.ndarray, win: int = SSIM_WIN) -> np.ndarray:
+    """
+    Карта SSIM по окнам win x win для uint8 кадров, размер (H-win+1, W-win+1).
+    Формула и выборочная ковариация — как в skimage; окна у края skimage
+    считает с отражённым паддингом и при усреднении отбрасывает, здесь их
+    просто нет.
+
+    Всё, кроме финального деления, — целые суммы окон Sx, Sy, Sxx+Syy, Sxy
+    (для win=7 и uint8 влезают в int32): SSIM переписан через них умножением
+    средних на N² (N = win²), так что дисперсии считаются без потери точности.
+    """
+    win = min(win, *b_gray.shape)
+    count = win * win
+    cov_norm = count / (count - 1) if count > 1 else 1.0
+    x = b_gray.astype(np.int32)
+    y = c_gray.astype(np.int32)
+    sx = _box_sum(x, win)
+    sy = _box_sum(y, win)
+    sxx_yy = _box_sum(x * x + y * y, win)
+    sxy = _box_sum(x * y, win)
+    del x, y
+    sx_sy = sx * sy
+    sx2_sy2 = sx * sx + sy * sy
+    del sx, sy
+    c1 = (SSIM_K1 * 255) ** 2 * count * count
+    c2 = (SSIM_K2 * 255) ** 2 * count * count
+    # (2ux*uy + C1)(2vxy + C2) / ((ux² + uy² + C1)(vx + vy + C2)), всё * N².
+    numerator = (2 * sx_sy + c1) * (cov_norm * 2 * (count * sxy - sx_sy) + c2)
+    denominator = (sx2_sy2 + c1) * (cov_norm * (count * sxx_yy - sx2_sy2) + c2)
+    return numerator / denominator
+
+
+def _ssim_score(
+    baseline: Image.Image | np.ndarray,
+    current: Image.Image | np.ndarray,
+    downscale: int = SSIM_DOWNSCALE,
+):
+    """
+    (SSIM, heatmap). Считается на numpy по серому кадру, уменьшенному в
+    downscale раз (для мелких кадров — меньше, чтобы влезло окно). Heatmap —
+    карта SSIM в оттенках серого (чёрное — расхождение) в размере кадра.
+    """
+    b_arr = _as_rgb_array(baseline)
+    c_arr = _as_rgb_array(current)
+    if b_arr.shape != c_arr.shape:
         raise VisualMismatch(
-            f"Size mismatch: baseline {baseline.size} vs current {current.size}. "
+            f"Size mismatch: baseline {b_arr.shape[1::-1]} vs current {c_arr.shape[1::-1]}. "
             "Установите одинаковое окно или пересоздайте baseline (VISUAL_MODE=update)."
         )
-    b_arr = np.asarray(baseline.convert("L"))
-    c_arr = np.asarray(current.convert("L"))
-    score, diff_arr = ssim(b_arr, c_arr, full=True)
-    # diff_arr в [0,1]; превратим в heatmap серым
-    diff_img = Image.fromarray((diff_arr * 255).astype("uint8")).convert("RGB")
-    return score, diff_img
+    height, width = b_arr.shape[:2]
+    while downscale > 1 and min(height, width) // downscale < SSIM_WIN:
+        downscale //= 2
+    ssim_map = _ssim_map(_gray(b_arr, downscale), _gray(c_arr, downscale))
+    score = float(ssim_map.mean())
+    heat = (np.clip(ssim_map, 0.0, 1.0) * 255).astype(np.uint8)
+    diff_img = Image.fromarray(heat).resize((width, height), Image.Resampling.NEAREST)
+    return score, diff_img.convert("RGB")
 
 
 def assert_screenshot(
@@ -123,9 +390,41 @@ def assert_screenshot(
     threshold:
       - pixel: доля отличающихся пикселей (0.01 = 1%)
       - ssim: допускаем ухудшение до (1 - threshold), т.е. 0.01 => SSIM >= 0.99
-    method: 'pixel' (по умолчанию) или 'ssim' (требует scikit-image).
+    method: 'pixel' (по умолчанию) или 'ssim' (numpy, окно 7x7 по кадру, уменьшенному вдвое).
     update_mode: VISUAL_MODE env или аргумент: 'update' — перезаписывает baseline.
+
+    Рядом с baseline лежит {name}.hash.json (sha1 пикселей и dHash), его пишут
+    режимы update/refresh. Совпадение sha1 с текущим кадром — успех без
+    декодирования baseline; иначе полное сравнение, а в сообщение о
+    расхождении добавляется расстояние dHash. Декодированные baseline
+    хранятся в процессном LRU (VISUAL_CACHE_MB, по умолчанию 256; статистика —
+    baseline_cache_stats()), повторные проверки PNG не декодируют.
+
+    Асинхронный вариант (сравнение в фоне) — utils.visual_pool.VisualCheckPool.
     """
+    current = _grab_image(driver, element=element, region=region)
+    return _check_screenshot(
+        name,
+        current,
+        threshold=threshold,
+        method=method,
+        update_mode=update_mode,
+        logger=logger,
+        raise_on_fail=raise_on_fail,
+    )
+
+
+def _check_screenshot(
+    name: str,
+    current: Image.Image,
+    *,
+    threshold: float = 0.01,
+    method: Method = "pixel",
+    update_mode: str | None = None,
+    logger=None,
+    raise_on_fail: bool = True,
+) -> bool:
+    """Сравнение уже снятого кадра с baseline: всё, что assert_screenshot делает после снимка."""
     paths = _paths(name)
     _ensure_dirs(paths)
     load_dotenv()
@@ -134,16 +433,17 @@ def assert_screenshot(
     strict = strict_env in ("1", "true", "yes", "on")
     effective_raise = raise_on_fail and strict
 
-    current = _grab_image(driver, element=element, region=region)
     baseline_path = paths["baseline"]
 
     if not baseline_path.exists() or mode == "refresh":
         if mode in ("update", "refresh"):
+            existed = baseline_path.exists()
             current.save(baseline_path)
+            _write_baseline_hashes(baseline_path, current)
             if logger:
                 logger.info(
                     "Baseline %s: %s",
-                    "refreshed" if baseline_path.exists() else "created",
+                    "refreshed" if existed else "created",
                     baseline_path,
                 )
             return True
@@ -154,12 +454,22 @@ def assert_screenshot(
             raise VisualMismatch(msg)
         return False
 
-    baseline = Image.open(baseline_path).convert("RGB")
+    # Быстрый путь: кадр побайтно совпадает с baseline — PNG baseline не декодируется.
+    hashes = _read_baseline_hashes(baseline_path)
+    current_arr = _as_rgb_array(current)
+    if hashes is not None and hashes.get("content_sha1") == _content_hash(current_arr):
+        if logger:
+            logger.info("Screenshot ok: %s (content hash match)", name)
+        return True
+
+    baseline = _baseline_cache.get(baseline_path)
+    if hashes is None and mode == "update":
+        hashes = _write_baseline_hashes(baseline_path, baseline)
 
     if method == "pixel":
-        metric, diff_img = _pixel_diff(baseline, current)
-        passed = metric <= threshold
-        detail = f"diff_ratio={metric:.4f} (threshold {threshold})"
+        diff, diff_img = _pixel_diff(baseline, current_arr, threshold)
+        passed = diff.passed
+        detail = f"diff_ratio{'=' if diff.exact else '<='}{diff.ratio:.4f} (threshold {threshold})"
     elif method == "ssim":
         metric, diff_img = _ssim_score(baseline, current)
         passed = metric >= (1 - threshold)
@@ -172,6 +482,8 @@ def assert_screenshot(
             logger.info("Screenshot ok: %s (%s)", name, detail)
         return True
 
+    if hashes is not None:
+        detail += f", dhash_distance={_hash_distance(hashes['dhash'], _dhash(current_arr))}/64"
     # сохраняем actual и diff
     current.save(paths["actual"])
     diff_img.save(paths["diff"])
@@ -188,5 +500,7 @@ def assert_screenshot(
 
 __all__ = [
     "assert_screenshot",
+    "baseline_cache_stats",
+    "BaselineCache",
     "VisualMismatch",
 ]
@@ -0,0 +1,144 @@
+"""
+Фоновые визуальные проверки: снимок на потоке replay, сравнение — в пуле.
+
+На потоке replay остаётся только запрос PNG у WebDriver (его и надо мерить
+вместе с UI). Декодирование, сравнение с baseline и запись actual/diff идут
+в потоках пула: numpy и PIL большую часть работы делают без GIL, а
+BaselineCache общий для всего процесса, поэтому потоки, а не процессы.
+
+Результаты забирает collect() — executor зовёт его в конце шага или кейса.
+Каждый результат помнит метки шага (line/seq), на котором сделан снимок,
+так что провал относится к нужному шагу, даже если собран в конце кейса.
+
+Пример:
+    pool = VisualCheckPool(workers=2)
+    with pool.activate():
+        pool.current_step = {"line": 12, "seq": 5}
+        page.screenshot("export_dialog")  # BasePage.screenshot -> pool.submit
+        results = pool.collect()
+    pool.close()
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterator
+
+from .config import env_get, load_dotenv
+from .visual import _capture_png, _check_screenshot, _decode_capture
+
+_active_pool: ContextVar["VisualCheckPool | None"] = ContextVar("visual_check_pool", default=None)
+
+
+@dataclass
+class VisualCheckResult:
+    name: str
+    step: dict[str, Any]
+    passed: bool
+    error: BaseException | None = None
+    compare_sec: float = 0.0
+
+
+@dataclass
+class _PendingCheck:
+    name: str
+    step: dict[str, Any]
+    future: Future = field(repr=False)
+
+
+def visual_workers_default() -> int:
+    load_dotenv()
+    try:
+        return max(1, int(env_get("VISUAL_WORKERS", "2")))
+    except ValueError:
+        return 2
+
+
+def active_visual_pool() -> "VisualCheckPool | None":
+    """Пул, включённый pool.activate() в текущем контексте, или None (синхронный режим)."""
+    return _active_pool.get()
+
+
+def _run_check(name: str, png: bytes, region, kwargs: dict[str, Any]) -> tuple[bool, float]:
+    started = perf_counter()
+    passed = _check_screenshot(name, _decode_capture(png, region=region), **kwargs)
+    return passed, perf_counter() - started
+
+
+class VisualCheckPool:
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or visual_workers_default()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="visual")
+        self._pending: list[_PendingCheck] = []
+        self._lock = threading.Lock()
+        self.current_step: dict[str, Any] = {}
+        self.checks = 0
+        self.failed = 0
+        self.capture_sec = 0.0
+        self.compare_sec = 0.0
+        self.wait_sec = 0.0
+
+    @contextmanager
+    def activate(self) -> Iterator["VisualCheckPool"]:
+        token = _active_pool.set(self)
+        try:
+            yield self
+        finally:
+            _active_pool.reset(token)
+
+    def submit(self, driver, name: str, element=None, region=None, **kwargs: Any) -> None:
+        """
+        Снимает PNG синхронно и ставит сравнение в очередь. kwargs — как у
+        assert_screenshot (threshold, method, update_mode, logger, raise_on_fail).
+        """
+        started = perf_counter()
+        png = _capture_png(driver, element=element)
+        self.capture_sec += perf_counter() - started
+        future = self._executor.submit(_run_check, name, png, region, kwargs)
+        with self._lock:
+            self._pending.append(_PendingCheck(name, dict(self.current_step), future))
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def collect(self) -> list[VisualCheckResult]:
+        """Дожидается всех поставленных проверок; исключения сравнения — в result.error."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        started = perf_counter()
+        results = []
+        for check in pending:
+            try:
+                passed, compare_sec = check.future.result()
+                result = VisualCheckResult(check.name, check.step, passed, compare_sec=compare_sec)
+            except Exception as exc:
+                result = VisualCheckResult(check.name, check.step, False, error=exc)
+            self.compare_sec += result.compare_sec
+            self.failed += not result.passed
+            results.append(result)
+        self.checks += len(results)
+        self.wait_sec += perf_counter() - started
+        return results
+
+    def close(self) -> None:
+        """Останавливает потоки; ещё не собранные проверки дорабатывают, но не возвращаются."""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "checks": self.checks,
+            "failed": self.failed,
+            "capture_sec": round(self.capture_sec, 4),
+            "compare_sec": round(self.compare_sec, 4),
+            "wait_sec": round(self.wait_sec, 4),
+        }
+
+
+__all__ = ["VisualCheckPool", "VisualCheckResult", "active_visual_pool"]
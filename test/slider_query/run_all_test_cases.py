@@ -3,9 +3,11 @@ import json
 import os
 import subprocess
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
+from typing import Callable
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -27,6 +29,294 @@ def _find_logs(log_dir: Path) -> list[Path]:
     return sorted(log_dir.glob("run-*.log"), key=lambda p: p.stat().st_mtime)
 
 
+RESULTS_JSONL = "results.jsonl"
+
+
+def _append_result(path: Path, result: dict[str, object]) -> None:
+    """One line per finished case, so a crashed or interrupted batch keeps its results."""
+    with path.open("a", encoding="utf-8") as stream:
+        stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def _pump(stream, path: Path, prefix: str | None) -> None:
+    """Copies a child pipe into path line by line; with a prefix also echoes it to the console."""
+    with path.open("w", encoding="utf-8") as out:
+        for line in stream:
+            out.write(line)
+            out.flush()
+            if prefix is not None:
+                print(f"{prefix}{line.rstrip()}", flush=True)
+
+
+def _run_case_process(
+    cmd: list[str],
+    env: dict[str, str],
+    stdout_path: Path,
+    stderr_path: Path,
+    tail: bool,
+) -> int:
+    proc = subprocess.Popen(
+        cmd,
+        cwd=str(ROOT),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+    )
+    pumps = [
+        threading.Thread(target=_pump, args=(proc.stdout, stdout_path, "  | " if tail else None)),
+        threading.Thread(target=_pump, args=(proc.stderr, stderr_path, "  ! " if tail else None)),
+    ]
+    for pump in pumps:
+        pump.daemon = True
+        pump.start()
+    try:
+        return proc.wait()
+    except KeyboardInterrupt:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        raise
+    finally:
+        for pump in pumps:
+            pump.join(timeout=10)
+
+
+def _seconds(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.1f}s"
+
+
+DEFAULT_ROUTES_MODULE = "test.slider_query.run_replay_simple"
+
+
+def _read_plugin_version(debugger_address: str) -> str | None:
+    """Version of the plugin open in any editor window of the instance, if any."""
+    from src.driver import DriverOnlyOffice
+    from src.pages_slider_query.plugin_page import PluginPage
+
+    try:
+        driver = DriverOnlyOffice(debugger_address=debugger_address)
+    except Exception as exc:
+        print(f"[batch-replay] plugin version: cannot attach to {debugger_address}: {exc}")
+        return None
+    try:
+        for handle in driver.get_window_handles():
+            try:
+                driver.activate_window(handle)
+                version = PluginPage(driver).read_plugin_version()
+            except Exception:
+                continue
+            if version:
+                return version
+        return None
+    finally:
+        try:
+            driver.driver.quit()
+        except Exception:
+            pass
+
+
+def _case_cache_keys(args: argparse.Namespace, use_pool: bool):
+    from src.utils.case_cache import CaseCacheKeys
+    from src.utils.config import env_get
+    from src.utils.visual import _shots_root
+
+    version = args.plugin_version or _read_plugin_version(args.debugger_address[0])
+    if not version:
+        print(
+            "[batch-replay] plugin version unknown (plugin not open?): result cache "
+            "disabled, pass --plugin-version to enable it"
+        )
+        return None
+    # Everything else that changes a case outcome: the runner, its options and
+    # the visual settings. Outputs (--events, --artifacts-dir) and batch
+    # scheduling (--order, --workers beyond pool vs sequential,
+    # --continue-on-error) do not, and stay out of the key.
+    options: dict[str, object] = {
+        "runner": "pool" if use_pool else "sequential",
+        "prepare": not args.no_prepare,
+        "warm_tabs": args.warm_tabs,
+        "pace": args.pace,
+        "lookahead": args.lookahead,
+        "close_tabs": args.close_tabs,
+        "max_tabs": args.max_tabs,
+    }
+    for name in ("VISUAL_MODE", "VISUAL_STRICT", "VISUAL_ASYNC"):
+        options[name] = env_get(name)
+    try:
+        keys = CaseCacheKeys(
+            args.routes_module or DEFAULT_ROUTES_MODULE,
+            version,
+            runner_modules=["src.replay_pool" if use_pool else "test.slider_query.run_replay_simple"],
+            options=options,
+            baseline_dir=_shots_root() / "baseline",
+        )
+    except (OSError, SyntaxError, ModuleNotFoundError) as exc:
+        print(f"[batch-replay] result cache disabled: {exc}")
+        return None
+    print(
+        f"[batch-replay] result cache: plugin={version} sources={len(keys.sources)} "
+        f"code={keys.code_digest[:12]} baselines={keys.baseline_digest[:12]}"
+    )
+    return keys
+
+
+def _schedule(
+    args: argparse.Namespace,
+    pending: list[tuple[int, Path]],
+    workers: int,
+) -> tuple[list[tuple[int, Path]], dict[str, object]]:
+    """Recently failed cases first; longest-first when several workers share the queue."""
+    from src.utils.case_schedule import predict_makespan, schedule_cases
+    from src.utils.results_store import ResultsStore
+
+    history: dict[str, dict[str, object]] = {}
+    if args.order == "history":
+        try:
+            with ResultsStore(ROOT / args.results_db) as store:
+                # Batches written before the results db existed.
+                store.import_new(ROOT / args.artifacts_dir)
+                history = store.case_history(last_batches=args.history_batches)
+        except Exception as exc:
+            print(f"[batch-replay] history unavailable, keeping name order: {exc}")
+    # Without history schedule_cases keeps the name order.
+    scheduled = schedule_cases(pending, history, workers=workers)
+    known = sum(1 for c in scheduled if c.known)
+    predicted = predict_makespan([c.predicted_sec for c in scheduled], workers) if known else None
+    info = {
+        "order": args.order,
+        "workers": workers,
+        "recently_failed": sum(1 for c in scheduled if c.recently_failed),
+        "cases_with_history": known,
+        "predicted_sec": round(predicted, 3) if predicted is not None else None,
+        "predicted_by_case": {c.case_path.name: round(c.predicted_sec, 3) for c in scheduled},
+    }
+    if scheduled:
+        print(
+            f"[batch-replay] order: {args.order}, recently failed first={info['recently_failed']}"
+            f"{', longest first' if workers > 1 and args.order == 'history' else ''}; "
+            f"predicted duration {_seconds(predicted)} on {workers} worker(s) "
+            f"(history for {known}/{len(scheduled)} cases)"
+        )
+    return [(c.index, c.case_path) for c in scheduled], info
+
+
+def _run_pool_batch(
+    args: argparse.Namespace,
+    pending: list[tuple[int, Path]],
+    run_root: Path,
+    on_result: Callable[[dict[str, object]], None],
+) -> dict[str, object]:
+    from src.replay_pool import PoolTask, run_pool
+
+    def _pool_result(result: dict[str, object]) -> None:
+        # Worker logs live in <run_root>/worker-N, not per case.
+        result["stdout_log"] = None
+        result["stderr_log"] = None
+        on_result(result)
+
+    tasks = [
+        PoolTask(
+            index=idx,
+            case_file=str(case_path),
+            case_dir=str(run_root / f"{idx:03d}_{_safe_name(case_path.stem)}"),
+        )
+        for idx, case_path in pending
+    ]
+    # Shared queue: a worker that finishes early simply takes the next case.
+    addresses = [a for a in args.debugger_address for _ in range(args.workers)]
+    _, contention = run_pool(
+        tasks,
+        debugger_addresses=addresses,
+        routes_module=args.routes_module or DEFAULT_ROUTES_MODULE,
+        run_root=run_root,
+        prepare=not args.no_prepare,
+        warm_tabs=args.warm_tabs,
+        close_tabs=args.close_tabs,
+        max_tabs=args.max_tabs,
+        pace=args.pace,
+        lookahead=args.lookahead,
+        continue_on_error=args.continue_on_error,
+        log=print,
+        on_result=_pool_result,
+    )
+    return contention
+
+
+def _run_sequential_batch(
+    args: argparse.Namespace,
+    pending: list[tuple[int, Path]],
+    run_root: Path,
+    on_result: Callable[[dict[str, object]], None],
+) -> None:
+    """One run_replay_simple.py process per case on the first debugger address."""
+    for position, (idx, case_path) in enumerate(pending, start=1):
+        case_name = _safe_name(case_path.stem)
+        case_dir = run_root / f"{idx:03d}_{case_name}"
+        case_dir.mkdir(parents=True, exist_ok=True)
+
+        cmd = [
+            sys.executable,
+            "test/slider_query/run_replay_simple.py",
+            "--log",
+            str(case_path),
+            "--debugger-address",
+            args.debugger_address[0],
+        ]
+        if args.no_prepare:
+            cmd.append("--no-prepare")
+        if args.lookahead:
+            cmd.append("--lookahead")
+        if args.pace is not None:
+            cmd.extend(["--pace", str(args.pace)])
+        if args.close_tabs:
+            cmd.append("--close-tabs")
+        if args.max_tabs is not None:
+            cmd.extend(["--max-tabs", str(args.max_tabs)])
+        cmd.extend(["--step-results", str(case_dir / "steps.jsonl")])
+
+        env = os.environ.copy()
+        env["LOG_DIR"] = str(case_dir)
+        env.setdefault("PYTHONIOENCODING", "utf-8")
+        env.setdefault("PYTHONUNBUFFERED", "1")
+
+        print(f"[batch-replay] ({position}/{len(pending)}) start: {case_path.name}")
+        stdout_path = case_dir / "stdout.log"
+        stderr_path = case_dir / "stderr.log"
+        started = perf_counter()
+        returncode = _run_case_process(cmd, env, stdout_path, stderr_path, not args.no_tail)
+        duration_sec = round(perf_counter() - started, 3)
+        log_files = [str(p.name) for p in _find_logs(case_dir)]
+
+        status = "ok" if returncode == 0 else "failed"
+        print(
+            f"[batch-replay] ({position}/{len(pending)}) {status}: "
+            f"exit={returncode}, duration={duration_sec}s, case_dir={case_dir.name}"
+        )
+
+        on_result(
+            {
+                "index": idx,
+                "case_file": str(case_path),
+                "case_dir": str(case_dir),
+                "status": status,
+                "returncode": returncode,
+                "duration_sec": duration_sec,
+                "stdout_log": str(stdout_path),
+                "stderr_log": str(stderr_path),
+                "run_logs": log_files,
+            }
+        )
+
+        if returncode != 0 and not args.continue_on_error:
+            return
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description=(
@@ -48,14 +338,117 @@ def main(argv: list[str] | None = None) -> int:
     )
     parser.add_argument(
         "--debugger-address",
-        default="127.0.0.1:9222",
-        help="OnlyOffice remote debugger address.",
+        action="append",
+        default=None,
+        help=(
+            "OnlyOffice remote debugger address (default 127.0.0.1:9222). Repeat or "
+            "comma-separate to run one worker per endpoint on a shared case queue."
+        ),
+    )
+    parser.add_argument(
+        "--routes-module",
+        default=None,
+        help=(
+            "Routes profile module; implies worker-pool mode "
+            "(default test.slider_query.run_replay_simple)."
+        ),
     )
     parser.add_argument(
         "--no-prepare",
         action="store_true",
         help="Pass --no-prepare to replay launcher.",
     )
+    parser.add_argument(
+        "--lookahead",
+        action="store_true",
+        help="Prefetch the next step locator during waits (replay launcher or pool workers).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Worker processes per debugger address, each with its own WebDriver "
+            "session and editor window. A single address with 1 worker keeps the "
+            "one-subprocess-per-case mode."
+        ),
+    )
+    parser.add_argument(
+        "--warm-tabs",
+        type=int,
+        default=0,
+        help=(
+            "Worker-pool mode: keep N editor tabs per worker pre-opened with the plugin "
+            "loading (profile build_warm_tab_hooks) instead of preparing each case."
+        ),
+    )
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=None,
+        help="Pass --pace FACTOR to replay launcher (recorded think times scaled).",
+    )
+    parser.add_argument(
+        "--close-tabs",
+        action="store_true",
+        help="Close editor windows opened by each case when it ends.",
+    )
+    parser.add_argument(
+        "--max-tabs",
+        type=int,
+        default=None,
+        help="Cap of live editor tabs; the oldest are closed after each case.",
+    )
+    parser.add_argument(
+        "--results-db",
+        type=Path,
+        default=Path("artifacts/results.sqlite"),
+        help="SQLite history of batches/cases/steps; the finished batch is imported into it.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run every case, even if it already passed with the same inputs (result cache).",
+    )
+    parser.add_argument(
+        "--plugin-version",
+        default=None,
+        help="Plugin version for the result cache key (default: read from the open plugin).",
+    )
+    parser.add_argument(
+        "--order",
+        choices=("history", "name"),
+        default="history",
+        help=(
+            "Case order: 'history' runs recently failed cases first and, with several "
+            "workers, the longest cases first (from --results-db); 'name' keeps file order."
+        ),
+    )
+    parser.add_argument(
+        "--history-batches",
+        type=int,
+        default=20,
+        help="Number of recent batches used for case order and duration prediction.",
+    )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Enable the JSONL event log (LOG_EVENTS=1) in every case; run id = batch name.",
+    )
+    parser.add_argument(
+        "--visual-async",
+        choices=("step", "case"),
+        default=None,
+        help=(
+            "Compare screenshots in a background pool in every case (VISUAL_ASYNC); "
+            "results are collected per step or per case."
+        ),
+    )
+    parser.add_argument(
+        "--no-tail",
+        action="store_true",
+        help="Do not echo case stdout/stderr to the console (they are still streamed to the case dir).",
+    )
     parser.add_argument(
         "--continue-on-error",
         action="store_true",
@@ -72,88 +465,134 @@ def main(argv: list[str] | None = None) -> int:
     if not case_files:
         print(f"[batch-replay] no *.jsonl files in: {cases_dir}")
         return 2
+    if args.workers < 1:
+        print("[batch-replay] --workers must be >= 1")
+        return 2
+    args.debugger_address = [
+        address.strip()
+        for raw in (args.debugger_address or ["127.0.0.1:9222"])
+        for address in raw.split(",")
+        if address.strip()
+    ]
+    use_pool = (
+        len(args.debugger_address) * args.workers > 1
+        or args.routes_module is not None
+        or args.warm_tabs > 0
+    )
 
     run_stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     run_root = (ROOT / args.artifacts_dir / f"batch-{run_stamp}").resolve()
     run_root.mkdir(parents=True, exist_ok=True)
+    # Inherited by case subprocesses and pool workers.
+    os.environ.setdefault("LOG_RUN_ID", run_root.name)
+    if args.events:
+        os.environ["LOG_EVENTS"] = "1"
+    if args.visual_async:
+        os.environ["VISUAL_ASYNC"] = args.visual_async
 
     print(f"[batch-replay] run root: {run_root}")
     print(f"[batch-replay] cases: {len(case_files)}")
 
     results: list[dict[str, object]] = []
-    failures = 0
-
-    for idx, case_path in enumerate(case_files, start=1):
-        case_name = _safe_name(case_path.stem)
-        case_dir = run_root / f"{idx:03d}_{case_name}"
-        case_dir.mkdir(parents=True, exist_ok=True)
+    contention: dict[str, object] | None = None
 
-        cmd = [
-            sys.executable,
-            "test/slider_query/run_replay_simple.py",
-            "--log",
-            str(case_path),
-            "--debugger-address",
-            args.debugger_address,
-        ]
-        if args.no_prepare:
-            cmd.append("--no-prepare")
-
-        env = os.environ.copy()
-        env["LOG_DIR"] = str(case_dir)
-        env.setdefault("PYTHONIOENCODING", "utf-8")
+    # Result cache: a case that passed with the same JSONL, routes/page-object
+    # sources and plugin version is recorded as skipped instead of re-run.
+    cache_keys = _case_cache_keys(args, use_pool)
+    case_keys: dict[int, str] = {}
+    skipped: list[dict[str, object]] = []
+    pending: list[tuple[int, Path]] = []
+    store = None
+    if cache_keys is not None:
+        from src.utils.results_store import ResultsStore
 
-        print(f"[batch-replay] ({idx}/{len(case_files)}) start: {case_path.name}")
-        started = perf_counter()
-        proc = subprocess.run(
-            cmd,
-            cwd=str(ROOT),
-            env=env,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
+        store = ResultsStore(ROOT / args.results_db)
+    try:
+        for idx, case_path in enumerate(case_files, start=1):
+            if cache_keys is not None:
+                case_keys[idx] = cache_keys.key(case_path)
+            cached = store.cached_pass(case_keys[idx]) if store and not args.force else None
+            if cached is None:
+                pending.append((idx, case_path))
+                continue
+            skipped.append(
+                {
+                    "index": idx,
+                    "case_file": str(case_path),
+                    "case_dir": None,
+                    "status": "skipped",
+                    "returncode": None,
+                    "duration_sec": 0.0,
+                    "cached_from": cached["run_root"],
+                    "cache_key": case_keys[idx],
+                }
+            )
+    finally:
+        if store is not None:
+            store.close()
+    if skipped:
+        print(
+            f"[batch-replay] cached passes: {len(skipped)} skipped, {len(pending)} to run "
+            "(--force to run all)"
         )
-        duration_sec = round(perf_counter() - started, 3)
 
-        stdout_path = case_dir / "stdout.log"
-        stderr_path = case_dir / "stderr.log"
-        stdout_path.write_text(proc.stdout or "", encoding="utf-8")
-        stderr_path.write_text(proc.stderr or "", encoding="utf-8")
-        log_files = [str(p.name) for p in _find_logs(case_dir)]
+    total_workers = len(args.debugger_address) * args.workers if use_pool else 1
+    pending, schedule = _schedule(args, pending, total_workers)
+    batch_started = perf_counter()
 
-        status = "ok" if proc.returncode == 0 else "failed"
-        if status == "failed":
-            failures += 1
-        print(
-            f"[batch-replay] ({idx}/{len(case_files)}) {status}: "
-            f"exit={proc.returncode}, duration={duration_sec}s, case_dir={case_dir.name}"
-        )
+    # Every finished case goes to results.jsonl right away; summary.json is
+    # written at the end (also after Ctrl-C).
+    results_log = run_root / RESULTS_JSONL
+    for result in skipped:
+        _append_result(results_log, result)
 
-        results.append(
-            {
-                "index": idx,
-                "case_file": str(case_path),
-                "case_dir": str(case_dir),
-                "status": status,
-                "returncode": proc.returncode,
-                "duration_sec": duration_sec,
-                "stdout_log": str(stdout_path),
-                "stderr_log": str(stderr_path),
-                "run_logs": log_files,
-            }
-        )
+    def _record(result: dict[str, object]) -> None:
+        result["cache_key"] = case_keys.get(result["index"])
+        results.append(result)
+        _append_result(results_log, result)
 
-        if proc.returncode != 0 and not args.continue_on_error:
-            break
+    interrupted = False
+    try:
+        if use_pool:
+            if pending:
+                print(
+                    f"[batch-replay] workers: {args.workers} x {len(args.debugger_address)} "
+                    f"endpoint(s): {', '.join(args.debugger_address)}"
+                )
+                contention = _run_pool_batch(args, pending, run_root, _record)
+        else:
+            _run_sequential_batch(args, pending, run_root, _record)
+    except KeyboardInterrupt:
+        interrupted = True
+        print(f"[batch-replay] interrupted after {len(results)} case(s), writing summary")
 
+    schedule["actual_sec"] = round(perf_counter() - batch_started, 3)
+    if pending:
+        print(
+            f"[batch-replay] batch duration: actual {_seconds(schedule['actual_sec'])}, "
+            f"predicted {_seconds(schedule['predicted_sec'])}"
+        )
+    failures = sum(1 for r in results if r["status"] != "ok")
+    executed = len(results)
+    results = sorted(results + skipped, key=lambda r: r["index"])
     summary = {
         "cases_total": len(case_files),
-        "cases_executed": len(results),
+        "cases_executed": executed,
+        "cases_skipped": len(skipped),
         "failures": failures,
+        "interrupted": interrupted,
+        "plugin_version": cache_keys.plugin_version if cache_keys is not None else None,
+        "schedule": schedule,
         "run_root": str(run_root),
         "results": results,
     }
+    if contention is not None:
+        summary["contention"] = contention
+        print(
+            f"[batch-replay] contention: collisions={len(contention['handle_collisions'])}, "
+            f"max_latency_inflation={contention['max_latency_inflation']}, "
+            f"throughput={contention['throughput_cases_per_min']} cases/min"
+        )
     summary_path = run_root / "summary.json"
     summary_path.write_text(
         json.dumps(summary, ensure_ascii=False, indent=2),
@@ -161,6 +600,17 @@ def main(argv: list[str] | None = None) -> int:
     )
 
     print(f"[batch-replay] summary: {summary_path}")
+    try:
+        from src.utils.results_store import ResultsStore
+
+        with ResultsStore(ROOT / args.results_db) as store:
+            store.import_batch(run_root)
+        print(f"[batch-replay] results db: {(ROOT / args.results_db).resolve()}")
+    except Exception as exc:
+        print(f"[batch-replay] results db import failed: {exc}")
+    if interrupted:
+        print(f"[batch-replay] interrupted, failures={failures}")
+        return 2
     if failures:
         print(f"[batch-replay] finished with failures={failures}")
         return 2
@@ -171,4 +621,4 @@ def main(argv: list[str] | None = None) -> int:
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
+
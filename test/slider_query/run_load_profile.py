@@ -0,0 +1,151 @@
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.driver import DriverOnlyOffice  # noqa: E402
+from src.interaction_log_executor_simple import SimpleInteractionLogExecutor  # noqa: E402
+from src.utils.load_generator import OpenLoopLoadGenerator, latency_summary  # noqa: E402
+from src.utils.load_profile import (  # noqa: E402
+    LoadProfileError,
+    ProfileLoadGenerator,
+    load_profile,
+    plan_schedule,
+)
+from src.utils.multitab import WarmTabPool  # noqa: E402
+from src.utils.visual import baseline_cache_stats  # noqa: E402
+from test.slider_query.run_replay_simple import (  # noqa: E402
+    build_warm_tab_hooks,
+    configure_executor,
+)
+
+
+def _print_plan(plan: dict) -> None:
+    print(
+        f"[load-profile] {plan['profile']}: {plan['duration_sec']:.0f}s, tabs={plan['tabs']}, "
+        f"estimated end {plan['estimated_end_sec']:.0f}s"
+    )
+    for phase in plan["phases"]:
+        print(
+            f"[load-profile] phase {phase['name']}: start={phase['start']:.0f}s "
+            f"duration={phase['duration']:.0f}s concurrency={phase['concurrency']} "
+            f"think_time_scale={phase['think_time_scale']} "
+            f"sessions={phase['sessions_started']} peak_active={phase['peak_active']}"
+        )
+    print(f"[load-profile] scenarios: {plan['scenarios']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run a declarative load profile (TOML/JSON: weighted interaction logs, "
+            "phases with concurrency ramps and think-time scaling) on a pool of warm "
+            "editor tabs."
+        )
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=Path("test_cases/load_profiles/sql_mix.toml"),
+        help="Load profile file (.toml or .json).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate the profile and print the estimated schedule without a browser.",
+    )
+    parser.add_argument(
+        "--debugger-address",
+        default="127.0.0.1:9222",
+        help="OnlyOffice remote debugger address.",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=Path("artifacts/load_profile"),
+        help="Where steps.jsonl and summary.json (or plan.json for --dry-run) are written.",
+    )
+    args = parser.parse_args(argv)
+
+    profile_path = args.profile if args.profile.is_absolute() else ROOT / args.profile
+    try:
+        profile = load_profile(profile_path, base_dir=ROOT)
+    except LoadProfileError as exc:
+        print(f"[load-profile] invalid profile {exc.source}:")
+        for problem in exc.problems:
+            print(f"[load-profile]   {problem}")
+        return 2
+
+    out_dir = (ROOT / args.out_dir / f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}").resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    plan = plan_schedule(profile)
+    if args.dry_run:
+        _print_plan(plan)
+        plan_path = out_dir / "plan.json"
+        plan_path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[load-profile] plan: {plan_path}")
+        return 0
+
+    driver = DriverOnlyOffice(debugger_address=args.debugger_address)
+    hooks_executor = SimpleInteractionLogExecutor(driver=driver)
+    configure_executor(hooks_executor)
+    pool = WarmTabPool(driver, build_warm_tab_hooks(hooks_executor), size=plan["tabs"])
+
+    def _executor_factory(_handle: str) -> SimpleInteractionLogExecutor:
+        executor = SimpleInteractionLogExecutor(driver=driver)
+        configure_executor(executor)
+        executor.set_prepare_hook(None)
+        return executor
+
+    generator = ProfileLoadGenerator(driver, pool, _executor_factory, profile)
+    exit_code = 0
+    records = []
+    try:
+        records = generator.run_profile()
+    except Exception as exc:
+        print(f"[load-profile] failed: {exc}")
+        exit_code = 2
+    finally:
+        try:
+            pool.close()
+        except Exception:
+            pass
+        steps_path = OpenLoopLoadGenerator.write_records(records, out_dir / "steps.jsonl")
+        summary = {
+            "profile": profile.name,
+            "profile_file": str(profile_path),
+            "planned": {k: plan[k] for k in ("duration_sec", "tabs", "estimated_end_sec", "phases")},
+            "sessions": generator.session_summary(),
+            "start": generator.start_summary(),
+            "latency_ms": latency_summary(records),
+            "latency_ms_by_phase": {
+                phase.name: latency_summary(r for r in records if r.phase == phase.name)
+                for phase in profile.phases
+            },
+            "tab_pool": pool.stats(),
+            "visual_cache": baseline_cache_stats(),
+        }
+        (out_dir / "summary.json").write_text(
+            json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        for phase, values in summary["latency_ms_by_phase"].items():
+            print(f"[load-profile] {phase} corrected_latency: {values['corrected_latency']}")
+        if generator.aborted:
+            print(f"[load-profile] aborted: {generator.aborted}")
+        print(f"[load-profile] steps: {steps_path}")
+        try:
+            driver.driver.quit()
+        except Exception:
+            pass
+    if any(s["error"] for s in summary["sessions"]):
+        exit_code = 2
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
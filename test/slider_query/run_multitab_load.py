@@ -0,0 +1,153 @@
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.driver import DriverOnlyOffice  # noqa: E402
+from src.interaction_log_executor_simple import SimpleInteractionLogExecutor  # noqa: E402
+from src.utils.multitab import MultiTabRunner, TabSession  # noqa: E402
+from src.utils.timer import format_summary  # noqa: E402
+from test.slider_query.run_replay_simple import (  # noqa: E402
+    build_long_steps,
+    configure_executor,
+)
+
+# Шаги лога, которые уже выполнены общей подготовкой вкладки.
+PREPARED_TEST_IDS = ("main-sql-mode", "sql-home-open-sql-manager")
+
+
+def _prepare_plugin(tab: TabSession) -> None:
+    tab.context["editor_page"].click_plugin_button()
+    tab.context["editor_page"].try_click_close()
+
+
+def _prepare_sql_manager(tab: TabSession) -> None:
+    _prepare_plugin(tab)
+    tab.context["plugin_page"].click_main_sql_mode()
+    tab.context["sql_mode_page"].click_sql_manager()
+
+
+def _build_executor_factory(driver: DriverOnlyOffice, prepare: str):
+    def _factory(tab: TabSession) -> SimpleInteractionLogExecutor:
+        executor = SimpleInteractionLogExecutor(driver=driver)
+        configure_executor(executor)
+        executor.set_prepare_hook(None)
+        if prepare == "sql-manager":
+            executor.add_skip_rule(testId=PREPARED_TEST_IDS)
+        return executor
+
+    return _factory
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Multi-tab load replay: open N editor tabs on one WebDriver session, "
+            "run shared prepare on each and interleave interaction-log steps."
+        )
+    )
+    parser.add_argument(
+        "--log",
+        type=Path,
+        action="append",
+        default=None,
+        help="Interaction log JSONL. Repeat to assign logs to tabs round-robin.",
+    )
+    parser.add_argument("--tabs", type=int, default=2, help="Number of editor tabs.")
+    parser.add_argument(
+        "--prepare",
+        choices=("sql-manager", "plugin", "none"),
+        default="sql-manager",
+        help=(
+            "Shared prepare per tab: plugin button + close, then SQL mode + SQL manager "
+            "(sql-manager), only the plugin (plugin) or nothing (none)."
+        ),
+    )
+    parser.add_argument(
+        "--debugger-address",
+        default="127.0.0.1:9222",
+        help="OnlyOffice remote debugger address.",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("round-robin", "wait-aware"),
+        default="round-robin",
+        help=(
+            "round-robin: one step per tab per round; wait-aware: long steps "
+            "(preview, export, connections, OLAP create) park the tab while others run."
+        ),
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.5,
+        help="wait-aware: seconds between readiness checks of a parked tab.",
+    )
+    parser.add_argument(
+        "--stop-on-error",
+        action="store_true",
+        help="Abort the whole run on the first failing tab.",
+    )
+    args = parser.parse_args(argv)
+
+    logs = args.log or [Path("test_cases/slider_query/interaction-log-1771241377641.jsonl")]
+    missing = [p for p in logs if not p.exists()]
+    if missing:
+        print(f"[multitab] log not found: {missing[0]}")
+        return 2
+    if args.tabs < 1:
+        print("[multitab] --tabs must be >= 1")
+        return 2
+
+    prep_fn = {
+        "sql-manager": _prepare_sql_manager,
+        "plugin": _prepare_plugin,
+        "none": None,
+    }[args.prepare]
+
+    driver = DriverOnlyOffice(debugger_address=args.debugger_address)
+    runner = MultiTabRunner(
+        driver,
+        executor_factory=_build_executor_factory(driver, args.prepare),
+        long_steps_factory=lambda tab: build_long_steps(tab.executor),
+    )
+    exit_code = 0
+    wall_sec = None
+    try:
+        runner.create_tabs(args.tabs, prep_fn=prep_fn)
+        if args.mode == "wait-aware":
+            wall_sec = runner.run_wait_aware(
+                logs,
+                poll_interval=args.poll_interval,
+                stop_on_error=args.stop_on_error,
+            )
+        else:
+            runner.play(logs, stop_on_error=args.stop_on_error)
+    except Exception as exc:
+        print(f"[multitab] failed: {exc}")
+        exit_code = 2
+    finally:
+        for tab in runner.tabs:
+            status = "ok" if tab.error is None else f"failed: {tab.error}"
+            print(f"[multitab] {tab.name} ({tab.handle}): {status}")
+            print(
+                f"[multitab] {tab.name} scheduled={tab.scheduled_sec:.3f}s "
+                f"blocked={tab.blocked_sec:.3f}s"
+            )
+            print(format_summary(tab.timer.summary()))
+            if tab.error is not None:
+                exit_code = 2
+        if wall_sec is not None:
+            print(f"[multitab] wall={wall_sec:.3f}s")
+        try:
+            driver.driver.quit()
+        except Exception:
+            pass
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.driver import DriverOnlyOffice  # noqa: E402
+from src.interaction_log_executor_simple import SimpleInteractionLogExecutor  # noqa: E402
+from src.utils.load_generator import OpenLoopLoadGenerator, latency_summary  # noqa: E402
+from src.utils.multitab import WarmTabPool  # noqa: E402
+from src.utils.visual import baseline_cache_stats  # noqa: E402
+from test.slider_query.run_replay_simple import (  # noqa: E402
+    build_warm_tab_hooks,
+    configure_executor,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Open-loop load: start replay sessions of interaction logs at a fixed "
+            "arrival rate on a pool of warm editor tabs and report latencies "
+            "corrected for coordinated omission."
+        )
+    )
+    parser.add_argument(
+        "--log",
+        type=Path,
+        action="append",
+        default=None,
+        help="Interaction log JSONL. Repeat to rotate logs between sessions.",
+    )
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between session starts.")
+    parser.add_argument("--sessions", type=int, default=6, help="Number of sessions to start.")
+    parser.add_argument("--tabs", type=int, default=3, help="Warm tab pool size (max concurrent sessions).")
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=1.0,
+        help="Scale of recorded think times in the intended step schedule (0 = back-to-back).",
+    )
+    parser.add_argument(
+        "--debugger-address",
+        default="127.0.0.1:9222",
+        help="OnlyOffice remote debugger address.",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=Path("artifacts/open_loop"),
+        help="Where steps.jsonl and summary.json are written.",
+    )
+    args = parser.parse_args(argv)
+
+    logs = args.log or [Path("test_cases/slider_query/interaction-log-1771241377641.jsonl")]
+    missing = [p for p in logs if not p.exists()]
+    if missing:
+        print(f"[open-loop] log not found: {missing[0]}")
+        return 2
+    if args.sessions < 1 or args.tabs < 1 or args.interval < 0:
+        print("[open-loop] --sessions and --tabs must be >= 1, --interval >= 0")
+        return 2
+
+    driver = DriverOnlyOffice(debugger_address=args.debugger_address)
+    hooks_executor = SimpleInteractionLogExecutor(driver=driver)
+    configure_executor(hooks_executor)
+    pool = WarmTabPool(driver, build_warm_tab_hooks(hooks_executor), size=args.tabs)
+
+    def _executor_factory(_handle: str) -> SimpleInteractionLogExecutor:
+        executor = SimpleInteractionLogExecutor(driver=driver)
+        configure_executor(executor)
+        executor.set_prepare_hook(None)
+        return executor
+
+    generator = OpenLoopLoadGenerator(
+        driver,
+        pool,
+        _executor_factory,
+        interval=args.interval,
+        pace=args.pace,
+    )
+    out_dir = (ROOT / args.out_dir / f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}").resolve()
+    exit_code = 0
+    records = []
+    try:
+        records = generator.run(logs, args.sessions)
+    except Exception as exc:
+        print(f"[open-loop] failed: {exc}")
+        exit_code = 2
+    finally:
+        try:
+            pool.close()
+        except Exception:
+            pass
+        steps_path = OpenLoopLoadGenerator.write_records(records, out_dir / "steps.jsonl")
+        summary = {
+            "interval_sec": args.interval,
+            "pace": args.pace,
+            "tabs": args.tabs,
+            "sessions": generator.session_summary(),
+            "latency_ms": latency_summary(records),
+            "tab_pool": pool.stats(),
+            "visual_cache": baseline_cache_stats(),
+        }
+        (out_dir / "summary.json").write_text(
+            json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        for session in summary["sessions"]:
+            print(f"[open-loop] session {session}")
+        for metric, values in summary["latency_ms"].items():
+            print(f"[open-loop] {metric}: {values}")
+        print(f"[open-loop] steps: {steps_path}")
+        try:
+            driver.driver.quit()
+        except Exception:
+            pass
+    if any(s["error"] for s in summary["sessions"]):
+        exit_code = 2
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
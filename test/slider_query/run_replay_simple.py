@@ -1,11 +1,17 @@
 import argparse
+import asyncio
 import os
 import subprocess
 import sys
+from time import monotonic
 from pathlib import Path
 from typing import Any, Callable
 
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
@@ -21,6 +27,7 @@ from src.pages_slider_query.olap_mode_page import OlapModePage  # noqa: E402
 from src.pages_slider_query.plugin_page import PluginPage  # noqa: E402
 from src.pages_slider_query.sql_manager_page import SqlManagerPage  # noqa: E402
 from src.pages_slider_query.sql_mode_page import SqlModePage  # noqa: E402
+from src.utils.multitab import LongStep, WarmTabHooks  # noqa: E402
 
 
 def _page(executor: SimpleInteractionLogExecutor, key: str):
@@ -218,6 +225,34 @@ def build_prepare_hook(executor: SimpleInteractionLogExecutor) -> Callable[[], N
     return _prepare
 
 
+def build_warm_tab_hooks(executor: SimpleInteractionLogExecutor) -> WarmTabHooks:
+    """
+    Тёплая вкладка: ячейка + клик по кнопке плагина без ожидания загрузки;
+    готовность — кнопка SQL-режима в iframe плагина. Подсказка может
+    появиться и после готовности плагина: finish ждёт её до 1 с (как
+    prepare), а при выдаче вкладки она ещё раз закрывается без ожидания.
+    Состояние плагина после кейса не откатывается, поэтому вкладка
+    закрывается (recycle не задан).
+    """
+
+    def _open() -> None:
+        _page(executor, "home_page").open_creation_cell()
+        _page(executor, "editor_page").click_plugin_button()
+
+    def _ready() -> bool:
+        return (
+            executor.driver.find_element_in_frames(*PluginPage.MAIN_SQL_MODE_BUTTON)
+            is not None
+        )
+
+    return WarmTabHooks(
+        open=_open,
+        ready=_ready,
+        finish=lambda: _page(executor, "editor_page").try_click_close(),
+        on_acquire=lambda: _page(executor, "editor_page").click_close_if_shown(),
+    )
+
+
 def build_default_click_handler(
     executor: SimpleInteractionLogExecutor,
 ) -> Callable[[InteractionStep], None]:
@@ -330,6 +365,157 @@ def build_click_routes(
     return exact, prefix
 
 
+async def _async_open_sql_manager(executor) -> None:
+    waits = executor.waits
+    await waits.call(_page(executor, "sql_mode_page").click_sql_manager, False)
+    await waits.until(
+        _page(executor, "sql_manager_page").connections_ready,
+        40,
+        "Не все соединения стали connection-success за 40с",
+    )
+
+
+async def _async_query_preview(executor) -> None:
+    waits = executor.waits
+    sql_manager_page = _page(executor, "sql_manager_page")
+    timeout = int(executor.context.get("preview_timeout", 60))
+    await waits.call(sql_manager_page.click_query_preview, timeout, False)
+    try:
+        await waits.until_not(sql_manager_page.preview_loading, timeout)
+    except TimeoutException:
+        pass
+    await asyncio.sleep(0.5)
+
+
+async def _async_confirm_export(executor) -> None:
+    waits = executor.waits
+    sql_manager_page = _page(executor, "sql_manager_page")
+    timeout = int(executor.context.get("export_timeout", 60))
+    await waits.call(sql_manager_page.confirm_export, timeout, False)
+    for wait_fn in (waits.until, waits.until_not):
+        try:
+            await wait_fn(sql_manager_page.export_loading, timeout)
+        except TimeoutException:
+            pass
+
+
+async def _async_click_success_ok(executor) -> None:
+    waits = executor.waits
+    sql_manager_page = _page(executor, "sql_manager_page")
+    timeout = int(executor.context.get("success_timeout", 30))
+    btn = await waits.wait_find(sql_manager_page, sql_manager_page.SUCCESS_OK_BTN, timeout)
+    await waits.call(sql_manager_page._js_click, btn)
+
+
+async def _async_toolbar_create(executor, timeout: int = 30) -> None:
+    waits = executor.waits
+    olap_mode_page = _page(executor, "olap_mode_page")
+    await waits.call(olap_mode_page.click_toolbar_create, timeout, False)
+    try:
+        await waits.until(olap_mode_page.toolbar_create_disabled, min(3, timeout))
+    except TimeoutException:
+        pass
+    ready = await waits.wait_locator(
+        olap_mode_page, olap_mode_page.PIVOT_TOOLBAR_CREATE_BUTTON, timeout
+    )
+    if not ready:
+        raise TimeoutException("olap-pivot-toolbar-create did not re-enable after click")
+
+
+def build_async_routes(executor) -> tuple[dict, dict, dict]:
+    """
+    Async-варианты маршрутов с долгими ожиданиями для
+    src.interaction_log_executor_async: пока вкладка ждёт, другие работают.
+    Остальные шаги выполняются синхронными маршрутами этого профиля.
+    """
+    exact = {
+        "sql-home-open-sql-manager": lambda _step: _async_open_sql_manager(executor),
+        "sql-manager-export-confirm": lambda _step: _async_confirm_export(executor),
+        "messagebox-button-OK-0": lambda _step: _async_click_success_ok(executor),
+        "olap-pivot-toolbar-create": lambda _step: _async_toolbar_create(executor),
+    }
+    prefix = {
+        "sql-manager-query-preview-": lambda _step: _async_query_preview(executor),
+    }
+    step_routes = {
+        ("click", "preview"): lambda _step: _async_query_preview(executor),
+    }
+    return exact, prefix, step_routes
+
+
+def _two_phase_probe(
+    first: Callable[[], Any],
+    then: Callable[[], Any],
+    first_timeout: float,
+) -> Callable[[], bool]:
+    """
+    probe для LongStep: сначала ждём first() (не дольше first_timeout),
+    затем готовность по then().
+    """
+    deadline = monotonic() + first_timeout
+    state = {"first_done": False}
+
+    def _probe() -> bool:
+        if not state["first_done"]:
+            if first() or monotonic() >= deadline:
+                state["first_done"] = True
+            return False
+        return bool(then())
+
+    return _probe
+
+
+def build_long_steps(executor: SimpleInteractionLogExecutor):
+    """
+    Долгие шаги для MultiTabRunner.run_wait_aware: dispatch без ожидания +
+    дешёвая проверка готовности, пока вкладка припаркована.
+    """
+    sql_mode_page = _page(executor, "sql_mode_page")
+    sql_manager_page = _page(executor, "sql_manager_page")
+    olap_mode_page = _page(executor, "olap_mode_page")
+    preview_timeout = int(executor.context.get("preview_timeout", 60))
+    export_timeout = int(executor.context.get("export_timeout", 60))
+    export_appear_timeout = float(executor.context.get("export_appear_timeout", 5))
+
+    def _open_sql_manager(_step: InteractionStep):
+        sql_mode_page.click_sql_manager(wait=False)
+        return sql_manager_page.connections_ready
+
+    def _preview(_step: InteractionStep):
+        sql_manager_page.click_query_preview(preview_timeout, wait=False)
+        return lambda: not sql_manager_page.preview_loading()
+
+    def _confirm_export(_step: InteractionStep):
+        sql_manager_page.confirm_export(export_timeout, wait=False)
+        return _two_phase_probe(
+            sql_manager_page.export_loading,
+            lambda: not sql_manager_page.export_loading(),
+            export_appear_timeout,
+        )
+
+    def _toolbar_create(_step: InteractionStep):
+        olap_mode_page.click_toolbar_create(wait=False)
+        return _two_phase_probe(
+            olap_mode_page.toolbar_create_disabled,
+            lambda: olap_mode_page._locator_ready(olap_mode_page.PIVOT_TOOLBAR_CREATE_BUTTON),
+            3,
+        )
+
+    preview = LongStep(_preview, timeout=preview_timeout, raise_on_timeout=False, settle_sec=0.5)
+    exact = {
+        "sql-home-open-sql-manager": LongStep(_open_sql_manager, timeout=40),
+        "sql-manager-export-confirm": LongStep(
+            _confirm_export,
+            timeout=export_appear_timeout + export_timeout,
+            raise_on_timeout=False,
+        ),
+        "olap-pivot-toolbar-create": LongStep(_toolbar_create, timeout=33),
+    }
+    prefix = {"sql-manager-query-preview-": preview}
+    step_routes = {("click", "preview"): preview}
+    return exact, prefix, step_routes
+
+
 def build_skip_rules() -> list[dict[str, Any]]:
     return [
         {
@@ -360,6 +546,66 @@ def build_skip_rules() -> list[dict[str, Any]]:
     ]
 
 
+def _card_state(sql_manager_page: SqlManagerPage) -> dict[str, Any]:
+    card = sql_manager_page.card
+    if card is None:
+        return {"card_query_name": None, "card_expanded": None}
+    try:
+        return {
+            "card_query_name": card.get_attribute("data-query-name"),
+            "card_expanded": "expanded" in (card.get_attribute("class") or ""),
+        }
+    except WebDriverException:
+        return {"card_query_name": None, "card_expanded": None}
+
+
+def build_checkpoint_hooks(
+    executor: SimpleInteractionLogExecutor,
+) -> tuple[
+    Callable[[], dict[str, Any]],
+    Callable[[dict[str, Any]], None],
+    Callable[[], dict[str, Any]],
+]:
+    """
+    Состояние для checkpoint/resume: имя запроса, активная карточка
+    SqlManagerPage и путь к текущему фрейму драйвера. Отпечаток UI — пробы
+    DOM только в текущем фрейме (без обхода iframe): есть ли контейнер
+    запросов и кнопка SQL-режима, раскрыта ли активная карточка. После
+    restore драйвер стоит в том же фрейме, что и при записи, поэтому
+    отпечаток сравнивает реальный DOM, а не восстановленные значения.
+    """
+
+    def _capture() -> dict[str, Any]:
+        sql_manager_page = _page(executor, "sql_manager_page")
+        state = {
+            "query_name": sql_manager_page.query_name,
+            "frame_path": executor.driver.frame_path,
+        }
+        state.update(_card_state(sql_manager_page))
+        return state
+
+    def _restore(state: dict[str, Any]) -> None:
+        sql_manager_page = _page(executor, "sql_manager_page")
+        sql_manager_page.query_name = state.get("query_name")
+        card_name = state.get("card_query_name")
+        sql_manager_page.card = (
+            sql_manager_page.find_query_card(card_name) if card_name else None
+        )
+        executor.driver.switch_to_frame_path(state.get("frame_path") or [])
+
+    def _fingerprint() -> dict[str, Any]:
+        sql_manager_page = _page(executor, "sql_manager_page")
+        driver = executor.driver.driver
+        fingerprint = {
+            "queries_container": bool(driver.find_elements(*SqlManagerPage.QUERIES_CONTAINER)),
+            "sql_mode_button": bool(driver.find_elements(*PluginPage.MAIN_SQL_MODE_BUTTON)),
+        }
+        fingerprint.update(_card_state(sql_manager_page))
+        return fingerprint
+
+    return _capture, _restore, _fingerprint
+
+
 def configure_executor(executor: SimpleInteractionLogExecutor) -> None:
     executor.context.update(build_context(executor))
     exact, prefix = build_click_routes(executor)
@@ -368,6 +614,7 @@ def configure_executor(executor: SimpleInteractionLogExecutor) -> None:
     executor.set_skip_rules(build_skip_rules())
     executor.set_default_click_handler(build_default_click_handler(executor))
     executor.set_prepare_hook(build_prepare_hook(executor))
+    executor.set_checkpoint_hooks(*build_checkpoint_hooks(executor))
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -393,16 +640,73 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Do not auto-open cell and plugin home before replay.",
     )
+    parser.add_argument(
+        "--lookahead",
+        action="store_true",
+        help="Pre-resolve next step locator during long settle waits.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint JSONL written after each passed step (sync mode).",
+    )
+    parser.add_argument(
+        "--resume-from",
+        type=int,
+        default=None,
+        help="Log line to resume from using --checkpoint (sync mode).",
+    )
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=None,
+        help="Replay recorded think times scaled by FACTOR (1, 0.1, 0).",
+    )
+    parser.add_argument(
+        "--close-tabs",
+        action="store_true",
+        help="Close editor windows opened by this replay at the end.",
+    )
+    parser.add_argument(
+        "--max-tabs",
+        type=int,
+        default=None,
+        help="Keep at most N editor tabs open after the replay (oldest closed first).",
+    )
+    parser.add_argument(
+        "--step-results",
+        type=Path,
+        default=None,
+        help="Per-step results JSONL (route, duration, outcome; sync mode).",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Replay via src.interaction_log_executor_async (awaitable waits).",
+    )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="With --async: number of tabs replaying the log concurrently.",
+    )
     args = parser.parse_args(argv)
 
     if not args.log.exists():
         print(f"[replay-profile] log not found: {args.log}")
         return 2
 
+    module = (
+        "src.interaction_log_executor_async"
+        if args.use_async
+        else "src.interaction_log_executor_simple"
+    )
     cmd = [
         sys.executable,
         "-m",
-        "src.interaction_log_executor_simple",
+        module,
         "--log",
         str(args.log),
         "--debugger-address",
@@ -410,6 +714,23 @@ def main(argv: list[str] | None = None) -> int:
     ]
     if args.no_prepare:
         cmd.append("--no-prepare")
+    if args.use_async:
+        cmd.extend(["--tabs", str(args.tabs)])
+    else:
+        if args.lookahead:
+            cmd.append("--lookahead")
+        if args.checkpoint is not None:
+            cmd.extend(["--checkpoint", str(args.checkpoint)])
+        if args.resume_from is not None:
+            cmd.extend(["--resume-from", str(args.resume_from)])
+        if args.pace is not None:
+            cmd.extend(["--pace", str(args.pace)])
+        if args.close_tabs:
+            cmd.append("--close-tabs")
+        if args.max_tabs is not None:
+            cmd.extend(["--max-tabs", str(args.max_tabs)])
+        if args.step_results is not None:
+            cmd.extend(["--step-results", str(args.step_results)])
 
     env = os.environ.copy()
     env["OO_SIMPLE_ROUTES_MODULE"] = "test.slider_query.run_replay_simple"
@@ -419,6 +740,6 @@ def main(argv: list[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
-
-
+    raise SystemExit(main())
+
+
@@ -0,0 +1,70 @@
+"""
+Routes profile for headless-Chromium stand-ins (utils/chromium_standins.py).
+
+Lets the batch runner and the worker pool run on Linux without OnlyOffice:
+prepare opens test_cases/standin/fixture.html in a new tab, every click is
+resolved by testId and waits until the button is enabled.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.interaction_log_executor_simple import (  # noqa: E402
+    InteractionStep,
+    SimpleInteractionLogExecutor,
+)
+from src.pages_common.base_page import BasePage  # noqa: E402
+from src.utils.multitab import WarmTabHooks  # noqa: E402
+
+FIXTURE_URL = (ROOT / "test_cases" / "standin" / "fixture.html").as_uri()
+
+
+def build_context(executor: SimpleInteractionLogExecutor) -> dict[str, Any]:
+    return {"page": BasePage(executor.driver), "fixture_url": FIXTURE_URL}
+
+
+def build_prepare_hook(executor: SimpleInteractionLogExecutor) -> Callable[[], None]:
+    def _prepare() -> None:
+        driver = executor.driver
+        driver.driver.switch_to.new_window("tab")
+        driver.set_window_handle(driver.get_current_window_handle())
+        driver.driver.get(executor.context["fixture_url"])
+
+    return _prepare
+
+
+def build_warm_tab_hooks(executor: SimpleInteractionLogExecutor) -> WarmTabHooks:
+    status = (By.CSS_SELECTOR, "[data-testid='standin-status']")
+    return WarmTabHooks(
+        open=build_prepare_hook(executor),
+        ready=lambda: executor.driver.find_element_in_frames(*status) is not None,
+    )
+
+
+def _click(executor: SimpleInteractionLogExecutor, step: InteractionStep) -> None:
+    locator = executor._locator_from_step(step)
+    if not locator:
+        raise NoSuchElementException(f"Cannot build click locator for line={step.index}")
+    page: BasePage = executor.context["page"]
+    element = page._wait_locator(locator, timeout=5)
+    if element is None:
+        raise NoSuchElementException(f"Element not ready: {locator} line={step.index}")
+    page._click(element)
+
+
+def build_default_click_handler(
+    executor: SimpleInteractionLogExecutor,
+) -> Callable[[InteractionStep], None]:
+    return lambda step: _click(executor, step)
+
+
+def build_skip_rules() -> list[dict[str, Any]]:
+    return []
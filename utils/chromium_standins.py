@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BROWSER_CANDIDATES = (
+    "chromium",
+    "chromium-browser",
+    "google-chrome",
+    "google-chrome-stable",
+)
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _default_fixture() -> Path:
+    return _repo_root() / "test_cases" / "standin" / "fixture.html"
+
+
+def _find_browser(explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    for name in BROWSER_CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError(
+        f"No Chromium binary found ({', '.join(BROWSER_CANDIDATES)}); pass --browser"
+    )
+
+
+def _chromedriver_hint() -> str | None:
+    """
+    src/driver.py falls back to chromedriver-win64/chromedriver.exe, which does
+    not exist on Linux: suggest CHROMEDRIVER_PATH unless it is already set.
+    """
+    if os.getenv("CHROMEDRIVER_PATH"):
+        return None
+    chromedriver = shutil.which("chromedriver")
+    if chromedriver:
+        return f"export CHROMEDRIVER_PATH={chromedriver}"
+    return "CHROMEDRIVER_PATH is not set and chromedriver is not on PATH: install one matching the browser"
+
+
+def _wait_devtools(port: int, timeout: float) -> dict:
+    url = f"http://127.0.0.1:{port}/json/version"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"DevTools on port {port} not ready in {timeout}s")
+            time.sleep(0.2)
+
+
+def start_standins(
+    count: int,
+    base_port: int,
+    *,
+    browser: str,
+    fixture: Path,
+    headless: bool = True,
+) -> list[tuple[subprocess.Popen, Path]]:
+    """Starts count browsers on base_port.. with the fixture page in the first tab."""
+    started: list[tuple[subprocess.Popen, Path]] = []
+    for offset in range(count):
+        port = base_port + offset
+        profile_dir = Path(tempfile.mkdtemp(prefix=f"standin-{port}-"))
+        cmd = [
+            browser,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--no-sandbox",
+            "--disable-gpu",
+            "--window-size=1280,900",
+        ]
+        if headless:
+            cmd.append("--headless=new")
+        cmd.append(fixture.as_uri())
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        started.append((proc, profile_dir))
+    return started
+
+
+def stop_standins(started: list[tuple[subprocess.Popen, Path]]) -> None:
+    for proc, _ in started:
+        if proc.poll() is None:
+            proc.terminate()
+    for proc, profile_dir in started:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Start local headless-Chromium stand-ins for OnlyOffice (one DevTools "
+            "endpoint per instance) serving test_cases/standin/fixture.html. "
+            "Runs until Ctrl+C."
+        )
+    )
+    parser.add_argument("--count", type=int, default=4, help="Number of instances.")
+    parser.add_argument("--base-port", type=int, default=9222, help="First debugging port.")
+    parser.add_argument("--browser", default=None, help="Chromium binary (auto-detected).")
+    parser.add_argument("--fixture", type=Path, default=_default_fixture(), help="Page to open.")
+    parser.add_argument("--headed", action="store_true", help="Show browser windows.")
+    parser.add_argument(
+        "--startup-timeout",
+        type=float,
+        default=20.0,
+        help="Seconds to wait for each DevTools endpoint.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.count < 1:
+        print("[standins] --count must be >= 1")
+        return 2
+    try:
+        browser = _find_browser(args.browser)
+    except FileNotFoundError as exc:
+        print(f"[standins] {exc}")
+        return 2
+
+    started = start_standins(
+        args.count,
+        args.base_port,
+        browser=browser,
+        fixture=args.fixture.resolve(),
+        headless=not args.headed,
+    )
+    try:
+        addresses = []
+        for offset in range(args.count):
+            port = args.base_port + offset
+            info = _wait_devtools(port, args.startup_timeout)
+            addresses.append(f"127.0.0.1:{port}")
+            print(f"[standins] 127.0.0.1:{port} {info.get('Browser', '')}")
+        flags = " ".join(f"--debugger-address {a}" for a in addresses)
+        hint = _chromedriver_hint()
+        if hint:
+            print(f"[standins] {hint}")
+        print(
+            "[standins] run: python test/slider_query/run_all_test_cases.py "
+            f"--cases-dir test_cases/standin --routes-module test.standin.run_replay_standin {flags}"
+        )
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        while all(proc.poll() is None for proc, _ in started):
+            time.sleep(1)
+        print("[standins] an instance exited, stopping")
+        return 2
+    except KeyboardInterrupt:
+        return 0
+    except TimeoutError as exc:
+        print(f"[standins] {exc}")
+        return 2
+    finally:
+        stop_standins(started)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+"""
+Per-step logging overhead on the replay thread: synchronous handlers vs the
+queued mode of setup_logging (LOG_QUEUE / queued=True).
+
+Each mode runs in its own process (setup_logging configures once per
+process) with the console handler writing into a pipe that this script
+drains, like the batch runner does with --tail. Between steps the replay
+thread normally waits on WebDriver HTTP calls; --step-gap-ms models that
+wait (GIL released), during which the listener thread does its I/O.
+
+    python utils/logging_bench.py --steps 5000 --calls-per-step 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter, sleep
+
+from replay_cases_report import _print_table
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+if str(_repo_root()) not in sys.path:
+    sys.path.insert(0, str(_repo_root()))
+
+MODES = ("sync", "queued")
+
+
+def _child(args: argparse.Namespace) -> int:
+    from src.utils.logging_utils import get_logger, setup_logging, shutdown_logging
+
+    setup_logging(log_dir=args.log_dir, install_excepthook=False, queued=args.child == "queued")
+    logger = get_logger("interaction_log_executor_simple")
+    step_us: list[float] = []
+    started = perf_counter()
+    for step in range(args.steps):
+        t0 = perf_counter()
+        for call in range(args.calls_per_step):
+            # Shape of the executor/page-object messages: a few %-args per line.
+            logger.info(
+                "Step %s/%s: event=%s action=%s testId=%s call=%s",
+                step,
+                args.steps,
+                "click",
+                "button",
+                "slider-query-run",
+                call,
+            )
+        step_us.append((perf_counter() - t0) * 1e6)
+        if args.step_gap_ms:
+            sleep(args.step_gap_ms / 1000)
+    logged_sec = perf_counter() - started
+    t0 = perf_counter()
+    shutdown_logging()
+    drain_sec = perf_counter() - t0
+
+    step_us.sort()
+    result = {
+        "mode": args.child,
+        "steps": args.steps,
+        "calls_per_step": args.calls_per_step,
+        "step_us_p50": statistics.median(step_us),
+        "step_us_p99": step_us[max(0, int(len(step_us) * 0.99) - 1)],
+        "step_us_max": step_us[-1],
+        "step_us_mean": statistics.fmean(step_us),
+        "logged_sec": logged_sec,
+        "drain_sec": drain_sec,
+    }
+    Path(args.result).write_text(json.dumps(result), encoding="utf-8")
+    return 0
+
+
+def _run_mode(mode: str, args: argparse.Namespace, work_dir: Path) -> dict[str, float]:
+    result_path = work_dir / f"{mode}.json"
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--child",
+        mode,
+        "--steps",
+        str(args.steps),
+        "--calls-per-step",
+        str(args.calls_per_step),
+        "--step-gap-ms",
+        str(args.step_gap_ms),
+        "--log-dir",
+        str(work_dir / mode),
+        "--result",
+        str(result_path),
+    ]
+    env = os.environ.copy()
+    env.setdefault("PYTHONIOENCODING", "utf-8")
+    proc = subprocess.Popen(cmd, cwd=str(_repo_root()), env=env, stdout=subprocess.PIPE)
+    assert proc.stdout is not None
+    for _ in iter(lambda: proc.stdout.read(1 << 16), b""):
+        pass
+    if proc.wait() != 0:
+        raise RuntimeError(f"{mode} run failed with exit code {proc.returncode}")
+    return json.loads(result_path.read_text(encoding="utf-8"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-step logging overhead: synchronous vs queued handlers."
+    )
+    parser.add_argument("--steps", type=int, default=5000, help="Replay steps to simulate.")
+    parser.add_argument(
+        "--calls-per-step",
+        type=int,
+        default=6,
+        help="INFO calls per step (executor + page object lines).",
+    )
+    parser.add_argument(
+        "--step-gap-ms",
+        type=float,
+        default=1.0,
+        help="Idle time between steps (WebDriver round-trip), not counted; 0 = tight loop.",
+    )
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--log-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child(args)
+
+    with tempfile.TemporaryDirectory(prefix="logging-bench-") as tmp:
+        results = [_run_mode(mode, args, Path(tmp)) for mode in MODES]
+
+    print(
+        f"[logging-bench] steps={args.steps} calls_per_step={args.calls_per_step} "
+        f"step_gap_ms={args.step_gap_ms}"
+    )
+    _print_table(
+        ["mode", "p50 us/step", "p99 us/step", "max us/step", "mean us/step", "logged s", "drain s"],
+        [
+            [
+                r["mode"],
+                f"{r['step_us_p50']:.1f}",
+                f"{r['step_us_p99']:.1f}",
+                f"{r['step_us_max']:.1f}",
+                f"{r['step_us_mean']:.1f}",
+                f"{r['logged_sec']:.3f}",
+                f"{r['drain_sec']:.3f}",
+            ]
+            for r in results
+        ],
+    )
+    sync, queued = results
+    if queued["step_us_mean"]:
+        print(
+            f"[logging-bench] replay-thread overhead: {sync['step_us_mean'] / queued['step_us_mean']:.1f}x "
+            "lower with the queue"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sqlite3
 import sys
 from pathlib import Path
 from typing import Any
@@ -11,21 +12,39 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+if str(_repo_root()) not in sys.path:
+    sys.path.insert(0, str(_repo_root()))
+
+from src.utils.results_store import DEFAULT_DB_PATH, ResultsStore, _percentile  # noqa: E402
+from src.utils.trend import TrendRow, trend_rows  # noqa: E402
+
+
 def _default_replay_root() -> Path:
     return _repo_root() / "artifacts" / "replay_cases"
 
 
 def _find_latest_batch_dir(replay_root: Path) -> Path:
-    candidates = [
-        p
-        for p in replay_root.glob("batch-*")
-        if p.is_dir() and (p / "summary.json").exists()
-    ]
-    if not candidates:
-        raise FileNotFoundError(
-            f"No batch-* folders with summary.json in: {replay_root}"
-        )
-    return max(candidates, key=lambda p: p.stat().st_mtime)
+    # batch-YYYYmmdd-HHMMSS names sort chronologically: no stat of every folder.
+    names = sorted((p.name for p in replay_root.glob("batch-*")), reverse=True)
+    # The db index skips the summary.json probes of folders left by killed runs,
+    # but a newer batch that was never imported (failed import, another db) wins.
+    latest = None
+    if DEFAULT_DB_PATH.exists():
+        try:
+            with ResultsStore(DEFAULT_DB_PATH, read_only=True) as store:
+                latest = store.latest_batch(under=replay_root)
+        except sqlite3.Error:
+            latest = None
+    for name in names:
+        if latest is not None and name <= latest.name:
+            return latest
+        if (replay_root / name / "summary.json").exists():
+            return replay_root / name
+    if latest is not None:
+        return latest
+    raise FileNotFoundError(
+        f"No batch-* folders with summary.json in: {replay_root}"
+    )
 
 
 def _resolve_summary_path(target: str | None) -> Path:
@@ -110,7 +129,8 @@ def _print_report(summary: dict[str, Any], summary_path: Path) -> None:
         "Totals: "
         f"total={summary.get('cases_total', '-')}, "
         f"executed={summary.get('cases_executed', '-')}, "
-        f"failures={summary.get('failures', '-')}"
+        f"failures={summary.get('failures', '-')}, "
+        f"skipped={summary.get('cases_skipped', 0)}"
     )
     print()
 
@@ -124,7 +144,11 @@ def _print_report(summary: dict[str, Any], summary_path: Path) -> None:
         rows=rows,
     )
 
-    failed = [r for r in results if isinstance(r, dict) and r.get("status") != "ok"]
+    failed = [
+        r
+        for r in results
+        if isinstance(r, dict) and r.get("status") not in ("ok", "skipped")
+    ]
     if failed:
         print()
         print("Failed cases:")
@@ -136,6 +160,154 @@ def _print_report(summary: dict[str, Any], summary_path: Path) -> None:
             )
 
 
+def _iter_events(run_root: Path):
+    """Records of every run-*.events.jsonl under the batch (case dirs and pool worker dirs)."""
+    for path in sorted(run_root.rglob("run-*.events.jsonl")):
+        with path.open("r", encoding="utf-8") as stream:
+            for line in stream:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def _print_events(run_root: Path) -> None:
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for record in _iter_events(run_root):
+        kind = record.get("type")
+        if kind == "page_method":
+            key = (kind, str(record.get("method")))
+        elif kind == "step":
+            key = (kind, str(record.get("route")))
+        else:
+            continue
+        groups.setdefault(key, []).append(record)
+    print()
+    if not groups:
+        print(f"No event logs (LOG_EVENTS=1) under {run_root}.")
+        return
+    for kind, title in (("step", "route"), ("page_method", "page method")):
+        rows = []
+        for (group_kind, name), records in sorted(groups.items()):
+            if group_kind != kind:
+                continue
+            durations = [r["duration_sec"] for r in records if r.get("duration_sec") is not None]
+            commands = [r.get("commands") or 0 for r in records]
+            rows.append(
+                [
+                    name,
+                    str(len(records)),
+                    str(sum(1 for r in records if r.get("status") != "ok")),
+                    _fmt_duration(_percentile(durations, 50)),
+                    _fmt_duration(_percentile(durations, 95)),
+                    f"{sum(commands) / len(commands):.1f}",
+                ]
+            )
+        if rows:
+            print(f"Events by {title}:")
+            _print_table([title, "n", "failed", "p50 sec", "p95 sec", "cmds/call"], rows)
+            print()
+
+
+def _fmt_ratio(value: Any) -> str:
+    return f"x{value:.2f}" if isinstance(value, float) else "-"
+
+
+def _fmt_p(value: Any) -> str:
+    return f"{value:.2g}" if isinstance(value, float) else "-"
+
+
+def _trend_table(title: str, rows: list[TrendRow], key_headers: list[str]) -> None:
+    print(title)
+    _print_table(
+        headers=[
+            *key_headers,
+            "base n",
+            "base p50",
+            "base p95",
+            "new n",
+            "new p50",
+            "new p95",
+            "ratio",
+            "p",
+            "flag",
+        ],
+        rows=[
+            [
+                *(str(k) for k in r.key),
+                str(r.baseline_n),
+                _fmt_duration(r.baseline_p50),
+                _fmt_duration(r.baseline_p95),
+                str(r.recent_n),
+                _fmt_duration(r.recent_p50),
+                _fmt_duration(r.recent_p95),
+                _fmt_ratio(r.ratio),
+                _fmt_p(r.p_value),
+                "REGRESSION" if r.regression else "",
+            ]
+            for r in rows
+        ],
+    )
+    print()
+
+
+def _open_trend_store(args: argparse.Namespace) -> ResultsStore:
+    source = args.source
+    if source == "auto":
+        source = "db" if args.db.exists() else "scan"
+    if source == "db":
+        if not args.db.exists():
+            raise FileNotFoundError(f"Results db not found: {args.db}")
+        return ResultsStore(args.db, read_only=True)
+    replay_root = Path(args.target).expanduser() if args.target else _default_replay_root()
+    if not replay_root.is_absolute():
+        replay_root = (_repo_root() / replay_root).resolve()
+    store = ResultsStore(":memory:")
+    store.import_all(replay_root)
+    return store
+
+
+def _print_trend(args: argparse.Namespace) -> int:
+    options = {
+        "recent": args.recent,
+        "baseline": args.baseline,
+        "alpha": args.alpha,
+        "min_slowdown": args.min_slowdown,
+        "min_samples": args.min_samples,
+    }
+    window = args.recent + args.baseline
+    with _open_trend_store(args) as store:
+        batches = len(store.recent_batch_ids(window))
+        cases = trend_rows(store.duration_samples("case", last_batches=window), **options)
+        steps = trend_rows(store.duration_samples("step", last_batches=window), **options)
+
+    print(
+        f"Trend: last {args.recent} batch(es) vs previous {args.baseline} "
+        f"({batches} available), one-sided Mann-Whitney, alpha={args.alpha} "
+        f"(Holm over all cases and over all step keys), min slowdown {args.min_slowdown:.0%}"
+    )
+    print()
+    if not cases and not steps:
+        print("No passed cases in the window.")
+        return 0
+    if cases:
+        _trend_table("Cases:", cases, ["case"])
+    shown = steps if args.all_steps else [r for r in steps if r.regression]
+    if shown:
+        _trend_table("Steps:", shown, ["case", "line", "route"])
+    print(
+        f"Steps tested: {sum(1 for r in steps if r.p_value is not None)} of {len(steps)}"
+        + ("" if args.all_steps else " (only regressions shown, --all-steps for all)")
+    )
+
+    regressions = [r for r in cases + steps if r.regression]
+    if regressions:
+        print(f"Regressions: {len(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description=(
@@ -149,18 +321,71 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help=(
             "Path to summary.json, batch directory, or replay_cases root. "
-            "Default: latest artifacts/replay_cases batch."
+            "Default: latest artifacts/replay_cases batch. "
+            "With --trend --source scan: replay_cases root to scan."
+        ),
+    )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Also aggregate the JSONL event logs of the batch by route and page method.",
+    )
+    parser.add_argument(
+        "--trend",
+        action="store_true",
+        help=(
+            "Compare case/step durations of the recent batches with a baseline window; "
+            "exit code 1 on a significant slowdown."
         ),
     )
+    parser.add_argument(
+        "--source",
+        choices=["auto", "db", "scan"],
+        default="auto",
+        help="Trend data: results db (--db), a scan of batch-* folders, or db if it exists.",
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="Results db file.")
+    parser.add_argument("--recent", type=int, default=5, help="Batches in the compared window.")
+    parser.add_argument("--baseline", type=int, default=20, help="Batches in the baseline window.")
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help=(
+            "Family-wise significance level: Holm correction over all cases and, "
+            "separately, over all step keys of the window."
+        ),
+    )
+    parser.add_argument(
+        "--min-slowdown",
+        type=float,
+        default=0.10,
+        help="Minimal median slowdown to flag (0.10 = 10%%).",
+    )
+    parser.add_argument(
+        "--min-samples",
+        type=int,
+        default=3,
+        help="Minimal samples in each window to test a case/step.",
+    )
+    parser.add_argument(
+        "--all-steps",
+        action="store_true",
+        help="Print every step, not only regressions.",
+    )
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
     args = _build_parser().parse_args(argv)
     try:
+        if args.trend:
+            return _print_trend(args)
         summary_path = _resolve_summary_path(args.target)
         summary = _load_summary(summary_path)
         _print_report(summary, summary_path)
+        if args.events:
+            _print_events(summary_path.parent)
         return 0
     except Exception as exc:
         print(f"[replay-cases-report] failed: {exc}", file=sys.stderr)
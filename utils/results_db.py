@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from replay_cases_report import _print_table
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+if str(_repo_root()) not in sys.path:
+    sys.path.insert(0, str(_repo_root()))
+
+from src.utils.results_store import DEFAULT_DB_PATH, GROUP_COLUMNS, ResultsStore  # noqa: E402
+
+
+def _fmt(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return "-" if value is None else str(value)
+
+
+def _cmd_import(store: ResultsStore, args: argparse.Namespace) -> int:
+    targets = args.paths or [_repo_root() / "artifacts" / "replay_cases"]
+    imported: list[Path] = []
+    for target in targets:
+        target = Path(target)
+        if (target / "summary.json").is_file():
+            store.import_batch(target)
+            imported.append(target)
+        else:
+            imported.extend(store.import_all(target))
+    for path in imported:
+        print(f"[results-db] imported: {path}")
+    print(f"[results-db] batches imported: {len(imported)}")
+    return 0
+
+
+def _cmd_percentiles(store: ResultsStore, args: argparse.Namespace) -> int:
+    rows = store.step_percentiles(
+        args.match,
+        group_by=args.group_by,
+        last_batches=args.last,
+        q=args.q,
+        status=None if args.all_statuses else "ok",
+    )
+    if not rows:
+        print("No matching steps.")
+        return 0
+    pq = f"p{args.q:g}"
+    _print_table(
+        headers=[args.group_by, "count", "p50 sec", f"{pq} sec", "max sec"],
+        rows=[
+            [_fmt(r[args.group_by]), str(r["count"]), _fmt(r["p50"]), _fmt(r[pq]), _fmt(r["max"])]
+            for r in rows
+        ],
+    )
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="SQLite history of replay batches, cases and per-step results."
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help="Database file (default artifacts/results.sqlite).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Import batch-*/summary.json (+ steps.jsonl) into the db.")
+    imp.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Batch directories or replay_cases roots. Default: artifacts/replay_cases.",
+    )
+
+    pct = sub.add_parser("percentiles", help="Step duration percentiles per group.")
+    pct.add_argument(
+        "--match",
+        default=None,
+        help="Substring of the step route or testId, e.g. preview.",
+    )
+    pct.add_argument(
+        "--group-by",
+        choices=sorted(GROUP_COLUMNS),
+        default="connection",
+        help="Grouping column.",
+    )
+    pct.add_argument("--last", type=int, default=30, help="Only the N most recent batches.")
+    pct.add_argument("--q", type=float, default=95.0, help="Percentile to report.")
+    pct.add_argument(
+        "--all-statuses",
+        action="store_true",
+        help="Include failed steps (default: passed steps only).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        with ResultsStore(args.db) as store:
+            if args.command == "import":
+                return _cmd_import(store, args)
+            return _cmd_percentiles(store, args)
+    except Exception as exc:
+        print(f"[results-db] failed: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
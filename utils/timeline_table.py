@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+if str(_repo_root()) not in sys.path:
+    sys.path.insert(0, str(_repo_root()))
+
+from src.utils.results_store import DEFAULT_DB_PATH  # noqa: E402
+from src.utils.timeline import (  # noqa: E402
+    StepStream,
+    TimelineBuilder,
+    batch_case_streams,
+    executor_step_stream,
+    open_loop_step_stream,
+)
+
+
+def _streams(args: argparse.Namespace) -> list[StepStream]:
+    streams: list[StepStream] = []
+    for batch in args.batch or []:
+        streams.extend(batch_case_streams(batch))
+    for raw in args.steps or []:
+        # PATH or NAME=PATH (column name).
+        name, sep, path = raw.partition("=")
+        streams.append(executor_step_stream(path, name) if sep else executor_step_stream(raw))
+    for path in args.open_loop or []:
+        streams.append(open_loop_step_stream(path))
+    return streams
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Merge per-tab step streams by time into an aligned table (one column per "
+            "tab/log, one row per time slot) stored in SQLite, and export it to CSV/HTML."
+        )
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        action="append",
+        help="Batch directory: one column per case (<case_dir>/steps.jsonl).",
+    )
+    parser.add_argument(
+        "--steps",
+        action="append",
+        help="Executor steps.jsonl (--step-results), optionally NAME=PATH. Repeatable.",
+    )
+    parser.add_argument(
+        "--open-loop",
+        type=Path,
+        action="append",
+        help="steps.jsonl of run_open_loop_load.py / run_load_profile.py: one column per session.",
+    )
+    parser.add_argument("--name", default=None, help="Timeline name (default: first source).")
+    parser.add_argument(
+        "--slot",
+        type=float,
+        default=0.0,
+        help="Row slot in seconds; 0 = a row per distinct timestamp.",
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="SQLite file.")
+    parser.add_argument("--csv", type=Path, default=None, help="Write the table as CSV.")
+    parser.add_argument("--html", type=Path, default=None, help="Write the table as HTML.")
+    parser.add_argument(
+        "--html-limit",
+        type=int,
+        default=None,
+        help="Only the first N rows in the HTML (CSV is always complete).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    streams = _streams(args)
+    if not streams:
+        parser.error("pass at least one --batch, --steps or --open-loop source")
+    name = args.name or Path(streams[0].source).parent.name
+    try:
+        with TimelineBuilder(args.db) as builder:
+            timeline_id = builder.build(name, streams, slot_sec=args.slot)
+            info = builder.info(timeline_id)
+            print(
+                f"[timeline] id={timeline_id} name={name} "
+                f"columns={len(builder.column_names(timeline_id))} rows={info['rows']} "
+                f"events={info['events']} db={args.db}"
+            )
+            if args.csv:
+                print(f"[timeline] csv: {builder.export_csv(timeline_id, args.csv)}")
+            if args.html:
+                path = builder.export_html(timeline_id, args.html, limit=args.html_limit)
+                print(f"[timeline] html: {path}")
+    except Exception as exc:
+        print(f"[timeline] failed: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+"""
+Sanity check of src/utils/trend.py with the default --trend settings.
+
+A synthetic history of 25 batches with noisy step durations, where one step
+is slower in every one of the last 5 batches than in any of the previous 20
+(fully separated slowdown). The check passes if that step is flagged by
+trend_rows with the defaults of replay_cases_report.py --trend and no other
+step is. Two layouts: 125 step keys spread over 25 cases, and 125 step keys
+in a single case. A third run repeats the 25 x 5 layout without any
+slowdown and min slowdown 0 over --null-runs seeds: the share of runs with
+any flag (false alarm of a CI gate) must stay within alpha.
+
+    python utils/trend_check.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+from replay_cases_report import _print_table
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+if str(_repo_root()) not in sys.path:
+    sys.path.insert(0, str(_repo_root()))
+
+from src.utils.trend import trend_rows  # noqa: E402
+
+RECENT = 5
+BASELINE = 20
+ALPHA = 0.01
+
+
+def _samples(cases: int, steps_per_case: int, slow: tuple | None, seed: int) -> list[tuple[int, tuple, float]]:
+    rng = random.Random(seed)
+    samples = []
+    for case in range(cases):
+        for line in range(1, steps_per_case + 1):
+            key = (f"case_{case:02d}", line, "click")
+            base = rng.uniform(0.2, 3.0)
+            for age in range(RECENT + BASELINE):
+                duration = base * rng.uniform(0.9, 1.1)
+                if key == slow and age < RECENT:
+                    duration = base * 1.1 * rng.uniform(1.05, 1.3)
+                samples.append((age, key, duration))
+    return samples
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that a step slowdown is flagged by the trend report.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic durations.")
+    parser.add_argument("--null-runs", type=int, default=200, help="Seeds of the run without a slowdown.")
+    args = parser.parse_args(argv)
+
+    rows = []
+    ok = True
+    for cases, steps_per_case in ((25, 5), (1, 125)):
+        slow = (f"case_{cases - 1:02d}", steps_per_case, "click")
+        result = trend_rows(
+            _samples(cases, steps_per_case, slow, args.seed),
+            recent=RECENT,
+            baseline=BASELINE,
+            alpha=ALPHA,
+        )
+        flagged = [r.key for r in result if r.regression]
+        slow_row = next(r for r in result if r.key == slow)
+        passed = flagged == [slow]
+        ok = ok and passed
+        rows.append(
+            [
+                f"{cases} case(s) x {steps_per_case} steps",
+                f"{slow_row.p_value:.2g}",
+                f"{slow_row.ratio:.2f}",
+                str(len(flagged)),
+                "ok" if passed else "FAIL",
+            ]
+        )
+
+    alarms = 0
+    for seed in range(args.seed, args.seed + args.null_runs):
+        result = trend_rows(
+            _samples(25, 5, None, seed),
+            recent=RECENT,
+            baseline=BASELINE,
+            alpha=ALPHA,
+            min_slowdown=0.0,
+        )
+        alarms += any(r.regression for r in result)
+    # Binomial slack: 3 sigma above alpha * runs.
+    allowed = ALPHA * args.null_runs + 3 * (ALPHA * (1 - ALPHA) * args.null_runs) ** 0.5
+    passed = alarms <= allowed
+    ok = ok and passed
+    rows.append(
+        [
+            f"no slowdown, {args.null_runs} runs",
+            "-",
+            "-",
+            f"{alarms} run(s)",
+            "ok" if passed else "FAIL",
+        ]
+    )
+    _print_table(["layout", "slow step p", "ratio", "flagged", "result"], rows)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
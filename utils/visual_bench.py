@@ -0,0 +1,293 @@
+"""
+Benchmarks of src/utils/visual.py on screenshot-sized frames.
+
+pixel diff: the previous int16 full-frame diff (with the highlight image
+always built) vs the banded uint8 early-exit diff. Time per comparison and
+peak memory (tracemalloc, numpy allocations included).
+
+identical frame: what assert_screenshot spends on a frame equal to its
+baseline without hashes (decode baseline PNG + pixel diff) and with the
+baseline hash sidecar (sha1 of the captured pixels only).
+
+baseline load: decoding the baseline PNG on every check vs the process-wide
+BaselineCache (hit = stat + dict lookup), plus the cache hit rate.
+
+ssim: the numpy SSIM of _ssim_score (full resolution and the default
+downscale) vs the previous skimage path (PIL "L" + structural_similarity
+with full=True), when scikit-image is installed. Before timing, _ssim_map is
+checked against reference values from skimage 0.26 on fixed patterns and,
+with skimage available, against structural_similarity on every scenario;
+a mismatch makes the script exit with 1.
+
+    python utils/visual_bench.py --size 1920x1080 --repeat 20
+    python utils/visual_bench.py --image artifacts/visual/baseline/sql_editor.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from replay_cases_report import _print_table
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+if str(_repo_root()) not in sys.path:
+    sys.path.insert(0, str(_repo_root()))
+
+from src.utils.visual import (  # noqa: E402
+    SSIM_DOWNSCALE,
+    BaselineCache,
+    _content_hash,
+    _gray,
+    _pixel_diff,
+    _ssim_map,
+    _ssim_score,
+)
+
+# structural_similarity(a, b, data_range=255) from scikit-image 0.26 on 120x160 uint8 patterns.
+SSIM_REFERENCE = {
+    "gradient vs shifted": 0.9012486063146901,
+    "gradient vs checker": 0.020377864046174483,
+    "stripes vs noise-like": 0.022373298946032,
+    "checker vs inverted": -0.7434190318525659,
+}
+SSIM_TOLERANCE = 1e-9
+
+
+def _legacy_pixel_diff(baseline: np.ndarray, current: np.ndarray, threshold: float):
+    """_pixel_diff before the banded engine: int16 widening, highlight always built."""
+    b_arr = baseline.astype(np.int16)
+    c_arr = current.astype(np.int16)
+    mask = np.any(np.abs(b_arr - c_arr) > 0, axis=2)
+    ratio = float(mask.mean())
+    highlight = baseline.copy()
+    highlight[mask] = [255, 0, 0]
+    return ratio <= threshold, Image.fromarray(highlight)
+
+
+def _frame(args: argparse.Namespace) -> np.ndarray:
+    if args.image:
+        return np.asarray(Image.open(args.image).convert("RGB"))
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    # UI-like frame: flat panels with some text-like noise, not pure noise.
+    rng = np.random.default_rng(0)
+    frame = np.full((height, width, 3), 242, dtype=np.uint8)
+    frame[: height // 12] = (51, 102, 170)
+    frame[:, : width // 6] = (230, 230, 230)
+    text = rng.random((height, width)) < 0.04
+    frame[text] = (40, 40, 40)
+    return frame
+
+
+def _scenarios(frame: np.ndarray) -> dict[str, np.ndarray]:
+    height, width = frame.shape[:2]
+    rng = np.random.default_rng(1)
+    spinner = frame.copy()
+    spinner[height // 2 : height // 2 + 24, width // 2 : width // 2 + 24] = (0, 120, 215)
+    shifted = np.roll(frame, 3, axis=1)
+    noise = frame.copy()
+    picks = rng.choice(height * width, size=height * width // 500, replace=False)
+    noise.reshape(-1, 3)[picks] ^= 1
+    return {
+        "identical": frame.copy(),
+        "spinner 24px": spinner,
+        "noise 0.2%": noise,
+        "layout shift": shifted,
+    }
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    fn()
+    started = perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_call_ms = (perf_counter() - started) / repeat * 1000
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call_ms, peak / 1024 / 1024
+
+
+def _bench_pixel(frame: np.ndarray, args: argparse.Namespace) -> None:
+    # Both engines get decoded uint8 frames: PNG decoding is the same for both.
+    baseline = frame
+    rows = []
+    for name, current in _scenarios(frame).items():
+        legacy_ms, legacy_mb = _measure(
+            lambda: _legacy_pixel_diff(baseline, current, args.threshold), args.repeat
+        )
+        new_ms, new_mb = _measure(lambda: _pixel_diff(baseline, current, args.threshold), args.repeat)
+        result, _ = _pixel_diff(baseline, current, args.threshold)
+        rows.append(
+            [
+                name,
+                "pass" if result.passed else "fail",
+                f"{legacy_ms:.2f}",
+                f"{new_ms:.2f}",
+                f"{legacy_mb:.1f}",
+                f"{new_mb:.1f}",
+            ]
+        )
+    print(f"pixel diff, threshold={args.threshold}:")
+    _print_table(["scenario", "result", "legacy ms", "banded ms", "legacy MB", "banded MB"], rows)
+
+
+def _bench_identical(frame: np.ndarray, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="visual-bench-") as tmp:
+        baseline_path = Path(tmp) / "baseline.png"
+        Image.fromarray(frame).save(baseline_path)
+        baseline_sha = _content_hash(frame)
+        current = frame.copy()
+
+        def _decode_and_diff() -> bool:
+            baseline = np.asarray(Image.open(baseline_path).convert("RGB"))
+            return _pixel_diff(baseline, current, args.threshold)[0].passed
+
+        def _hash_check() -> bool:
+            return _content_hash(current) == baseline_sha
+
+        decode_ms, decode_mb = _measure(_decode_and_diff, args.repeat)
+        hash_ms, hash_mb = _measure(_hash_check, args.repeat)
+    print("identical frame:")
+    _print_table(
+        ["path", "ms", "MB"],
+        [
+            ["decode baseline + pixel diff", f"{decode_ms:.2f}", f"{decode_mb:.1f}"],
+            ["content hash match", f"{hash_ms:.2f}", f"{hash_mb:.1f}"],
+        ],
+    )
+
+
+def _bench_baseline_load(frame: np.ndarray, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="visual-bench-") as tmp:
+        baseline_path = Path(tmp) / "baseline.png"
+        Image.fromarray(frame).save(baseline_path)
+        cache = BaselineCache(frame.nbytes * 2)
+
+        def _decode() -> np.ndarray:
+            return np.asarray(Image.open(baseline_path).convert("RGB"))
+
+        decode_ms, decode_mb = _measure(_decode, args.repeat)
+        cached_ms, cached_mb = _measure(lambda: cache.get(baseline_path), args.repeat)
+        stats = cache.stats()
+    print("baseline load:")
+    _print_table(
+        ["path", "ms", "MB"],
+        [
+            ["decode PNG", f"{decode_ms:.2f}", f"{decode_mb:.1f}"],
+            ["BaselineCache", f"{cached_ms:.3f}", f"{cached_mb:.1f}"],
+        ],
+    )
+    print(
+        f"cache: hits={stats['hits']} misses={stats['misses']} "
+        f"hit_rate={stats['hit_rate']} bytes={stats['bytes']}"
+    )
+
+
+def _reference_patterns() -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    i, j = np.mgrid[0:120, 0:160]
+    gradient = (i + 2 * j) % 256
+    checker = ((i // 8 + j // 8) % 2) * 255
+    return {
+        "gradient vs shifted": (gradient, (i + 2 * j + 9) % 256),
+        "gradient vs checker": (gradient, checker),
+        "stripes vs noise-like": ((i * 7 + j * 13) % 256, (i * i + 3 * j) % 256),
+        "checker vs inverted": (checker, 255 - checker),
+    }
+
+
+def _skimage_ssim():
+    try:
+        from skimage.metrics import structural_similarity
+    except ImportError:
+        return None
+    return structural_similarity
+
+
+def _check_ssim(frame: np.ndarray) -> bool:
+    rows = []
+    for name, (a, b) in _reference_patterns().items():
+        got = float(_ssim_map(a.astype(np.uint8), b.astype(np.uint8)).mean())
+        rows.append([name, f"{SSIM_REFERENCE[name]:.12f}", f"{got:.12f}", f"{abs(got - SSIM_REFERENCE[name]):.1e}"])
+    structural_similarity = _skimage_ssim()
+    if structural_similarity is not None:
+        b_gray = _gray(frame, 1)
+        for name, current in _scenarios(frame).items():
+            c_gray = _gray(current, 1)
+            expected = structural_similarity(b_gray, c_gray, data_range=255)
+            got = float(_ssim_map(b_gray, c_gray).mean())
+            rows.append([f"skimage: {name}", f"{expected:.12f}", f"{got:.12f}", f"{abs(got - expected):.1e}"])
+    print("ssim correctness (full resolution):")
+    _print_table(["case", "reference", "numpy", "abs error"], rows)
+    return all(float(r[3]) <= SSIM_TOLERANCE for r in rows)
+
+
+def _bench_ssim(frame: np.ndarray, args: argparse.Namespace) -> None:
+    structural_similarity = _skimage_ssim()
+    baseline = frame
+    rows = []
+    for name, current in _scenarios(frame).items():
+        row = [name]
+        for downscale in (1, SSIM_DOWNSCALE):
+            ms, mb = _measure(lambda: _ssim_score(baseline, current, downscale=downscale), args.repeat)
+            row += [f"{_ssim_score(baseline, current, downscale=downscale)[0]:.4f}", f"{ms:.1f}", f"{mb:.1f}"]
+        if structural_similarity is not None:
+
+            def _skimage_path() -> float:
+                b_gray = np.asarray(Image.fromarray(baseline).convert("L"))
+                c_gray = np.asarray(Image.fromarray(current).convert("L"))
+                return structural_similarity(b_gray, c_gray, full=True)[0]
+
+            ms, mb = _measure(_skimage_path, args.repeat)
+            row += [f"{ms:.1f}", f"{mb:.1f}"]
+        rows.append(row)
+    headers = ["scenario"]
+    for label in ("x1", f"/{SSIM_DOWNSCALE}"):
+        headers += [f"ssim {label}", f"numpy {label} ms", f"numpy {label} MB"]
+    if structural_similarity is not None:
+        headers += ["skimage ms", "skimage MB"]
+    print("ssim:" if structural_similarity is not None else "ssim (scikit-image not installed, no skimage column):")
+    _print_table(headers, rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark visual comparison on screenshot-sized frames.")
+    parser.add_argument("--size", default="1920x1080", help="Synthetic frame size WxH.")
+    parser.add_argument("--image", type=Path, default=None, help="Use a real screenshot PNG as the frame.")
+    parser.add_argument("--threshold", type=float, default=0.01, help="Pixel mismatch threshold.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per measurement.")
+    args = parser.parse_args(argv)
+
+    frame = _frame(args)
+    height, width = frame.shape[:2]
+    print(f"[visual-bench] frame {width}x{height}, {frame.nbytes / 1024 / 1024:.1f} MB RGB")
+    _bench_pixel(frame, args)
+    print()
+    _bench_identical(frame, args)
+    print()
+    _bench_baseline_load(frame, args)
+    print()
+    ssim_ok = _check_ssim(frame)
+    print()
+    _bench_ssim(frame, args)
+    if not ssim_ok:
+        print(f"[visual-bench] ssim differs from the reference by more than {SSIM_TOLERANCE}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())